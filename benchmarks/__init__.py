@@ -0,0 +1 @@
+"""Benchmarks de rutas críticas del sistema."""
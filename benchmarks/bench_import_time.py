@@ -0,0 +1,123 @@
+"""Benchmark: tiempo de importación al arrancar (``python -X importtime``).
+
+Importa el módulo indicado en un proceso nuevo con ``-X importtime`` y
+resume la salida: tiempo acumulado total, módulos con más tiempo propio y
+módulos del proyecto. También verifica que no se carguen al arrancar los
+módulos que deben importarse recién al usarse (ventanas de administración,
+openpyxl, numpy). Sale con código 1 si alguno aparece o si se supera
+``--max-ms``, así sirve para detectar regresiones.
+
+Uso:
+    python -m benchmarks.bench_import_time
+    python -m benchmarks.bench_import_time --module src.ui.main_window --runs 5 --max-ms 400
+"""
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, NamedTuple
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+# Módulos que el arranque no debe importar (se cargan al abrir su ventana o al exportar)
+LAZY_MODULES = (
+    'src.ui.area_admin_window',
+    'src.ui.case_admin_window',
+    'src.ui.question_admin_window',
+    'src.ui.profile_admin_window',
+    'src.ui.tier_admin_window',
+    'src.ui.surveys_view_window',
+    'src.ui.survey_history_window',
+    'openpyxl',
+    'numpy',
+)
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)\s*$")
+
+
+class ImportEntry(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output: str) -> List[ImportEntry]:
+    """Convierte la salida de ``-X importtime`` (stderr) en entradas por módulo."""
+    entries = []
+    for line in output.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            entries.append(ImportEntry(module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return entries
+
+
+def measure(module: str) -> List[ImportEntry]:
+    """Importa ``module`` en un intérprete nuevo y retorna las entradas medidas."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=False
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"No se pudo importar {module}:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def total_ms(entries: List[ImportEntry]) -> float:
+    """Suma de los tiempos acumulados de las importaciones de primer nivel."""
+    return sum(entry.cumulative_us for entry in entries if entry.depth == 0) / 1000
+
+
+def loaded_lazy_modules(entries: List[ImportEntry]) -> List[str]:
+    """Módulos de ``LAZY_MODULES`` (o sus submódulos) que se importaron."""
+    names = {entry.module for entry in entries}
+    return [lazy for lazy in LAZY_MODULES
+            if lazy in names or any(name.startswith(lazy + ".") for name in names)]
+
+
+def run(module: str = 'main', runs: int = 5, top: int = 15, max_ms: float = 0.0) -> int:
+    """Ejecuta el benchmark, imprime el resumen y retorna el código de salida."""
+    measure(module)  # compila los .pyc para no medir la primera compilación
+    samples = [measure(module) for _ in range(max(1, runs))]
+    totals = [total_ms(entries) for entries in samples]
+    median = statistics.median(totals)
+    entries = samples[totals.index(min(totals, key=lambda value: abs(value - median)))]
+
+    print(f"Importación de {module}: mediana {median:.1f} ms "
+          f"(mín {min(totals):.1f}, máx {max(totals):.1f}, {len(totals)} corridas, {len(entries)} módulos)")
+
+    print("\nMódulos con más tiempo propio:")
+    for entry in sorted(entries, key=lambda e: e.self_us, reverse=True)[:top]:
+        print(f"  {entry.self_us / 1000:8.2f} ms  {entry.module}")
+
+    project: Dict[str, ImportEntry] = {e.module: e for e in entries if e.module.startswith('src.')}
+    print("\nMódulos del proyecto (acumulado):")
+    for entry in sorted(project.values(), key=lambda e: e.cumulative_us, reverse=True)[:top]:
+        print(f"  {entry.cumulative_us / 1000:8.2f} ms  {entry.module}")
+
+    status = 0
+    lazy = loaded_lazy_modules(entries)
+    if lazy:
+        print(f"\nREGRESIÓN: se importaron al arrancar: {', '.join(lazy)}")
+        status = 1
+    if max_ms and median > max_ms:
+        print(f"\nREGRESIÓN: {median:.1f} ms supera el límite de {max_ms:.1f} ms")
+        status = 1
+    return status
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Tiempo de importación al arrancar")
+    parser.add_argument('--module', default='main', help="módulo a importar (por defecto main)")
+    parser.add_argument('--runs', type=int, default=5, help="corridas a medir (se informa la mediana)")
+    parser.add_argument('--top', type=int, default=15, help="módulos a listar")
+    parser.add_argument('--max-ms', type=float, default=0.0, help="límite de la mediana (0 = sin límite)")
+    args = parser.parse_args(argv)
+    return run(args.module, args.runs, args.top, args.max_ms)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""Benchmark: recálculo masivo de puntajes sobre un historial sintético.
+
+Genera encuestas con 20 respuestas cada una (hasta 1.000.000 de respuestas),
+las carga en ``ScoringData`` y mide el cálculo con el motor en Python puro y,
+si está instalado, con NumPy. No usa base de datos: mide solo el cómputo.
+
+Uso:
+    python -m benchmarks.bench_rescore
+"""
+import random
+import time
+
+from src.models.question import Question
+from src.models.tier import Tier
+from src.services.rescore_service import ScoringData, compute_rescore, np
+
+QUESTIONS_PER_SURVEY = 20
+AREAS = 5
+SIZES = (100_000, 1_000_000)
+
+
+def build_catalog():
+    """Preguntas y tiers por área con penalizaciones de dos decimales."""
+    rng = random.Random(7)
+    questions = [
+        Question(id=area * 100 + n, area_id=area, text=f"P{n}",
+                 penalty_graduated=round(rng.uniform(0, 10), 2),
+                 penalty_not_graduated=round(rng.uniform(0, 15), 2))
+        for area in range(1, AREAS + 1)
+        for n in range(QUESTIONS_PER_SURVEY)
+    ]
+    tiers = []
+    for area in range(1, AREAS + 1):
+        for pos, (name, low, high) in enumerate((("Bajo", 0, 59.99), ("Medio", 60, 84.99), ("Alto", 85, 100))):
+            tiers.append(Tier(id=area * 10 + pos, area_id=area, name=name, min_score=low, max_score=high))
+    return questions, tiers
+
+
+def build_data(responses: int) -> ScoringData:
+    """Historial sintético con puntajes guardados que no coinciden con el catálogo."""
+    rng = random.Random(42)
+    data = ScoringData()
+    response_id = 0
+    for survey_id in range(1, responses // QUESTIONS_PER_SURVEY + 1):
+        area = rng.randint(1, AREAS)
+        data.add_survey(survey_id, rng.random() < 0.3, 100.0, None, None, area)
+        for n in range(QUESTIONS_PER_SURVEY):
+            response_id += 1
+            answer = 'NO' if rng.random() < 0.15 else 'YES'
+            data.add_response(response_id, survey_id, area * 100 + n, answer, 0.0)
+    return data
+
+
+def run():
+    """Ejecuta el benchmark e imprime una tabla de resultados."""
+    questions, tiers = build_catalog()
+    engines = [False] + ([True] if np is not None else [])
+    print(f"{'respuestas':>10} | {'carga':>8} | " + " | ".join(
+        f"{('numpy' if e else 'python'):>18}" for e in engines))
+    for size in SIZES:
+        start = time.perf_counter()
+        data = build_data(size)
+        load = time.perf_counter() - start
+        cells = []
+        for use_numpy in engines:
+            report = compute_rescore(data, questions, tiers, use_numpy=use_numpy)
+            rate = size / report.elapsed if report.elapsed else float('inf')
+            cells.append(f"{report.elapsed:6.2f}s {rate / 1e6:5.1f} M/s")
+        print(f"{size:>10} | {load:>7.2f}s | " + " | ".join(f"{c:>18}" for c in cells))
+    if np is None:
+        print("NumPy no está instalado: solo se midió el motor en Python puro.")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,80 @@
+"""Benchmark: consultas y tiempo al cargar encuestas con sus respuestas.
+
+Compara la carga anterior (una consulta de respuestas por encuesta) con la
+carga agrupada de ``SurveyRepository.find_all``. Usa una base simulada en
+memoria, por lo que mide el costo del repositorio y la cantidad de consultas,
+no la latencia de red.
+
+Uso:
+    python -m benchmarks.bench_survey_loading
+"""
+import time
+
+from src.repositories.survey_repository import SurveyRepository
+
+SIZES = (100, 1_000, 10_000, 60_000)
+
+
+class SimulatedSurveyDatabase:
+    """Base en memoria con la interfaz de lectura de ``DatabaseConnection``; cuenta consultas."""
+
+    def __init__(self, survey_count: int, responses_per_survey: int = 1):
+        self.queries = 0
+        self.surveys = [
+            {
+                'id': survey_id, 'evaluator_profile': 'Manager', 'sid': f"S{survey_id % 2}",
+                'case_id': 1, 'is_graduated': 0, 'final_score': 100.0, 'tier_id': None,
+                'tier_name': None, 'created_at': None
+            }
+            for survey_id in range(1, survey_count + 1)
+        ]
+        self.responses = [
+            {
+                'id': survey_id * 100 + idx, 'survey_id': survey_id, 'question_id': idx,
+                'answer': 'YES', 'comment': None, 'penalty_applied': 0.0
+            }
+            for survey_id in range(1, survey_count + 1)
+            for idx in range(responses_per_survey)
+        ]
+
+    def fetch_all(self, query, params=()):
+        self.queries += 1
+        if "FROM survey_responses" not in query:
+            return self.surveys
+        ids = set(params) if "IN (" in query else {s['id'] for s in self.surveys}
+        return [r for r in self.responses if r['survey_id'] in ids]
+
+    def fetch_iter(self, query, params=(), batch_size=1000, row_factory=None):
+        rows = self.fetch_all(query, params)
+        if not rows or row_factory is None:
+            return iter(rows)
+        convert = row_factory({column: pos for pos, column in enumerate(rows[0])})
+        return (convert(tuple(row.values())) for row in rows)
+
+
+def load_n_plus_one(repo: SurveyRepository):
+    """Reproduce la carga anterior: encabezados + ``get_responses`` por encuesta."""
+    headers = repo.db.fetch_all("SELECT ... FROM surveys")
+    return [repo.get_responses(row['id']) for row in headers]
+
+
+def run():
+    """Ejecuta el benchmark e imprime una tabla de resultados."""
+    print(f"{'encuestas':>10} | {'consultas N+1':>13} | {'consultas agrupadas':>19} | {'tiempo agrupado':>15}")
+    for size in SIZES:
+        db = SimulatedSurveyDatabase(size)
+        repo = SurveyRepository(db)
+        if size <= 1_000:
+            load_n_plus_one(repo)
+            n_plus_one = str(db.queries)
+        else:
+            n_plus_one = f"{size + 1} (est.)"
+        db.queries = 0
+        start = time.perf_counter()
+        repo.find_all()
+        elapsed = time.perf_counter() - start
+        print(f"{size:>10} | {n_plus_one:>13} | {db.queries:>19} | {elapsed * 1000:>12.1f} ms")
+
+
+if __name__ == '__main__':
+    run()
@@ -201,6 +201,9 @@ IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'idx_questions_area_active
 IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'idx_surveys_case')
     CREATE INDEX idx_surveys_case ON dbo.surveys(case_id);
 
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'idx_surveys_created')
+    CREATE INDEX idx_surveys_created ON dbo.surveys(created_at DESC, id DESC);
+
 IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'idx_profile_defaults_profile')
     CREATE INDEX idx_profile_defaults_profile ON dbo.profile_question_defaults(profile_id);
 
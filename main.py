@@ -9,20 +9,20 @@ src_path = project_root / 'src'
 if str(src_path) not in sys.path:
     sys.path.insert(0, str(src_path))
 
-from src.core.init_db import ensure_database_initialized
-from src.core.seeds import ensure_seed_data
+from src.core.startup import StartupTimer, prepare_database
 from src.ui.main_window import MainWindow
 
 
 def main():
     """Función principal."""
     # Inicializar base de datos
-    ensure_database_initialized()
-    ensure_seed_data()
+    timer = prepare_database(StartupTimer())
     
     # Crear interfaz
-    root = tk.Tk()
-    app = MainWindow(root)
+    with timer.step("Interfaz"):
+        root = tk.Tk()
+        app = MainWindow(root)
+    print(timer.report())
     root.mainloop()
 
 
@@ -0,0 +1,249 @@
+"""Escritura del log de auditoría en lotes y en segundo plano."""
+import atexit
+import queue
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.core.config import (
+    AUDIT_BATCH_SIZE,
+    AUDIT_FLUSH_INTERVAL,
+    AUDIT_MAX_ATTEMPTS,
+    AUDIT_QUEUE_MAX,
+    AUDIT_QUEUE_TIMEOUT,
+    AUDIT_RETRY_BACKOFF,
+    AUDIT_SYNC,
+)
+
+AUDIT_COLUMNS = ('entity_type', 'entity_id', 'action', 'user_profile', 'details', 'created_at')
+AuditEntry = Tuple[str, Optional[int], str, Optional[str], Optional[str], datetime]
+
+# 6 parámetros por fila: 350 filas por INSERT respetan el límite de 2100 parámetros
+MAX_ROWS_PER_INSERT = 2100 // len(AUDIT_COLUMNS)
+# Espera máxima entre reintentos de un lote que no se pudo escribir (segundos)
+MAX_RETRY_BACKOFF = 30.0
+
+
+def _default_db():
+    from src.core.database import DatabaseConnection
+    return DatabaseConnection()
+
+
+class AuditSink:
+    """Cola acotada de entradas de auditoría que un hilo escribe por lotes.
+
+    Las entradas registradas dentro de una transacción se encolan recién al
+    confirmarla (se descartan si se revierte) y piden un vaciado inmediato;
+    fuera de una transacción esperan hasta completar ``batch_size`` o hasta
+    ``flush_interval`` segundos. Con la cola llena, ``record`` espera hasta
+    ``queue_timeout`` segundos y, si sigue llena, descarta la entrada y la
+    cuenta en ``dropped``. Un lote que no se puede escribir se reintenta con
+    espera exponencial (``retry_backoff``, 2×, 4×...) antes que las entradas
+    nuevas, que mientras tanto quedan en la cola (con la base caída la cola se
+    llena y se aplica la misma espera/descarte); tras ``max_attempts``
+    intentos el lote se descarta y cuenta en ``failed``. Cada entrada guarda
+    la hora en que se registró, no la del vaciado. En modo ``synchronous``
+    cada entrada se inserta en el momento, dentro de la transacción del
+    llamador.
+    """
+
+    def __init__(self, db_factory: Callable[[], Any] = _default_db,
+                 batch_size: int = AUDIT_BATCH_SIZE,
+                 flush_interval: float = AUDIT_FLUSH_INTERVAL,
+                 max_queue: int = AUDIT_QUEUE_MAX,
+                 queue_timeout: float = AUDIT_QUEUE_TIMEOUT,
+                 synchronous: bool = AUDIT_SYNC,
+                 max_attempts: int = AUDIT_MAX_ATTEMPTS,
+                 retry_backoff: float = AUDIT_RETRY_BACKOFF):
+        self._db_factory = db_factory
+        self._db = None
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.queue_timeout = queue_timeout
+        self.synchronous = synchronous
+        self.max_attempts = max(1, max_attempts)
+        self.retry_backoff = retry_backoff
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max(1, max_queue))
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self.queued = 0
+        self.flushed = 0
+        self.dropped = 0
+        self.failed = 0
+
+    @property
+    def db(self):
+        if self._db is None:
+            self._db = self._db_factory()
+        return self._db
+
+    def record(self, entity_type: str, entity_id: Optional[int], action: str,
+               user_profile: Optional[str] = None, details: Optional[str] = None,
+               db=None) -> None:
+        """Registra una entrada; ``db`` es la conexión del repositorio que escribió."""
+        entry: AuditEntry = (entity_type, entity_id, action, user_profile, details, datetime.utcnow())
+        db = db or self.db
+        if self.synchronous or self._closed:
+            self._write(db, [entry])
+            with self._lock:
+                self.flushed += 1
+            return
+        if db.in_transaction():
+            db.on_commit(lambda: self._enqueue(entry, flush=True))
+        else:
+            self._enqueue(entry)
+
+    def _enqueue(self, entry: AuditEntry, flush: bool = False) -> None:
+        if self._closed:
+            # Commit posterior a shutdown(): el hilo escritor ya no lee la cola
+            self._flush_batch([entry], last_attempt=True)
+            return
+        self._ensure_thread()
+        try:
+            self._queue.put(entry, timeout=self.queue_timeout)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return
+        with self._lock:
+            self.queued += 1
+        if flush:
+            self._request_flush()
+
+    def _request_flush(self) -> None:
+        """Pide al hilo escritor que vacíe sin esperar el intervalo."""
+        try:
+            self._queue.put_nowait(None)
+        except queue.Full:
+            # Con la cola llena el lote se completa igual por tamaño
+            pass
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        """Bucle del hilo escritor."""
+        batch: List[AuditEntry] = []
+        waiters: List[threading.Event] = []
+        deadline = None
+        attempts = 0  # escrituras fallidas seguidas del lote pendiente
+        stop = False
+        while not stop or batch:
+            if attempts:
+                # Reintento pendiente: no se lee la cola mientras dura la espera, así
+                # se llena y ``record`` aplica su espera/descarte durante una caída
+                time.sleep(max(0.0, deadline - time.monotonic()))
+            else:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    item = None
+                flush = item is None
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                    flush = True
+                elif item is _STOP:
+                    flush = stop = True
+                elif item is not None:
+                    batch.append(item)
+                    if deadline is None:
+                        deadline = time.monotonic() + self.flush_interval
+                    flush = len(batch) >= self.batch_size
+                if not flush:
+                    continue
+            attempts += 1
+            last_attempt = attempts >= self.max_attempts
+            if not self._flush_batch(batch, last_attempt) and not last_attempt:
+                # Se reintenta el mismo lote; las entradas nuevas esperan en la cola
+                deadline = time.monotonic() + min(MAX_RETRY_BACKOFF, self.retry_backoff * 2 ** (attempts - 1))
+                continue
+            batch = []
+            attempts = 0
+            deadline = None
+            for event in waiters:
+                event.set()
+            waiters = []
+
+    def _flush_batch(self, batch: List[AuditEntry], last_attempt: bool) -> bool:
+        """Escribe el lote; retorna False si falló (contado en ``failed`` si era el último intento)."""
+        if not batch:
+            return True
+        try:
+            self._write(self.db, batch)
+        except Exception as exc:
+            if last_attempt:
+                with self._lock:
+                    self.failed += len(batch)
+                print(f"Error al escribir {len(batch)} entradas de auditoría, se descartan: {exc}",
+                      file=sys.stderr)
+            else:
+                print(f"Error al escribir {len(batch)} entradas de auditoría, se reintentará: {exc}",
+                      file=sys.stderr)
+            return False
+        with self._lock:
+            self.flushed += len(batch)
+        return True
+
+    @staticmethod
+    def _write(db, entries: List[AuditEntry]) -> None:
+        """Inserta las entradas con un INSERT multi-fila por bloque."""
+        row = "(" + ", ".join("?" for _ in AUDIT_COLUMNS) + ")"
+        with db.transaction():
+            for start in range(0, len(entries), MAX_ROWS_PER_INSERT):
+                chunk = entries[start:start + MAX_ROWS_PER_INSERT]
+                db.execute(
+                    f"INSERT INTO audit_log ({', '.join(AUDIT_COLUMNS)}) VALUES "
+                    + ", ".join(row for _ in chunk),
+                    [value for entry in chunk for value in entry]
+                )
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Espera a que se escriba todo lo encolado hasta ahora. Retorna False si vence ``timeout``."""
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def shutdown(self, timeout: Optional[float] = 5.0) -> None:
+        """Vacía la cola y detiene el hilo; las entradas posteriores se escriben en el momento."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is None:
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, int]:
+        """Contadores de entradas encoladas, escritas, descartadas y fallidas."""
+        with self._lock:
+            return {
+                'queued': self.queued,
+                'flushed': self.flushed,
+                'dropped': self.dropped,
+                'failed': self.failed,
+                'pending': self._queue.qsize(),
+            }
+
+
+_STOP = object()
+
+# Destino de auditoría compartido por todos los repositorios
+audit_sink = AuditSink()
+atexit.register(audit_sink.shutdown)
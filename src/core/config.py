@@ -1,6 +1,11 @@
 """Configuración centralizada para la conexión SQL Server."""
 import os
 
+# Motor de base de datos: "sqlserver" (pyodbc) o "sqlite" (embebido, sin servidor)
+DB_BACKEND = os.getenv("DB_BACKEND", "sqlserver").lower()
+# Archivo SQLite o ":memory:" (solo con DB_BACKEND=sqlite)
+SQLITE_PATH = os.getenv("SQLITE_PATH", ":memory:")
+
 SQLSERVER_CONNECTION_STRING = os.getenv(
     "SQLSERVER_CONNECTION_STRING",
     (
@@ -11,3 +16,35 @@ SQLSERVER_CONNECTION_STRING = os.getenv(
     ),
 )
 
+
+# Pool de conexiones (ver src/core/connection_pool.py)
+SQLSERVER_POOL_MIN_SIZE = int(os.getenv("SQLSERVER_POOL_MIN_SIZE", "1"))
+SQLSERVER_POOL_MAX_SIZE = int(os.getenv("SQLSERVER_POOL_MAX_SIZE", "5"))
+SQLSERVER_POOL_TIMEOUT = float(os.getenv("SQLSERVER_POOL_TIMEOUT", "30"))
+SQLSERVER_POOL_IDLE_TIMEOUT = float(os.getenv("SQLSERVER_POOL_IDLE_TIMEOUT", "300"))
+SQLSERVER_POOL_HEALTH_CHECK_AFTER = float(os.getenv("SQLSERVER_POOL_HEALTH_CHECK_AFTER", "30"))
+
+
+# Segundos entre validaciones de la caché de catálogos contra la base de datos
+# (0 = desactivado; útil cuando varios usuarios editan el catálogo a la vez)
+CATALOG_STAMP_TTL = float(os.getenv("CATALOG_STAMP_TTL", "0"))
+
+
+# Escritura de auditoría en segundo plano (ver src/core/audit_sink.py)
+# AUDIT_SYNC=1 escribe cada entrada en el momento, dentro de la transacción
+AUDIT_SYNC = os.getenv("AUDIT_SYNC", "0") == "1"
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "200"))
+AUDIT_FLUSH_INTERVAL = float(os.getenv("AUDIT_FLUSH_INTERVAL", "1.0"))
+AUDIT_QUEUE_MAX = int(os.getenv("AUDIT_QUEUE_MAX", "10000"))
+AUDIT_QUEUE_TIMEOUT = float(os.getenv("AUDIT_QUEUE_TIMEOUT", "2.0"))
+# Un lote que falla se reintenta tras 0.5 s, 1 s, 2 s... hasta AUDIT_MAX_ATTEMPTS intentos
+AUDIT_MAX_ATTEMPTS = int(os.getenv("AUDIT_MAX_ATTEMPTS", "4"))
+AUDIT_RETRY_BACKOFF = float(os.getenv("AUDIT_RETRY_BACKOFF", "0.5"))
+
+
+# Métricas por sentencia SQL (ver src/core/query_stats.py)
+# QUERY_STATS=1 las activa; QUERY_SLOW_MS > 0 también, e informa las consultas lentas
+QUERY_STATS = os.getenv("QUERY_STATS", "0") == "1"
+QUERY_SLOW_MS = float(os.getenv("QUERY_SLOW_MS", "0"))
+QUERY_STATS_DUMP_PATH = os.getenv("QUERY_STATS_DUMP_PATH", "")
+QUERY_STATS_DUMP_INTERVAL = float(os.getenv("QUERY_STATS_DUMP_INTERVAL", "60"))
@@ -0,0 +1,190 @@
+"""Pool de conexiones acotado y seguro para hilos."""
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, Optional, Tuple
+
+
+class PoolTimeoutError(RuntimeError):
+    """Se lanza cuando no hay conexiones disponibles dentro del tiempo de espera."""
+
+
+class ConnectionPool:
+    """Pool de conexiones con tamaño mínimo/máximo, timeout y desalojo por inactividad.
+
+    Las conexiones libres se reutilizan en orden LIFO para mantener "calientes" las
+    más recientes. Al entregar una conexión que estuvo inactiva más de
+    ``health_check_after`` segundos se valida con ``SELECT 1``; si falla se descarta
+    y se abre una nueva.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        min_size: int = 1,
+        max_size: int = 5,
+        timeout: float = 30.0,
+        idle_timeout: float = 300.0,
+        health_check_after: float = 30.0,
+    ):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Configuración de pool inválida: se requiere 0 <= min_size <= max_size y max_size >= 1")
+        self._factory = factory
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.health_check_after = health_check_after
+
+        self._lock = threading.Condition()
+        self._idle: Deque[Tuple[Any, float]] = deque()
+        self._size = 0
+        self._closed = False
+        self._stats = {'created': 0, 'discarded': 0, 'evicted': 0, 'timeouts': 0}
+
+        for _ in range(min_size):
+            self._idle.append((self._create(), time.monotonic()))
+
+    def _create(self):
+        """Abre una conexión nueva y la contabiliza en el pool."""
+        conn = self._factory()
+        self._size += 1
+        self._stats['created'] += 1
+        return conn
+
+    def _open_reserved(self):
+        """Abre una conexión para un cupo ya reservado en ``_size``."""
+        try:
+            conn = self._factory()
+        except Exception:
+            with self._lock:
+                self._size -= 1
+                self._lock.notify()
+            raise
+        with self._lock:
+            self._stats['created'] += 1
+        return conn
+
+    def _discard(self, conn) -> None:
+        """Cierra una conexión y la descuenta del pool."""
+        self._size -= 1
+        self._stats['discarded'] += 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _is_healthy(self, conn) -> bool:
+        """Valida que la conexión siga respondiendo."""
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+            cursor.close()
+            return True
+        except Exception:
+            return False
+
+    def _evict_idle(self, now: float) -> None:
+        """Cierra conexiones ociosas respetando el tamaño mínimo (llamar con el lock tomado)."""
+        # Las más antiguas están al inicio de la cola
+        while self._idle and self._size > self.min_size:
+            conn, last_used = self._idle[0]
+            if now - last_used < self.idle_timeout:
+                break
+            self._idle.popleft()
+            self._discard(conn)
+            self._stats['evicted'] += 1
+
+    def acquire(self, timeout: Optional[float] = None):
+        """Obtiene una conexión del pool, esperando como máximo ``timeout`` segundos."""
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        while True:
+            candidate = None
+            with self._lock:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("El pool de conexiones está cerrado")
+                    now = time.monotonic()
+                    self._evict_idle(now)
+                    if self._idle:
+                        candidate = self._idle.pop()
+                        break
+                    if self._size < self.max_size:
+                        # Reservar el cupo y abrir la conexión fuera del lock
+                        self._size += 1
+                        break
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        self._stats['timeouts'] += 1
+                        raise PoolTimeoutError(
+                            f"No hay conexiones disponibles tras {timeout:.1f}s (máximo {self.max_size})"
+                        )
+                    self._lock.wait(remaining)
+
+            if candidate is None:
+                return self._open_reserved()
+
+            conn, last_used = candidate
+            if time.monotonic() - last_used < self.health_check_after or self._is_healthy(conn):
+                return conn
+            with self._lock:
+                self._discard(conn)
+                self._lock.notify()
+
+    def release(self, conn, discard: bool = False) -> None:
+        """Devuelve una conexión al pool; si ``discard`` es True se cierra."""
+        if not discard:
+            try:
+                # Descartar cualquier transacción implícita abierta por lecturas
+                conn.rollback()
+            except Exception:
+                discard = True
+        with self._lock:
+            if discard or self._closed:
+                self._discard(conn)
+            else:
+                self._idle.append((conn, time.monotonic()))
+                self._evict_idle(time.monotonic())
+            self._lock.notify()
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None) -> Iterator[Any]:
+        """Context manager que entrega una conexión y la devuelve al salir."""
+        conn = self.acquire(timeout)
+        broken = False
+        try:
+            yield conn
+        except Exception as exc:
+            broken = self._is_connection_error(exc)
+            raise
+        finally:
+            self.release(conn, discard=broken)
+
+    @staticmethod
+    def _is_connection_error(exc: Exception) -> bool:
+        """Indica si el error implica que la conexión quedó inutilizable."""
+        # SQLSTATE clase 08 = errores de conexión (pyodbc los expone en args[0])
+        state = exc.args[0] if getattr(exc, 'args', None) else None
+        return isinstance(state, str) and state.startswith('08')
+
+    def close(self) -> None:
+        """Cierra todas las conexiones libres y rechaza nuevas solicitudes."""
+        with self._lock:
+            self._closed = True
+            while self._idle:
+                conn, _ = self._idle.pop()
+                self._discard(conn)
+            self._lock.notify_all()
+
+    def stats(self) -> Dict[str, int]:
+        """Entrega contadores del pool."""
+        with self._lock:
+            return {
+                **self._stats,
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': self._size - len(self._idle),
+            }
@@ -1,15 +1,49 @@
-"""Gestor de conexión a la base de datos SQL Server."""
-from typing import Any, Dict, List, Optional, Sequence, Tuple
+"""Gestor de conexión a la base de datos (SQL Server, o SQLite embebido)."""
+import threading
+from time import perf_counter
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 
-import pyodbc
+try:
+    import pyodbc
+except ImportError:  # pyodbc solo es necesario con DB_BACKEND=sqlserver
+    pyodbc = None
 
-from src.core.config import SQLSERVER_CONNECTION_STRING
+from src.core.config import (
+    DB_BACKEND,
+    QUERY_SLOW_MS,
+    QUERY_STATS,
+    QUERY_STATS_DUMP_INTERVAL,
+    QUERY_STATS_DUMP_PATH,
+    SQLITE_PATH,
+    SQLSERVER_CONNECTION_STRING,
+    SQLSERVER_POOL_HEALTH_CHECK_AFTER,
+    SQLSERVER_POOL_IDLE_TIMEOUT,
+    SQLSERVER_POOL_MAX_SIZE,
+    SQLSERVER_POOL_MIN_SIZE,
+    SQLSERVER_POOL_TIMEOUT,
+)
+from src.core.connection_pool import ConnectionPool
+from src.core.dialect import Dialect, get_dialect
+from src.core.query_stats import QueryStats
+
+# Recibe el índice {columna: posición} y retorna el conversor de cada fila
+RowFactory = Callable[[Dict[str, int]], Callable[[Any], Any]]
+
+# Límites de SQL Server para un solo comando parametrizado
+MAX_PARAMS_PER_STATEMENT = 2100
+MAX_ROWS_PER_VALUES = 1000
+
+
+def column_index(cursor: Any) -> Dict[str, int]:
+    """Posición de cada columna del resultado del cursor (se arma una vez por consulta)."""
+    return {column[0]: position for position, column in enumerate(cursor.description)}
 
 
 class DBExecutionResult:
     """Wrapper para exponer información adicional del cursor."""
 
-    def __init__(self, cursor: pyodbc.Cursor, lastrowid: Optional[int]):
+    def __init__(self, cursor: Any, lastrowid: Optional[int] = None):
         self._cursor = cursor
         self.lastrowid = lastrowid
 
@@ -18,74 +52,385 @@ class DBExecutionResult:
 
 
 class DatabaseConnection:
-    """Gestor de conexión a SQL Server usando pyodbc (Singleton)."""
+    """Gestor de acceso a la base de datos (Singleton).
+
+    Mantiene un pool de conexiones compartido: cada operación toma una conexión,
+    ejecuta con su propio cursor y la devuelve, por lo que varios hilos pueden
+    consultar en paralelo sin compartir estado de cursor.
+
+    El motor se elige con ``DB_BACKEND``: ``sqlserver`` (pyodbc) o ``sqlite``
+    (``SQLITE_PATH``, archivo o ``:memory:``). Los repositorios escriben SQL de
+    SQL Server y ``dialect`` adapta las pocas construcciones que difieren.
+
+    Si ``query_stats`` está activo (``enable_query_stats``) cada operación
+    registra su duración y filas; desactivado, el costo es una comparación.
+    """
     
     _instance: Optional['DatabaseConnection'] = None
-    _connection: Optional[pyodbc.Connection] = None
+    _pool: Optional[ConnectionPool] = None
+    backend: str = DB_BACKEND
+    sqlite_path: str = SQLITE_PATH
+    dialect: Dialect = get_dialect(DB_BACKEND)
+    query_stats: Optional[QueryStats] = None
+    _init_lock = threading.Lock()
+    _local = threading.local()
     
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super(DatabaseConnection, cls).__new__(cls)
+            with cls._init_lock:
+                if cls._instance is None:
+                    cls._instance = super(DatabaseConnection, cls).__new__(cls)
         return cls._instance
     
     def __init__(self):
-        if self._connection is None:
-            self._init_connection()
+        if self._pool is None:
+            with self._init_lock:
+                if self._pool is None:
+                    self._init_pool()
+    
+    @classmethod
+    def configure(cls, backend: str = DB_BACKEND, sqlite_path: str = SQLITE_PATH) -> None:
+        """Cambia de motor (pruebas, benchmarks, demos); cierra el pool actual."""
+        dialect = get_dialect(backend)
+        with cls._init_lock:
+            if cls._pool is not None:
+                cls._pool.close()
+                cls._pool = None
+            cls.backend = backend
+            cls.sqlite_path = sqlite_path
+            cls.dialect = dialect
+    
+    @classmethod
+    def enable_query_stats(cls, slow_ms: float = QUERY_SLOW_MS,
+                           dump_path: Optional[str] = QUERY_STATS_DUMP_PATH or None,
+                           dump_interval: float = QUERY_STATS_DUMP_INTERVAL) -> QueryStats:
+        """Empieza a medir cada sentencia; retorna el registro para consultarlo."""
+        cls.disable_query_stats()
+        cls.query_stats = QueryStats(slow_ms=slow_ms, dump_path=dump_path, dump_interval=dump_interval)
+        return cls.query_stats
+    
+    @classmethod
+    def disable_query_stats(cls) -> Optional[QueryStats]:
+        """Deja de medir; retorna el registro anterior (con lo acumulado) si había uno."""
+        stats, cls.query_stats = cls.query_stats, None
+        if stats is not None:
+            stats.stop()
+        return stats
+    
+    def _connect(self):
+        """Abre una conexión nueva con el motor configurado."""
+        if self.backend == 'sqlite':
+            from src.core import sqlite_backend
+            return sqlite_backend.connect(self.sqlite_path)
+        if pyodbc is None:
+            raise RuntimeError("pyodbc no está instalado: instálalo o usa DB_BACKEND=sqlite")
+        connection = pyodbc.connect(SQLSERVER_CONNECTION_STRING)
+        connection.autocommit = False
+        return connection
+    
+    def _init_pool(self):
+        """Inicializa el pool de conexiones."""
+        min_size, max_size = SQLSERVER_POOL_MIN_SIZE, SQLSERVER_POOL_MAX_SIZE
+        if self.backend == 'sqlite':
+            from src.core.sqlite_backend import is_memory
+            if is_memory(self.sqlite_path):
+                # Una base en memoria existe solo dentro de su conexión: se comparte una
+                min_size = max_size = 1
+        type(self)._pool = ConnectionPool(
+            self._connect,
+            min_size=min_size,
+            max_size=max_size,
+            timeout=SQLSERVER_POOL_TIMEOUT,
+            idle_timeout=SQLSERVER_POOL_IDLE_TIMEOUT,
+            health_check_after=SQLSERVER_POOL_HEALTH_CHECK_AFTER,
+        )
+    
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """Entrega una conexión del pool durante el bloque ``with``.
+        
+        Si el hilo actual tiene una transacción abierta se reutiliza su conexión.
+        """
+        bound = self._bound_connection()
+        if bound is not None:
+            yield bound
+            return
+        if self._pool is None:
+            self._init_pool()
+        with self._pool.connection() as conn:
+            yield conn
+    
+    def _bound_connection(self) -> Optional[Any]:
+        """Conexión de la transacción activa del hilo actual, si existe."""
+        return getattr(self._local, 'connection', None)
+    
+    def in_transaction(self) -> bool:
+        """Indica si el hilo actual está dentro de ``transaction()``."""
+        return self._bound_connection() is not None
+    
+    def on_commit(self, callback: Callable[[], None]) -> None:
+        """Ejecuta ``callback`` tras el commit de la transacción activa (o de inmediato si no hay).
+        
+        Si la transacción o el savepoint en que se registró se revierte, no se llama.
+        """
+        if not self.in_transaction():
+            callback()
+            return
+        self._local.on_commit.append(callback)
     
-    def _init_connection(self):
-        """Inicializa la conexión usando la cadena configurada."""
-        self._connection = pyodbc.connect(SQLSERVER_CONNECTION_STRING)
-        self._connection.autocommit = False
+    @contextmanager
+    def transaction(self) -> Iterator[Any]:
+        """Agrupa las sentencias del bloque en una transacción con un único commit.
+        
+        Dentro del bloque ``execute`` y ``execute_many`` no confirman; el commit se
+        hace al salir y cualquier excepción revierte todo. Los bloques anidados
+        usan un savepoint, de modo que un error interno capturado por el llamador
+        solo revierte su propio trabajo.
+        """
+        if self.in_transaction():
+            with self._savepoint() as conn:
+                yield conn
+            return
+        with self.connection() as conn:
+            self.dialect.begin(conn)
+            self._local.connection = conn
+            self._local.savepoint_seq = 0
+            self._local.on_commit = []
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                self._local.connection = None
+                callbacks, self._local.on_commit = self._local.on_commit, []
+        for callback in callbacks:
+            callback()
+    
+    @contextmanager
+    def _savepoint(self) -> Iterator[Any]:
+        """Abre un savepoint dentro de la transacción activa del hilo."""
+        conn = self._bound_connection()
+        self._local.savepoint_seq += 1
+        name = f"sp_{self._local.savepoint_seq}"
+        cursor = conn.cursor()
+        saved = self.dialect.savepoint(cursor, name)
+        callbacks_mark = len(self._local.on_commit)
+        try:
+            yield conn
+        except Exception:
+            del self._local.on_commit[callbacks_mark:]
+            if saved:
+                self.dialect.rollback_to_savepoint(cursor, name)
+            else:
+                conn.rollback()
+            raise
     
-    def get_connection(self) -> pyodbc.Connection:
-        """Entrega la conexión activa."""
-        if self._connection is None:
-            self._init_connection()
-        return self._connection
+    def pool_stats(self) -> Dict[str, int]:
+        """Entrega los contadores del pool de conexiones."""
+        return self._pool.stats() if self._pool else {}
     
     def close(self):
-        """Cierra la conexión activa."""
-        if self._connection:
-            self._connection.close()
-            self._connection = None
+        """Cierra todas las conexiones del pool."""
+        if self._pool:
+            self._pool.close()
+            type(self)._pool = None
+    
+    def _execute(self, cursor, query: str, params: Sequence[Any]):
+        """Ejecuta en el cursor, adaptando la sentencia si el motor no es SQL Server."""
+        if self.dialect.translates:
+            query, params = self.dialect.translate(query, params)
+        return cursor.execute(query, params)
     
     def execute(self, query: str, params: Sequence[Any] = ()) -> DBExecutionResult:
-        """Ejecuta un comando SQL (INSERT/UPDATE/DELETE)."""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(query, params)
+        """Ejecuta un comando SQL (INSERT/UPDATE/DELETE).
         
-        # Recuperar ID inserto si aplica
-        lastrowid: Optional[int] = None
-        if query.lstrip().lower().startswith("insert"):
-            cursor.execute("SELECT SCOPE_IDENTITY()")
+        Para obtener el ID generado por un INSERT usar ``insert``.
+        """
+        stats = self.query_stats
+        started = perf_counter() if stats else 0.0
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            self._execute(cursor, query, params)
+            if not self.in_transaction():
+                conn.commit()
+            if stats:
+                stats.record(query, params, perf_counter() - started)
+            return DBExecutionResult(cursor, None)
+    
+    def insert(self, query: str, params: Sequence[Any] = ()) -> Optional[int]:
+        """Ejecuta un INSERT con ``OUTPUT INSERTED.id`` y retorna el ID generado.
+        
+        El ID llega en el mismo viaje que el INSERT, sin consultar ``SCOPE_IDENTITY()``.
+        """
+        stats = self.query_stats
+        started = perf_counter() if stats else 0.0
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            self._execute(cursor, query, params)
             row = cursor.fetchone()
-            if row and row[0] is not None:
-                try:
-                    lastrowid = int(row[0])
-                except (TypeError, ValueError):
-                    lastrowid = None
+            if not self.in_transaction():
+                conn.commit()
+        if stats:
+            stats.record(query, params, perf_counter() - started, rows=1 if row else 0)
+        if row and row[0] is not None:
+            return int(row[0])
+        return None
+    
+    def insert_many(self, table: str, columns: Sequence[str],
+                    rows: Sequence[Sequence[Any]]) -> List[int]:
+        """Inserta varias filas y retorna sus IDs en el mismo orden que ``rows``.
+        
+        SQL Server no garantiza el orden de ``OUTPUT`` en un INSERT multi-fila, por lo
+        que se usa ``MERGE ... OUTPUT source._ord`` para asociar cada ID con su fila.
+        Las filas se envían en lotes que respetan el límite de 2100 parámetros.
+        """
+        if not rows:
+            return []
+        column_list = ", ".join(columns)
+        source_list = ", ".join(f"source.{col}" for col in columns)
+        placeholders = ", ".join("?" for _ in columns)
+        chunk_size = max(1, min(MAX_ROWS_PER_VALUES, MAX_PARAMS_PER_STATEMENT // len(columns)))
         
-        conn.commit()
-        return DBExecutionResult(cursor, lastrowid)
+        ids: List[int] = []
+        stats = self.query_stats
+        if not self.dialect.supports_merge:
+            # SQLite: INSERT ... RETURNING por fila, en proceso y sin viajes de red
+            started = perf_counter() if stats else 0.0
+            with self.transaction() as conn:
+                cursor = conn.cursor()
+                query = f"INSERT INTO {table} ({column_list}) VALUES ({placeholders}) RETURNING id"
+                for row in rows:
+                    cursor.execute(query, row)
+                    ids.append(int(cursor.fetchone()[0]))
+            if stats:
+                stats.record(query, rows[0], perf_counter() - started, rows=len(ids))
+            return ids
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            for start in range(0, len(rows), chunk_size):
+                chunk = rows[start:start + chunk_size]
+                values = ", ".join(f"({placeholders}, {idx})" for idx in range(len(chunk)))
+                query = f"""MERGE INTO {table} AS target
+                        USING (VALUES {values}) AS source ({column_list}, _ord)
+                        ON 1 = 0
+                        WHEN NOT MATCHED THEN INSERT ({column_list}) VALUES ({source_list})
+                        OUTPUT source._ord, INSERTED.id;"""
+                params = [value for row in chunk for value in row]
+                started = perf_counter() if stats else 0.0
+                cursor.execute(query, params)
+                chunk_ids = [0] * len(chunk)
+                for ordinal, new_id in cursor.fetchall():
+                    chunk_ids[ordinal] = int(new_id)
+                if stats:
+                    stats.record(query, params, perf_counter() - started, rows=len(chunk))
+                ids.extend(chunk_ids)
+        return ids
+    
+    def execute_many(self, query: str, params_seq: Sequence[Sequence[Any]]) -> int:
+        """Ejecuta un comando para varios juegos de parámetros en un solo envío.
+        
+        Usa ``fast_executemany`` de pyodbc para mandar todas las filas como un arreglo
+        de parámetros. Retorna la cantidad de filas enviadas.
+        """
+        if not params_seq:
+            return 0
+        stats = self.query_stats
+        started = perf_counter() if stats else 0.0
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            self.dialect.prepare_executemany(cursor)
+            if self.dialect.translates:
+                query, _ = self.dialect.translate(query, ())
+            cursor.executemany(query, params_seq)
+            if not self.in_transaction():
+                conn.commit()
+        if stats:
+            stats.record(query, params_seq[0], perf_counter() - started)
+        return len(params_seq)
     
     def fetch_one(self, query: str, params: Sequence[Any] = ()) -> Optional[Dict[str, Any]]:
         """Retorna una fila como diccionario."""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        row = cursor.fetchone()
-        if not row:
-            return None
-        columns = [col[0] for col in cursor.description]
-        return {col: row[idx] for idx, col in enumerate(columns)}
+        stats = self.query_stats
+        started = perf_counter() if stats else 0.0
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            self._execute(cursor, query, params)
+            row = cursor.fetchone()
+            if stats:
+                stats.record(query, params, perf_counter() - started, rows=1 if row else 0)
+            if not row:
+                return None
+            columns = [col[0] for col in cursor.description]
+            return {col: row[idx] for idx, col in enumerate(columns)}
+    
+    def fetch_iter(self, query: str, params: Sequence[Any] = (),
+                   batch_size: int = 1000,
+                   row_factory: Optional[RowFactory] = None) -> Iterator[Any]:
+        """Recorre el resultado en lotes con ``fetchmany`` sin cargarlo completo.
+        
+        Entrega las filas tal como las devuelve el cursor (acceso por posición).
+        Con ``row_factory`` se la llama una sola vez con el índice
+        ``{columna: posición}`` del resultado y la función que retorna convierte
+        cada fila, así los modelos se arman directo de la tupla, sin un dict por
+        fila. La conexión queda tomada hasta agotar o cerrar el generador.
+        """
+        stats = self.query_stats
+        if stats:
+            yield from self._fetch_iter_measured(stats, query, params, batch_size, row_factory)
+            return
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            self._execute(cursor, query, params)
+            convert = row_factory(column_index(cursor)) if row_factory else None
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                if convert:
+                    yield from map(convert, rows)
+                else:
+                    yield from rows
+    
+    def _fetch_iter_measured(self, stats: QueryStats, query: str, params: Sequence[Any],
+                             batch_size: int, row_factory: Optional[RowFactory]) -> Iterator[Any]:
+        """``fetch_iter`` que mide solo el tiempo en la base (no el del consumidor)."""
+        elapsed = 0.0
+        count = 0
+        try:
+            with self.connection() as conn:
+                cursor = conn.cursor()
+                started = perf_counter()
+                self._execute(cursor, query, params)
+                convert = row_factory(column_index(cursor)) if row_factory else None
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    elapsed += perf_counter() - started
+                    if not rows:
+                        break
+                    count += len(rows)
+                    if convert:
+                        yield from map(convert, rows)
+                    else:
+                        yield from rows
+                    started = perf_counter()
+        finally:
+            stats.record(query, params, elapsed, rows=count)
     
     def fetch_all(self, query: str, params: Sequence[Any] = ()) -> List[Dict[str, Any]]:
         """Retorna todas las filas como diccionarios."""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        columns = [col[0] for col in cursor.description]
-        return [{col: row[idx] for idx, col in enumerate(columns)} for row in rows]
+        stats = self.query_stats
+        started = perf_counter() if stats else 0.0
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            self._execute(cursor, query, params)
+            rows = cursor.fetchall()
+            if stats:
+                stats.record(query, params, perf_counter() - started, rows=len(rows))
+            columns = [col[0] for col in cursor.description]
+            return [{col: row[idx] for idx, col in enumerate(columns)} for row in rows]
+
 
+if QUERY_STATS or QUERY_SLOW_MS > 0:
+    DatabaseConnection.enable_query_stats()
@@ -0,0 +1,178 @@
+"""Diferencias de SQL entre los motores soportados (SQL Server y SQLite)."""
+import re
+from functools import lru_cache
+from typing import Any, List, Sequence, Tuple
+
+_TOP_PARAM = re.compile(r"^(\s*SELECT\s+)TOP\s*\(\?\)\s+", re.IGNORECASE)
+_TOP_LITERAL = re.compile(r"^(\s*SELECT\s+)TOP\s*\(?(\d+)\)?\s+", re.IGNORECASE)
+_OUTPUT_INSERTED = re.compile(
+    r"\s+OUTPUT\s+(INSERTED\.\w+(?:\s+AS\s+\w+)?(?:\s*,\s*INSERTED\.\w+(?:\s+AS\s+\w+)?)*)",
+    re.IGNORECASE
+)
+
+_COMMENTS = re.compile(r"/\*.*?\*/|--[^\n]*", re.DOTALL)
+_CREATE_TABLE = re.compile(r"CREATE\s+TABLE\s+(?:dbo\.)?(\w+)\s*\((.*?)\n\s*\);", re.DOTALL | re.IGNORECASE)
+_CREATE_INDEX = re.compile(r"CREATE\s+INDEX\s+(\w+)\s+ON\s+(?:dbo\.)?(\w+)\s*\(([^)]*)\);", re.IGNORECASE)
+_SCHEMA_TYPES = (
+    (re.compile(r"\bINT\s+IDENTITY\s*\(\s*1\s*,\s*1\s*\)\s+NOT\s+NULL\s+PRIMARY\s+KEY", re.IGNORECASE),
+     "INTEGER PRIMARY KEY AUTOINCREMENT"),
+    (re.compile(r"\bNVARCHAR\s*\(\s*MAX\s*\)", re.IGNORECASE), "TEXT"),
+    (re.compile(r"\(\s*SYSUTCDATETIME\s*\(\s*\)\s*\)", re.IGNORECASE), "(CURRENT_TIMESTAMP)"),
+    (re.compile(r"\bdbo\.", re.IGNORECASE), ""),
+)
+
+
+class Dialect:
+    """SQL propio de SQL Server; los repositorios están escritos en este dialecto.
+
+    Las subclases reescriben las pocas construcciones que difieren en otros
+    motores. ``translates`` indica si hay que pasar cada sentencia por
+    ``translate``, así SQL Server no paga ningún costo adicional.
+    """
+
+    name = 'sqlserver'
+    supports_merge = True
+    translates = False
+    list_tables_sql = "SELECT TABLE_NAME AS name FROM INFORMATION_SCHEMA.TABLES"
+
+    def translate(self, query: str, params: Sequence[Any]) -> Tuple[str, Sequence[Any]]:
+        """Adapta una sentencia escrita para SQL Server al motor."""
+        return query, params
+
+    def begin(self, conn) -> None:
+        """Abre una transacción explícita (pyodbc ya trabaja con ``autocommit`` apagado)."""
+
+    def savepoint(self, cursor, name: str) -> bool:
+        """Crea un savepoint; retorna False si aún no había transacción que proteger."""
+        # SAVE TRANSACTION falla si aún no hay transacción abierta (@@TRANCOUNT = 0);
+        # en ese caso no hay trabajo previo que proteger y basta un rollback completo.
+        cursor.execute(
+            f"IF @@TRANCOUNT > 0 BEGIN SAVE TRANSACTION {name}; SELECT 1 END ELSE SELECT 0"
+        )
+        return bool(cursor.fetchone()[0])
+
+    def rollback_to_savepoint(self, cursor, name: str) -> None:
+        cursor.execute(f"ROLLBACK TRANSACTION {name}")
+
+    def prepare_executemany(self, cursor) -> None:
+        """Envía todas las filas de ``executemany`` como un arreglo de parámetros."""
+        cursor.fast_executemany = True
+
+    def upsert_sql(self, table: str, columns: Sequence[str], keys: Sequence[str], row_count: int) -> str:
+        """Sentencia que inserta ``row_count`` filas o actualiza las existentes según ``keys``.
+
+        Solo actualiza las filas cuyo valor cambió. ``HOLDLOCK`` mantiene el
+        bloqueo de rango entre la búsqueda y el INSERT, así dos upserts
+        concurrentes de la misma clave no chocan con la clave primaria.
+        """
+        values = ", ".join("(" + ", ".join("?" for _ in columns) + ")" for _ in range(row_count))
+        updates = [col for col in columns if col not in keys]
+        on = " AND ".join(f"target.{key} = source.{key}" for key in keys)
+        changed = " OR ".join(f"target.{col} <> source.{col}" for col in updates)
+        assignments = ", ".join(f"{col} = source.{col}" for col in updates)
+        column_list = ", ".join(columns)
+        source_list = ", ".join(f"source.{col}" for col in columns)
+        return (
+            f"MERGE INTO {table} WITH (HOLDLOCK) AS target "
+            f"USING (VALUES {values}) AS source ({column_list}) "
+            f"ON {on} "
+            f"WHEN MATCHED AND ({changed}) THEN UPDATE SET {assignments} "
+            f"WHEN NOT MATCHED THEN INSERT ({column_list}) VALUES ({source_list});"
+        )
+
+
+class SqliteDialect(Dialect):
+    """Reescritura a SQLite (3.35+, por ``RETURNING``).
+
+    Cubre ``SELECT TOP`` (pasa a ``LIMIT`` al final), ``OUTPUT INSERTED.col``
+    en INSERT (pasa a ``RETURNING``) y ``COUNT_BIG``. ``MERGE`` no se traduce:
+    quien lo usa consulta ``supports_merge`` o ``upsert_sql``.
+    """
+
+    name = 'sqlite'
+    supports_merge = False
+    translates = True
+    list_tables_sql = "SELECT name FROM sqlite_master WHERE type = 'table'"
+
+    def translate(self, query: str, params: Sequence[Any]) -> Tuple[str, Sequence[Any]]:
+        translated, move_first_param = _translate_sqlite(query)
+        if move_first_param:
+            # TOP (?) es siempre el primer parámetro y LIMIT ? queda al final
+            params = (*params[1:], params[0])
+        return translated, params
+
+    def begin(self, conn) -> None:
+        conn.execute("BEGIN")
+
+    def savepoint(self, cursor, name: str) -> bool:
+        cursor.execute(f"SAVEPOINT {name}")
+        return True
+
+    def rollback_to_savepoint(self, cursor, name: str) -> None:
+        cursor.execute(f"ROLLBACK TO SAVEPOINT {name}")
+
+    def prepare_executemany(self, cursor) -> None:
+        pass
+
+    def upsert_sql(self, table: str, columns: Sequence[str], keys: Sequence[str], row_count: int) -> str:
+        values = ", ".join("(" + ", ".join("?" for _ in columns) + ")" for _ in range(row_count))
+        updates = [col for col in columns if col not in keys]
+        changed = " OR ".join(f"{table}.{col} <> excluded.{col}" for col in updates)
+        assignments = ", ".join(f"{col} = excluded.{col}" for col in updates)
+        return (
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES {values} "
+            f"ON CONFLICT ({', '.join(keys)}) DO UPDATE SET {assignments} WHERE {changed};"
+        )
+
+    @staticmethod
+    def schema_statements(script: str) -> List[str]:
+        """Convierte el script de SQL Server (``docs/sqlserver_schema.sql``) a sentencias SQLite."""
+        script = _COMMENTS.sub("", script)
+        statements = []
+        for table, body in _CREATE_TABLE.findall(script):
+            for pattern, replacement in _SCHEMA_TYPES:
+                body = pattern.sub(replacement, body)
+            statements.append(f"CREATE TABLE IF NOT EXISTS {table} ({body}\n)")
+        for index, table, columns in _CREATE_INDEX.findall(script):
+            statements.append(f"CREATE INDEX IF NOT EXISTS {index} ON {table}({columns})")
+        return statements
+
+
+@lru_cache(maxsize=512)
+def _translate_sqlite(query: str) -> Tuple[str, bool]:
+    """Traduce una sentencia (con caché: los repositorios reutilizan las mismas)."""
+    limit = None
+    move_first_param = False
+    if _TOP_PARAM.match(query):
+        query = _TOP_PARAM.sub(r"\1", query, count=1)
+        limit, move_first_param = "?", True
+    else:
+        match = _TOP_LITERAL.match(query)
+        if match:
+            query = _TOP_LITERAL.sub(r"\1", query, count=1)
+            limit = match.group(2)
+    returning = None
+    if query.lstrip().upper().startswith("INSERT"):
+        match = _OUTPUT_INSERTED.search(query)
+        if match:
+            query = _OUTPUT_INSERTED.sub("", query, count=1)
+            returning = re.sub(r"\bINSERTED\.", "", match.group(1), flags=re.IGNORECASE)
+    query = re.sub(r"\bCOUNT_BIG\(", "COUNT(", query, flags=re.IGNORECASE)
+    if limit is not None or returning is not None:
+        query = query.rstrip().rstrip(";")
+        if limit is not None:
+            query += f" LIMIT {limit}"
+        if returning is not None:
+            query += f" RETURNING {returning}"
+    return query, move_first_param
+
+
+DIALECTS = {'sqlserver': Dialect(), 'sqlite': SqliteDialect()}
+
+
+def get_dialect(backend: str) -> Dialect:
+    """Dialecto para el nombre de motor configurado (``DB_BACKEND``)."""
+    try:
+        return DIALECTS[backend]
+    except KeyError:
+        raise ValueError(f"Motor de base de datos no soportado: {backend}") from None
@@ -1,4 +1,4 @@
-"""Comprobación de la base de datos SQL Server."""
+"""Comprobación (y, con SQLite, creación) del esquema de la base de datos."""
 from typing import List
 
 from src.core.database import DatabaseConnection
@@ -17,26 +17,23 @@ REQUIRED_TABLES = [
 
 
 def find_missing_tables() -> List[str]:
-    """Devuelve la lista de tablas que no existen en SQL Server."""
+    """Devuelve la lista de tablas requeridas que no existen en la base."""
     db = DatabaseConnection()
-    missing = []
-    for table in REQUIRED_TABLES:
-        row = db.fetch_one(
-            """
-            SELECT 1 AS exists_flag
-            FROM INFORMATION_SCHEMA.TABLES
-            WHERE TABLE_NAME = ?
-            """,
-            (table,),
-        )
-        if row is None:
-            missing.append(table)
-    return missing
+    existing = {row['name'].lower() for row in db.fetch_all(db.dialect.list_tables_sql)}
+    return [table for table in REQUIRED_TABLES if table not in existing]
 
 
 def ensure_database_initialized():
-    """Valida que la base esté preparada; en caso contrario informa al usuario."""
+    """Valida que la base esté preparada; en caso contrario informa al usuario.
+    
+    Con ``DB_BACKEND=sqlite`` las tablas que falten se crean a partir de
+    ``docs/sqlserver_schema.sql``.
+    """
     missing_tables = find_missing_tables()
+    if missing_tables and DatabaseConnection.backend == 'sqlite':
+        from src.core.sqlite_backend import create_schema
+        create_schema(DatabaseConnection())
+        missing_tables = find_missing_tables()
     if missing_tables:
         missing_list = ", ".join(missing_tables)
         raise RuntimeError(
@@ -44,4 +41,3 @@ def ensure_database_initialized():
             f"Faltan: {missing_list}. Ejecuta el script docs/sqlserver_schema.sql "
             "en tu instancia PCSEBASTIAN\\SQLEXPRESS01 y vuelve a intentarlo."
         )
-
@@ -0,0 +1,180 @@
+"""Métricas por sentencia SQL y log de consultas lentas."""
+import json
+import os
+import re
+import sys
+import threading
+from collections import Counter, deque
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Sequence
+
+# Muestras de duración que se conservan por sentencia para estimar el p95
+DEFAULT_SAMPLES = 1000
+
+_STRING_LITERAL = re.compile(r"N?'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_ROW_LIST = re.compile(r"(\(\?(?:, \.\.\.)?\))(?:\s*,\s*\(\?(?:, \.\.\.)?\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+_INTERNAL_FILES = ("database.py", "contextlib.py", "query_stats.py")
+
+
+@lru_cache(maxsize=1024)
+def normalize_sql(query: str) -> str:
+    """Forma canónica de una sentencia: sin literales ni listas de parámetros de largo variable.
+
+    ``IN (?, ?, ?)`` queda como ``IN (?, ...)`` y los ``VALUES`` multi-fila como
+    una sola fila seguida de ``, ...``, así los lotes de distinto tamaño se
+    agrupan en la misma entrada.
+    """
+    query = _WHITESPACE.sub(" ", query).strip().rstrip(";")
+    query = _STRING_LITERAL.sub("?", query)
+    query = _NUMBER_LITERAL.sub("?", query)
+    query = _PLACEHOLDER_LIST.sub("(?, ...)", query)
+    return _ROW_LIST.sub(r"\1, ...", query)
+
+
+def param_shape(params: Sequence[Any]) -> str:
+    """Describe los parámetros por tipo, sin sus valores (pueden contener datos personales)."""
+    names = [type(value).__name__ if value is not None else "NULL" for value in params]
+    if len(names) <= 10:
+        return "(" + ", ".join(names) + ")"
+    counts = Counter(names)
+    return f"{len(names)} parámetros: " + ", ".join(f"{name}×{count}" for name, count in counts.most_common())
+
+
+def caller_name(depth: int = 2) -> str:
+    """Primer método fuera de la capa de acceso a datos en la pila (p. ej. ``SurveyRepository.find_page``)."""
+    frame = sys._getframe(depth)
+    while frame is not None and os.path.basename(frame.f_code.co_filename) in _INTERNAL_FILES:
+        frame = frame.f_back
+    if frame is None:
+        return "?"
+    owner = frame.f_locals.get("self")
+    if owner is not None:
+        return f"{type(owner).__name__}.{frame.f_code.co_name}"
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}.{frame.f_code.co_name}"
+
+
+class _StatementStats:
+    """Acumulados de una sentencia normalizada."""
+
+    __slots__ = ("calls", "total", "max", "rows", "samples", "callers")
+
+    def __init__(self, samples: int):
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.samples: Deque[float] = deque(maxlen=samples)
+        self.callers: Counter = Counter()
+
+
+class QueryStats:
+    """Registro de llamadas por sentencia normalizada.
+
+    Guarda cantidad de llamadas, tiempo total, medio, máximo y p95 (sobre las
+    últimas ``samples`` duraciones), filas devueltas y métodos que la llamaron.
+    Las sentencias que tardan ``slow_ms`` o más se informan por stderr con la
+    forma de sus parámetros. Con ``dump_path`` el resumen se escribe en JSON
+    cada ``dump_interval`` segundos.
+    """
+
+    def __init__(self, slow_ms: float = 0.0, samples: int = DEFAULT_SAMPLES,
+                 dump_path: Optional[str] = None, dump_interval: float = 60.0):
+        self.slow_ms = slow_ms
+        self.samples = max(1, samples)
+        self._lock = threading.Lock()
+        self._statements: Dict[str, _StatementStats] = {}
+        self.slow_queries = 0
+        self._stop = threading.Event()
+        self._dump_thread: Optional[threading.Thread] = None
+        if dump_path:
+            self.start_periodic_dump(dump_path, dump_interval)
+
+    def record(self, query: str, params: Sequence[Any], seconds: float,
+               rows: int = 0, caller: Optional[str] = None) -> None:
+        """Suma una ejecución de ``query`` que tardó ``seconds`` y devolvió ``rows`` filas."""
+        statement = normalize_sql(query)
+        caller = caller or caller_name(2)
+        with self._lock:
+            stats = self._statements.get(statement)
+            if stats is None:
+                stats = self._statements[statement] = _StatementStats(self.samples)
+            stats.calls += 1
+            stats.total += seconds
+            stats.max = max(stats.max, seconds)
+            stats.rows += rows
+            stats.samples.append(seconds)
+            stats.callers[caller] += 1
+        if self.slow_ms and seconds * 1000 >= self.slow_ms:
+            with self._lock:
+                self.slow_queries += 1
+            print(
+                f"Consulta lenta ({seconds * 1000:.1f} ms, {caller}): {statement} "
+                f"parámetros {param_shape(params)}",
+                file=sys.stderr
+            )
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Métricas por sentencia, de mayor a menor tiempo total (tiempos en ms)."""
+        with self._lock:
+            items = [(statement, stats, sorted(stats.samples), dict(stats.callers))
+                     for statement, stats in self._statements.items()]
+        result = []
+        for statement, stats, samples, callers in items:
+            p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))] if samples else 0.0
+            result.append({
+                'statement': statement,
+                'calls': stats.calls,
+                'total_ms': stats.total * 1000,
+                'mean_ms': stats.total * 1000 / stats.calls,
+                'p95_ms': p95 * 1000,
+                'max_ms': stats.max * 1000,
+                'rows': stats.rows,
+                'callers': callers,
+            })
+        result.sort(key=lambda item: item['total_ms'], reverse=True)
+        return result
+
+    def reset(self) -> None:
+        """Descarta todo lo acumulado."""
+        with self._lock:
+            self._statements.clear()
+            self.slow_queries = 0
+
+    def dump(self, path: str) -> None:
+        """Escribe ``snapshot()`` en ``path`` como JSON (reemplazo atómico)."""
+        target = Path(path)
+        temp = target.with_name(target.name + ".tmp")
+        temp.write_text(json.dumps(self.snapshot(), ensure_ascii=False, indent=2), encoding="utf-8")
+        temp.replace(target)
+
+    def start_periodic_dump(self, path: str, interval: float) -> None:
+        """Escribe el resumen en ``path`` cada ``interval`` segundos en un hilo aparte."""
+        if self._dump_thread is not None:
+            return
+
+        def run():
+            while not self._stop.wait(interval):
+                self._safe_dump(path)
+            self._safe_dump(path)
+
+        self._dump_thread = threading.Thread(target=run, name="query-stats-dump", daemon=True)
+        self._dump_thread.start()
+
+    def _safe_dump(self, path: str) -> None:
+        try:
+            self.dump(path)
+        except OSError as exc:
+            print(f"Error al escribir métricas de consultas en {path}: {exc}", file=sys.stderr)
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """Detiene el volcado periódico (con un último volcado)."""
+        self._stop.set()
+        if self._dump_thread is not None:
+            self._dump_thread.join(timeout)
+            self._dump_thread = None
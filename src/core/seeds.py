@@ -294,65 +294,35 @@ def seed_database():
         except Exception as e:
             print(f"Error al crear pregunta: {str(e)}")
     
-    # Configurar algunos prefills de ejemplo por perfil
+    # Configurar algunos prefills de ejemplo por perfil (un solo MERGE para toda la matriz)
     if question_ids and profile_ids:
-        # Manager: YES para preguntas de comprensión y comunicación
+        prefills = {}
+        # Manager: YES para preguntas de comprensión (1-3) y comunicación (12-15)
         if "Manager" in profile_ids:
-            manager_id = profile_ids["Manager"]
-            # Preguntas 1-3: Comprensión (YES)
-            for q_id in question_ids[0:3]:
-                try:
-                    question_service.set_default_answer(manager_id, q_id, "YES")
-                    print(f"Prefill: Manager -> Pregunta {q_id} = YES")
-                except Exception as e:
-                    print(f"Error al configurar prefill: {str(e)}")
-            # Preguntas 12-15: Comunicación (YES)
-            for q_id in question_ids[11:15] if len(question_ids) > 15 else []:
-                try:
-                    question_service.set_default_answer(manager_id, q_id, "YES")
-                    print(f"Prefill: Manager -> Pregunta {q_id} = YES")
-                except Exception as e:
-                    print(f"Error al configurar prefill: {str(e)}")
+            manager_ids = question_ids[0:3] + (question_ids[11:15] if len(question_ids) > 15 else [])
+            prefills[profile_ids["Manager"]] = {q_id: "YES" for q_id in manager_ids}
         
-        # Senior Manager: YES para análisis y metodología
+        # Senior Manager: YES para análisis y metodología (4-7)
         if "Senior Manager" in profile_ids:
-            senior_manager_id = profile_ids["Senior Manager"]
-            # Preguntas 4-7: Análisis y Metodología (YES)
-            for q_id in question_ids[3:7] if len(question_ids) > 7 else []:
-                try:
-                    question_service.set_default_answer(senior_manager_id, q_id, "YES")
-                    print(f"Prefill: Senior Manager -> Pregunta {q_id} = YES")
-                except Exception as e:
-                    print(f"Error al configurar prefill: {str(e)}")
+            senior_ids = question_ids[3:7] if len(question_ids) > 7 else []
+            prefills[profile_ids["Senior Manager"]] = {q_id: "YES" for q_id in senior_ids}
         
-        # Analyst: NA para algunas preguntas de gestión y cumplimiento
+        # Analyst: NA para gestión de riesgos (16-18) y cumplimiento (33-34), que pueden no aplicar
         if "Analyst" in profile_ids:
-            analyst_id = profile_ids["Analyst"]
-            # Preguntas 16-18: Gestión de Riesgos (NA - puede no aplicar)
-            for q_id in question_ids[15:18] if len(question_ids) > 18 else []:
-                try:
-                    question_service.set_default_answer(analyst_id, q_id, "NA")
-                    print(f"Prefill: Analyst -> Pregunta {q_id} = NA")
-                except Exception as e:
-                    print(f"Error al configurar prefill: {str(e)}")
-            # Preguntas 33-34: Cumplimiento (NA - puede no aplicar)
-            for q_id in question_ids[32:34] if len(question_ids) > 34 else []:
-                try:
-                    question_service.set_default_answer(analyst_id, q_id, "NA")
-                    print(f"Prefill: Analyst -> Pregunta {q_id} = NA")
-                except Exception as e:
-                    print(f"Error al configurar prefill: {str(e)}")
+            analyst_ids = (question_ids[15:18] if len(question_ids) > 18 else []) + \
+                (question_ids[32:34] if len(question_ids) > 34 else [])
+            prefills[profile_ids["Analyst"]] = {q_id: "NA" for q_id in analyst_ids}
         
-        # Other: Mixto
+        # Other: algunas preguntas básicas con YES
         if "Other" in profile_ids:
-            other_id = profile_ids["Other"]
-            # Algunas preguntas básicas con YES
-            for q_id in question_ids[0:2] if len(question_ids) > 2 else []:
-                try:
-                    question_service.set_default_answer(other_id, q_id, "YES")
-                    print(f"Prefill: Other -> Pregunta {q_id} = YES")
-                except Exception as e:
-                    print(f"Error al configurar prefill: {str(e)}")
+            other_ids = question_ids[0:2] if len(question_ids) > 2 else []
+            prefills[profile_ids["Other"]] = {q_id: "YES" for q_id in other_ids}
+        
+        try:
+            count = question_service.set_defaults_for_profiles(prefills)
+            print(f"Prefills configurados: {count} respuestas por defecto en {len(prefills)} perfiles")
+        except Exception as e:
+            print(f"Error al configurar prefills: {str(e)}")
     
     # Configurar tiers por defecto para cada área
     ensure_default_tiers_for_all_areas(tier_service=tier_service, area_service=area_service)
@@ -362,10 +332,8 @@ def seed_database():
 
 def has_seed_data() -> bool:
     """Verifica si ya existen preguntas (indicador de datos de ejemplo)."""
-    question_service = QuestionService()
     try:
-        existing_questions = question_service.get_all_questions(active_only=False)
-        return len(existing_questions) > 0
+        return QuestionService().has_questions()
     except Exception as exc:
         print(f"Error al verificar datos de ejemplo: {exc}")
         return False
@@ -380,19 +348,16 @@ def ensure_seed_data():
     
     print("Insertando datos de ejemplo...")
     seed_database()
-    ensure_default_tiers_for_all_areas()
     return True
 
 
-def ensure_default_tiers_for_all_areas(tier_service: TierService = None, area_service: AreaService = None):
-    """Garantiza que cada área tenga la configuración base de tiers."""
+def ensure_default_tiers_for_all_areas(tier_service: TierService = None, area_service: AreaService = None) -> int:
+    """Garantiza que cada área tenga la configuración base de tiers (una sola sentencia).
+    
+    ``area_service`` se mantiene por compatibilidad; ya no se recorren las áreas.
+    """
     tier_service = tier_service or TierService()
-    area_service = area_service or AreaService()
-    areas = area_service.get_all_areas(active_only=False)
-    if not areas:
-        return
-    for area in areas:
-        tier_service.ensure_default_tiers(area.id, DEFAULT_TIER_CONFIG)
+    return tier_service.ensure_default_tiers_for_all_areas(DEFAULT_TIER_CONFIG)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,65 @@
+"""Motor SQLite embebido (archivo o ``:memory:``) para uso local, pruebas y benchmarks."""
+import sqlite3
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+from src.core.dialect import SqliteDialect
+
+SCHEMA_PATH = Path(__file__).resolve().parents[2] / "docs" / "sqlserver_schema.sql"
+
+# Misma precisión que DATETIME2(0) y mismo formato que CURRENT_TIMESTAMP
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(sep=" ", timespec="seconds"))
+sqlite3.register_converter("DATETIME2", lambda raw: datetime.fromisoformat(raw.decode()))
+
+
+def is_memory(path: str) -> bool:
+    """Indica si ``path`` es una base en memoria (solo vive mientras su conexión esté abierta)."""
+    return path == ":memory:" or "mode=memory" in path
+
+
+def _binary_checksum(*values) -> int:
+    """Equivalente aproximado de ``BINARY_CHECKSUM`` (entero de 32 bits con signo)."""
+    checksum = zlib.crc32(repr(values).encode())
+    return checksum - (1 << 32) if checksum >= (1 << 31) else checksum
+
+
+class _ChecksumAgg:
+    """Equivalente de ``CHECKSUM_AGG``: XOR de los valores, insensible al orden."""
+
+    def __init__(self):
+        self.value = None
+
+    def step(self, value):
+        if value is not None:
+            self.value = value if self.value is None else self.value ^ value
+
+    def finalize(self):
+        return self.value
+
+
+def connect(path: str) -> sqlite3.Connection:
+    """Abre una conexión SQLite con autocommit; las transacciones las abre ``SqliteDialect.begin``."""
+    connection = sqlite3.connect(
+        path,
+        detect_types=sqlite3.PARSE_DECLTYPES,
+        isolation_level=None,
+        check_same_thread=False,
+        uri=path.startswith("file:"),
+    )
+    connection.execute("PRAGMA foreign_keys = ON")
+    if not is_memory(path):
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA busy_timeout = 30000")
+    connection.create_function("BINARY_CHECKSUM", -1, _binary_checksum, deterministic=True)
+    connection.create_aggregate("CHECKSUM_AGG", 1, _ChecksumAgg)
+    return connection
+
+
+def create_schema(db, schema_path: Path = SCHEMA_PATH) -> None:
+    """Crea las tablas e índices de ``docs/sqlserver_schema.sql`` que falten."""
+    statements = SqliteDialect.schema_statements(schema_path.read_text(encoding="utf-8"))
+    with db.transaction() as conn:
+        cursor = conn.cursor()
+        for statement in statements:
+            cursor.execute(statement)
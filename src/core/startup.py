@@ -0,0 +1,56 @@
+"""Preparación de la base al arrancar, con tiempos por etapa."""
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Iterator, List, Optional, Tuple
+
+
+class StartupTimer:
+    """Acumula la duración de cada etapa del arranque."""
+
+    def __init__(self):
+        self.steps: List[Tuple[str, float]] = []
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        """Mide el bloque ``with`` como la etapa ``name``."""
+        started = perf_counter()
+        try:
+            yield
+        finally:
+            self.steps.append((name, perf_counter() - started))
+
+    @property
+    def total(self) -> float:
+        return sum(seconds for _name, seconds in self.steps)
+
+    def report(self) -> str:
+        """Resumen de etapas en milisegundos."""
+        width = max((len(name) for name, _seconds in self.steps), default=0)
+        lines = [f"  {name:<{width}}  {seconds * 1000:8.1f} ms" for name, seconds in self.steps]
+        lines.append(f"  {'Total':<{width}}  {self.total * 1000:8.1f} ms")
+        return "Arranque:\n" + "\n".join(lines)
+
+
+def prepare_database(timer: Optional[StartupTimer] = None) -> StartupTimer:
+    """Valida el esquema, carga datos de ejemplo si faltan y completa los tiers por defecto.
+
+    Cada etapa cuesta una sentencia: las tablas se validan con una sola
+    consulta, los datos de ejemplo con ``EXISTS`` y los tiers con un único
+    INSERT ... SELECT para todas las áreas.
+    """
+    from src.core.init_db import ensure_database_initialized
+    from src.core.seeds import ensure_default_tiers_for_all_areas, has_seed_data, seed_database
+
+    timer = timer or StartupTimer()
+    with timer.step("Esquema"):
+        ensure_database_initialized()
+    with timer.step("Datos de ejemplo"):
+        seeded = has_seed_data()
+    if not seeded:
+        print("Insertando datos de ejemplo...")
+        with timer.step("Carga de datos de ejemplo"):
+            seed_database()
+    else:
+        with timer.step("Tiers por defecto"):
+            ensure_default_tiers_for_all_areas()
+    return timer
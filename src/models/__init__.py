@@ -3,9 +3,10 @@ from .profile import Profile
 from .area import Area
 from .case import Case
 from .question import Question
-from .survey import Survey, SurveyResponse
+from .survey import Survey, SurveyResponse, SurveySummary, SurveyFilters, ScoreChange, RescoreReport
 from .profile_question_default import ProfileQuestionDefault
 from .tier import Tier
+from .audit import AuditEntry, AuditFilters
 
 __all__ = [
     'Profile',
@@ -14,7 +15,13 @@ __all__ = [
     'Question',
     'Survey',
     'SurveyResponse',
+    'SurveySummary',
+    'SurveyFilters',
+    'ScoreChange',
+    'RescoreReport',
     'ProfileQuestionDefault',
-    'Tier'
+    'Tier',
+    'AuditEntry',
+    'AuditFilters'
 ]
 
@@ -0,0 +1,59 @@
+"""Modelos del Log de Auditoría."""
+from dataclasses import dataclass
+from typing import Optional, Tuple
+from datetime import datetime
+
+# Acciones admitidas por CK_audit_action
+AUDIT_ACTIONS = ('CREATE', 'UPDATE', 'DELETE', 'VIEW', 'EXPORT')
+
+
+@dataclass
+class AuditEntry:
+    """Representa una entrada del log de auditoría."""
+    id: int
+    entity_type: str
+    entity_id: Optional[int]
+    action: str
+    user_profile: Optional[str]
+    details: Optional[str]
+    created_at: Optional[datetime]
+    
+    @property
+    def cursor(self) -> Tuple[Optional[datetime], int]:
+        """Posición de esta fila para pedir la página siguiente (keyset)."""
+        return (self.created_at, self.id)
+    
+    def to_dict(self) -> dict:
+        """Representación como diccionario (formato histórico de ``AuditRepository``)."""
+        return {
+            'id': self.id,
+            'entity_type': self.entity_type,
+            'entity_id': self.entity_id,
+            'action': self.action,
+            'user_profile': self.user_profile,
+            'details': self.details,
+            'created_at': self.created_at
+        }
+
+
+@dataclass
+class AuditFilters:
+    """Filtros de consulta del log de auditoría; los campos en None no se aplican.
+    
+    ``date_from`` es inclusivo y ``date_to`` exclusivo.
+    """
+    entity_type: Optional[str] = None
+    entity_id: Optional[int] = None
+    action: Optional[str] = None
+    user_profile: Optional[str] = None
+    date_from: Optional[datetime] = None
+    date_to: Optional[datetime] = None
+    
+    def __post_init__(self):
+        """Validaciones después de la inicialización."""
+        if self.action is not None and self.action not in AUDIT_ACTIONS:
+            raise ValueError(f"La acción debe ser una de: {', '.join(AUDIT_ACTIONS)}")
+        if self.entity_id is not None and not self.entity_type:
+            raise ValueError("Para filtrar por entidad se requiere el tipo de entidad")
+        if self.date_from and self.date_to and self.date_from > self.date_to:
+            raise ValueError("La fecha inicial no puede ser posterior a la final")
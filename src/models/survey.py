@@ -1,6 +1,6 @@
 """Modelos de Encuesta."""
-from dataclasses import dataclass
-from typing import Optional, List
+from dataclasses import dataclass, field
+from typing import Optional, List, Tuple
 from datetime import datetime
 
 
@@ -51,3 +51,94 @@ class SurveyResponse:
         if self.penalty_applied < 0:
             raise ValueError("La penalización no puede ser negativa")
 
+
+
+@dataclass
+class SurveySummary:
+    """Fila liviana del listado de encuestas (sin respuestas)."""
+    id: int
+    created_at: Optional[datetime]
+    evaluator_profile: str
+    sid: str
+    case_id: int
+    case_name: Optional[str]
+    area_id: Optional[int]
+    is_graduated: bool
+    final_score: float
+    tier_id: Optional[int] = None
+    tier_name: Optional[str] = None
+    
+    @property
+    def cursor(self) -> Tuple[Optional[datetime], int]:
+        """Posición de esta fila para pedir la página siguiente (keyset)."""
+        return (self.created_at, self.id)
+
+
+@dataclass
+class SurveyFilters:
+    """Filtros del listado de encuestas; los campos en None no se aplican.
+    
+    ``date_from`` y ``min_score`` son inclusivos; ``date_to`` y ``max_score`` exclusivos.
+    """
+    date_from: Optional[datetime] = None
+    date_to: Optional[datetime] = None
+    case_id: Optional[int] = None
+    area_id: Optional[int] = None
+    evaluator_profile: Optional[str] = None
+    tier_id: Optional[int] = None
+    min_score: Optional[float] = None
+    max_score: Optional[float] = None
+    
+    def __post_init__(self):
+        """Validaciones después de la inicialización."""
+        if self.date_from and self.date_to and self.date_from > self.date_to:
+            raise ValueError("La fecha inicial no puede ser posterior a la final")
+        if self.min_score is not None and self.max_score is not None and self.min_score >= self.max_score:
+            raise ValueError("El puntaje mínimo debe ser menor al máximo")
+
+
+@dataclass
+class ScoreChange:
+    """Diferencia de puntaje/tier de una encuesta al recalcularla."""
+    survey_id: int
+    old_score: float
+    new_score: float
+    old_tier_id: Optional[int]
+    old_tier_name: Optional[str]
+    new_tier_id: Optional[int]
+    new_tier_name: Optional[str]
+
+
+@dataclass
+class RescoreReport:
+    """Resultado de un recálculo masivo (o de su simulación)."""
+    surveys_scanned: int = 0
+    responses_scanned: int = 0
+    changes: List[ScoreChange] = field(default_factory=list)
+    response_updates: List[Tuple[float, int]] = field(default_factory=list)  # (penalización, id respuesta)
+    engine: str = 'python'
+    elapsed: float = 0.0
+    applied: bool = False
+    
+    @property
+    def tier_changes(self) -> int:
+        """Cantidad de encuestas que cambian de tier."""
+        return sum(1 for c in self.changes if c.old_tier_id != c.new_tier_id)
+    
+    def format(self, limit: int = 20) -> str:
+        """Resumen legible con las primeras ``limit`` diferencias."""
+        lines = [
+            f"Encuestas revisadas: {self.surveys_scanned} | Respuestas revisadas: {self.responses_scanned}",
+            f"Encuestas con cambios: {len(self.changes)} (tier: {self.tier_changes}) | "
+            f"Respuestas con cambios: {len(self.response_updates)}",
+            f"Motor: {self.engine} | Tiempo: {self.elapsed:.2f}s | "
+            f"{'Aplicado' if self.applied else 'Simulación (sin cambios en la base de datos)'}",
+        ]
+        for change in self.changes[:limit]:
+            lines.append(
+                f"  #{change.survey_id}: {change.old_score:.2f} -> {change.new_score:.2f} | "
+                f"{change.old_tier_name or '-'} -> {change.new_tier_name or '-'}"
+            )
+        if len(self.changes) > limit:
+            lines.append(f"  ... y {len(self.changes) - limit} más")
+        return "\n".join(lines)
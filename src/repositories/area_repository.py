@@ -9,12 +9,12 @@ class AreaRepository(BaseRepository):
     
     def create(self, area: Area) -> int:
         """Crea una nueva área y retorna su ID."""
-        cursor = self.db.execute(
-            "INSERT INTO areas (name, description, active) VALUES (?, ?, ?)",
-            (area.name, area.description, 1 if area.active else 0)
-        )
-        area_id = cursor.lastrowid
-        self.log_audit('Area', area_id, 'CREATE', details=f"Nombre: {area.name}")
+        with self.db.transaction():
+            area_id = self.db.insert(
+                "INSERT INTO areas (name, description, active) OUTPUT INSERTED.id VALUES (?, ?, ?)",
+                (area.name, area.description, 1 if area.active else 0)
+            )
+            self.log_audit('Area', area_id, 'CREATE', details=f"Nombre: {area.name}")
         return area_id
     
     def find_by_id(self, area_id: int) -> Optional[Area]:
@@ -55,16 +55,18 @@ class AreaRepository(BaseRepository):
         if area.id is None:
             raise ValueError("El área debe tener un ID para ser actualizada")
         
-        self.db.execute(
-            "UPDATE areas SET name = ?, description = ?, active = ? WHERE id = ?",
-            (area.name, area.description, 1 if area.active else 0, area.id)
-        )
-        self.log_audit('Area', area.id, 'UPDATE', details=f"Nombre: {area.name}")
+        with self.db.transaction():
+            self.db.execute(
+                "UPDATE areas SET name = ?, description = ?, active = ? WHERE id = ?",
+                (area.name, area.description, 1 if area.active else 0, area.id)
+            )
+            self.log_audit('Area', area.id, 'UPDATE', details=f"Nombre: {area.name}")
         return True
     
     def delete(self, area_id: int) -> bool:
         """Elimina un área (soft delete)."""
-        self.db.execute("UPDATE areas SET active = 0 WHERE id = ?", (area_id,))
-        self.log_audit('Area', area_id, 'DELETE')
+        with self.db.transaction():
+            self.db.execute("UPDATE areas SET active = 0 WHERE id = ?", (area_id,))
+            self.log_audit('Area', area_id, 'DELETE')
         return True
 
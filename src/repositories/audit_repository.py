@@ -1,50 +1,133 @@
 """Repositorio para gestión de Log de Auditoría."""
-from typing import List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 from datetime import datetime
 from src.repositories.base_repository import BaseRepository
+from src.models.audit import AuditEntry, AuditFilters
+
+AUDIT_COLUMNS = "id, entity_type, entity_id, action, user_profile, details, created_at"
+
+DEFAULT_AUDIT_PAGE_SIZE = 100
+# Filas por consulta al recorrer el log completo (exportaciones)
+AUDIT_ITER_BATCH_SIZE = 5000
 
 
 class AuditRepository(BaseRepository):
     """Repositorio para consultas del log de auditoría."""
     
-    def get_all(self, limit: int = 100) -> List[dict]:
-        """Obtiene todas las entradas del log de auditoría."""
-        rows = self.db.fetch_all(
-            """SELECT id, entity_type, entity_id, action, user_profile, details, created_at
-               FROM audit_log ORDER BY created_at DESC LIMIT ?""",
-            (limit,)
+    def get_all(self, limit: int = DEFAULT_AUDIT_PAGE_SIZE) -> List[dict]:
+        """Obtiene las entradas más recientes del log de auditoría."""
+        return [entry.to_dict() for entry in self.find_page(limit=limit)]
+    
+    def find_page(self, filters: Optional[AuditFilters] = None,
+                  after: Optional[Tuple[datetime, int]] = None,
+                  limit: int = DEFAULT_AUDIT_PAGE_SIZE,
+                  newest_first: bool = True) -> List[AuditEntry]:
+        """Obtiene una página del log ordenada por (created_at, id).
+        
+        Paginación por keyset: ``after`` es el ``cursor`` de la última entrada de
+        la página anterior. El orden coincide con ``idx_audit_log_created`` (que
+        incluye ``id`` por ser la clave del índice agrupado), por lo que cada
+        página es una búsqueda en el índice sin importar la profundidad.
+        """
+        conditions, params = self._filter_conditions(filters)
+        if after is not None:
+            created_at, last_id = after
+            op = "<" if newest_first else ">"
+            conditions.append(f"(created_at {op} ? OR (created_at = ? AND id {op} ?))")
+            params.extend([created_at, created_at, last_id])
+        where_sql = " WHERE " + " AND ".join(conditions) if conditions else ""
+        direction = "DESC" if newest_first else "ASC"
+        return list(self.db.fetch_iter(
+            f"""SELECT TOP (?) {AUDIT_COLUMNS}
+               FROM audit_log{where_sql}
+               ORDER BY created_at {direction}, id {direction}""",
+            (limit, *params),
+            batch_size=max(1, limit),
+            row_factory=self._entry_loader
+        ))
+    
+    def iter_entries(self, filters: Optional[AuditFilters] = None,
+                     batch_size: int = AUDIT_ITER_BATCH_SIZE,
+                     newest_first: bool = True) -> Iterator[AuditEntry]:
+        """Recorre todas las entradas que cumplen ``filters`` página a página.
+        
+        Cada página es una consulta corta, así la memoria no depende del tamaño
+        del log y no se mantiene una conexión tomada entre páginas.
+        """
+        after = None
+        while True:
+            page = self.find_page(filters, after=after, limit=batch_size, newest_first=newest_first)
+            yield from page
+            if len(page) < batch_size:
+                return
+            after = page[-1].cursor
+    
+    @staticmethod
+    def _filter_conditions(filters: Optional[AuditFilters]) -> Tuple[List[str], List[Any]]:
+        """Traduce los filtros a condiciones SQL sobre ``audit_log``."""
+        conditions: List[str] = []
+        params: List[Any] = []
+        if filters is None:
+            return conditions, params
+        if filters.entity_type:
+            conditions.append("entity_type = ?")
+            params.append(filters.entity_type)
+        if filters.entity_id is not None:
+            conditions.append("entity_id = ?")
+            params.append(filters.entity_id)
+        if filters.action:
+            conditions.append("action = ?")
+            params.append(filters.action)
+        if filters.user_profile:
+            conditions.append("user_profile = ?")
+            params.append(filters.user_profile)
+        if filters.date_from is not None:
+            conditions.append("created_at >= ?")
+            params.append(filters.date_from)
+        if filters.date_to is not None:
+            conditions.append("created_at < ?")
+            params.append(filters.date_to)
+        return conditions, params
+    
+    @staticmethod
+    def _entry_loader(index: Dict[str, int]) -> Callable[[Any], AuditEntry]:
+        """Conversor de filas de ``audit_log`` para ``fetch_iter``."""
+        i_id, i_type, i_entity, i_action, i_profile, i_details, i_created = (
+            index[col.strip()] for col in AUDIT_COLUMNS.split(",")
+        )
+        return lambda row: AuditEntry(
+            id=row[i_id],
+            entity_type=row[i_type],
+            entity_id=row[i_entity],
+            action=row[i_action],
+            user_profile=row[i_profile],
+            details=row[i_details],
+            created_at=row[i_created]
         )
-        return [
-            {
-                'id': row['id'],
-                'entity_type': row['entity_type'],
-                'entity_id': row['entity_id'],
-                'action': row['action'],
-                'user_profile': row['user_profile'],
-                'details': row['details'],
-                'created_at': row['created_at']
-            }
-            for row in rows
-        ]
     
-    def get_by_entity(self, entity_type: str, entity_id: int) -> List[dict]:
-        """Obtiene el log de auditoría para una entidad específica."""
-        rows = self.db.fetch_all(
-            """SELECT id, entity_type, entity_id, action, user_profile, details, created_at
-               FROM audit_log WHERE entity_type = ? AND entity_id = ?
-               ORDER BY created_at DESC""",
-            (entity_type, entity_id)
+    def get_catalog_stamp(self) -> tuple:
+        """Obtiene una marca que cambia cuando se modifica algún catálogo.
+        
+        Combina el último registro de auditoría de preguntas, áreas, casos y
+        perfiles con un checksum de las respuestas por defecto.
+        """
+        row = self.db.fetch_one(
+            """SELECT
+                   (SELECT MAX(id) FROM audit_log
+                    WHERE entity_type IN ('Question', 'Area', 'Case', 'Profile')) AS audit_id,
+                   (SELECT COUNT_BIG(*) FROM profile_question_defaults) AS defaults_count,
+                   (SELECT CHECKSUM_AGG(BINARY_CHECKSUM(profile_id, question_id, default_answer))
+                    FROM profile_question_defaults) AS defaults_checksum"""
         )
-        return [
-            {
-                'id': row['id'],
-                'entity_type': row['entity_type'],
-                'entity_id': row['entity_id'],
-                'action': row['action'],
-                'user_profile': row['user_profile'],
-                'details': row['details'],
-                'created_at': row['created_at']
-            }
-            for row in rows
-        ]
-
+        if not row:
+            return (None, None, None)
+        return (row['audit_id'], row['defaults_count'], row['defaults_checksum'])
+    
+    def get_by_entity(self, entity_type: str, entity_id: int,
+                      limit: int = DEFAULT_AUDIT_PAGE_SIZE) -> List[dict]:
+        """Obtiene las entradas más recientes del log para una entidad específica.
+        
+        Para el historial completo usar ``iter_entries`` con ``AuditFilters``.
+        """
+        filters = AuditFilters(entity_type=entity_type, entity_id=entity_id)
+        return [entry.to_dict() for entry in self.find_page(filters, limit=limit)]
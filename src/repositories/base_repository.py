@@ -1,5 +1,6 @@
 """Repositorio base con funcionalidad común."""
 from typing import Optional
+from src.core.audit_sink import audit_sink
 from src.core.database import DatabaseConnection
 
 
@@ -10,12 +11,15 @@ class BaseRepository:
         """Inicializa el repositorio."""
         self.db = db or DatabaseConnection()
     
+    def transaction(self):
+        """Atajo a ``DatabaseConnection.transaction`` para agrupar escrituras."""
+        return self.db.transaction()
+    
     def log_audit(self, entity_type: str, entity_id: Optional[int], action: str, 
                   user_profile: Optional[str] = None, details: Optional[str] = None):
-        """Registra una acción en el log de auditoría."""
-        self.db.execute(
-            """INSERT INTO audit_log (entity_type, entity_id, action, user_profile, details)
-               VALUES (?, ?, ?, ?, ?)""",
-            (entity_type, entity_id, action, user_profile, details)
-        )
-
+        """Registra una acción en el log de auditoría.
+        
+        La entrada se escribe en lote en segundo plano una vez confirmada la
+        transacción actual (ver ``src/core/audit_sink.py``).
+        """
+        audit_sink.record(entity_type, entity_id, action, user_profile, details, db=self.db)
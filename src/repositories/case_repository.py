@@ -1,5 +1,5 @@
 """Repositorio para gestión de Casos."""
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from src.repositories.base_repository import BaseRepository
 from src.models.case import Case
 
@@ -9,14 +9,54 @@ class CaseRepository(BaseRepository):
     
     def create(self, case: Case) -> int:
         """Crea un nuevo caso y retorna su ID."""
-        cursor = self.db.execute(
-            "INSERT INTO cases (area_id, name, description, active) VALUES (?, ?, ?, ?)",
-            (case.area_id, case.name, case.description, 1 if case.active else 0)
-        )
-        case_id = cursor.lastrowid
-        self.log_audit('Case', case_id, 'CREATE', details=f"Nombre: {case.name}, Área ID: {case.area_id}")
+        with self.db.transaction():
+            case_id = self.db.insert(
+                "INSERT INTO cases (area_id, name, description, active) OUTPUT INSERTED.id VALUES (?, ?, ?, ?)",
+                (case.area_id, case.name, case.description, 1 if case.active else 0)
+            )
+            self.log_audit('Case', case_id, 'CREATE', details=f"Nombre: {case.name}, Área ID: {case.area_id}")
         return case_id
     
+    def find_or_create(self, area_id: int, name: str) -> Tuple[int, bool]:
+        """Retorna (ID, creado) del caso ``name`` del área, creándolo si no existe.
+        
+        Un solo MERGE con ``HOLDLOCK`` bajo ``UQ_cases_area_name``: dos evaluadores
+        que guardan a la vez el mismo caso nuevo obtienen el mismo ID. La rama
+        ``WHEN MATCHED`` es una actualización sin cambios para que ``OUTPUT``
+        devuelva también el ID existente.
+        """
+        with self.db.transaction():
+            if self.db.dialect.supports_merge:
+                row = self.db.fetch_one(
+                    """MERGE INTO cases WITH (HOLDLOCK) AS target
+                       USING (SELECT ? AS area_id, ? AS name) AS source
+                       ON target.area_id = source.area_id AND target.name = source.name
+                       WHEN MATCHED THEN UPDATE SET name = target.name
+                       WHEN NOT MATCHED THEN
+                           INSERT (area_id, name, description, active) VALUES (source.area_id, source.name, NULL, 1)
+                       OUTPUT INSERTED.id AS id, $action AS merge_action;""",
+                    (area_id, name)
+                )
+            else:
+                row = self._insert_or_find(area_id, name)
+            case_id = int(row['id'])
+            created = row['merge_action'] == 'INSERT'
+            if created:
+                self.log_audit('Case', case_id, 'CREATE', details=f"Nombre: {name}, Área ID: {area_id}")
+        return case_id, created
+    
+    def _insert_or_find(self, area_id: int, name: str) -> dict:
+        """Variante sin MERGE (SQLite): la transacción ya tiene la base bloqueada para escribir."""
+        row = self.db.fetch_one(
+            """INSERT INTO cases (area_id, name, description, active) VALUES (?, ?, NULL, 1)
+               ON CONFLICT (area_id, name) DO NOTHING RETURNING id""",
+            (area_id, name)
+        )
+        if row:
+            return {'id': row['id'], 'merge_action': 'INSERT'}
+        row = self.db.fetch_one("SELECT id FROM cases WHERE area_id = ? AND name = ?", (area_id, name))
+        return {'id': row['id'], 'merge_action': 'UPDATE'}
+    
     def find_by_id(self, case_id: int) -> Optional[Case]:
         """Busca un caso por ID."""
         row = self.db.fetch_one(
@@ -86,16 +126,18 @@ class CaseRepository(BaseRepository):
         if case.id is None:
             raise ValueError("El caso debe tener un ID para ser actualizado")
         
-        self.db.execute(
-            "UPDATE cases SET area_id = ?, name = ?, description = ?, active = ? WHERE id = ?",
-            (case.area_id, case.name, case.description, 1 if case.active else 0, case.id)
-        )
-        self.log_audit('Case', case.id, 'UPDATE', details=f"Nombre: {case.name}, Área ID: {case.area_id}")
+        with self.db.transaction():
+            self.db.execute(
+                "UPDATE cases SET area_id = ?, name = ?, description = ?, active = ? WHERE id = ?",
+                (case.area_id, case.name, case.description, 1 if case.active else 0, case.id)
+            )
+            self.log_audit('Case', case.id, 'UPDATE', details=f"Nombre: {case.name}, Área ID: {case.area_id}")
         return True
     
     def delete(self, case_id: int) -> bool:
         """Elimina un caso (soft delete)."""
-        self.db.execute("UPDATE cases SET active = 0 WHERE id = ?", (case_id,))
-        self.log_audit('Case', case_id, 'DELETE')
+        with self.db.transaction():
+            self.db.execute("UPDATE cases SET active = 0 WHERE id = ?", (case_id,))
+            self.log_audit('Case', case_id, 'DELETE')
         return True
 
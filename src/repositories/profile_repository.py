@@ -9,12 +9,12 @@ class ProfileRepository(BaseRepository):
     
     def create(self, profile: Profile) -> int:
         """Crea un nuevo perfil y retorna su ID."""
-        cursor = self.db.execute(
-            "INSERT INTO profiles (name, active) VALUES (?, ?)",
-            (profile.name, 1 if profile.active else 0)
-        )
-        profile_id = cursor.lastrowid
-        self.log_audit('Profile', profile_id, 'CREATE', details=f"Nombre: {profile.name}")
+        with self.db.transaction():
+            profile_id = self.db.insert(
+                "INSERT INTO profiles (name, active) OUTPUT INSERTED.id VALUES (?, ?)",
+                (profile.name, 1 if profile.active else 0)
+            )
+            self.log_audit('Profile', profile_id, 'CREATE', details=f"Nombre: {profile.name}")
         return profile_id
     
     def find_by_id(self, profile_id: int) -> Optional[Profile]:
@@ -39,16 +39,18 @@ class ProfileRepository(BaseRepository):
         if profile.id is None:
             raise ValueError("El perfil debe tener un ID para ser actualizado")
         
-        self.db.execute(
-            "UPDATE profiles SET name = ?, active = ? WHERE id = ?",
-            (profile.name, 1 if profile.active else 0, profile.id)
-        )
-        self.log_audit('Profile', profile.id, 'UPDATE', details=f"Nombre: {profile.name}")
+        with self.db.transaction():
+            self.db.execute(
+                "UPDATE profiles SET name = ?, active = ? WHERE id = ?",
+                (profile.name, 1 if profile.active else 0, profile.id)
+            )
+            self.log_audit('Profile', profile.id, 'UPDATE', details=f"Nombre: {profile.name}")
         return True
     
     def delete(self, profile_id: int) -> bool:
         """Elimina un perfil (soft delete)."""
-        self.db.execute("UPDATE profiles SET active = 0 WHERE id = ?", (profile_id,))
-        self.log_audit('Profile', profile_id, 'DELETE')
+        with self.db.transaction():
+            self.db.execute("UPDATE profiles SET active = 0 WHERE id = ?", (profile_id,))
+            self.log_audit('Profile', profile_id, 'DELETE')
         return True
 
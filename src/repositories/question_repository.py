@@ -1,27 +1,34 @@
 """Repositorio para gestión de Preguntas."""
-from typing import List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from src.core.database import MAX_PARAMS_PER_STATEMENT, MAX_ROWS_PER_VALUES
 from src.repositories.base_repository import BaseRepository
 from src.models.question import Question
 
+# (profile_id, question_id, default_answer) por fila del MERGE
+DEFAULTS_UPSERT_CHUNK_SIZE = min(MAX_ROWS_PER_VALUES, MAX_PARAMS_PER_STATEMENT // 3)
+# IDs por DELETE ... IN (...) (un parámetro queda para profile_id)
+DEFAULTS_DELETE_CHUNK_SIZE = MAX_ROWS_PER_VALUES
+
 
 class QuestionRepository(BaseRepository):
     """Repositorio para operaciones CRUD de Preguntas."""
     
     def create(self, question: Question) -> int:
         """Crea una nueva pregunta y retorna su ID."""
-        cursor = self.db.execute(
-            """INSERT INTO questions (area_id, text, active, penalty_graduated, penalty_not_graduated)
-               VALUES (?, ?, ?, ?, ?)""",
-            (
-                question.area_id,
-                question.text,
-                1 if question.active else 0,
-                question.penalty_graduated,
-                question.penalty_not_graduated
+        with self.db.transaction():
+            question_id = self.db.insert(
+                """INSERT INTO questions (area_id, text, active, penalty_graduated, penalty_not_graduated)
+                   OUTPUT INSERTED.id
+                   VALUES (?, ?, ?, ?, ?)""",
+                (
+                    question.area_id,
+                    question.text,
+                    1 if question.active else 0,
+                    question.penalty_graduated,
+                    question.penalty_not_graduated
+                )
             )
-        )
-        question_id = cursor.lastrowid
-        self.log_audit('Question', question_id, 'CREATE', details=f"Texto: {question.text[:50]}...")
+            self.log_audit('Question', question_id, 'CREATE', details=f"Texto: {question.text[:50]}...")
         return question_id
     
     def find_by_id(self, question_id: int) -> Optional[Question]:
@@ -57,43 +64,56 @@ class QuestionRepository(BaseRepository):
         query += " ORDER BY id"
         
         params = (area_id,) if area_id is not None else ()
-        rows = self.db.fetch_all(query, params)
-        return [
-            Question(
-                id=row['id'],
-                area_id=row['area_id'],
-                text=row['text'],
-                active=bool(row['active']),
-                penalty_graduated=row['penalty_graduated'],
-                penalty_not_graduated=row['penalty_not_graduated']
-            )
-            for row in rows
-        ]
+        return list(self.db.fetch_iter(query, params, row_factory=self._question_loader))
+    
+    @staticmethod
+    def _question_loader(index: Dict[str, int]) -> Callable[[Any], Question]:
+        """Conversor de filas de ``questions`` para ``fetch_iter``."""
+        i_id, i_area, i_text, i_active, i_graduated, i_not_graduated = (
+            index[col] for col in ('id', 'area_id', 'text', 'active', 'penalty_graduated', 'penalty_not_graduated')
+        )
+        return lambda row: Question(
+            id=row[i_id],
+            area_id=row[i_area],
+            text=row[i_text],
+            active=bool(row[i_active]),
+            penalty_graduated=row[i_graduated],
+            penalty_not_graduated=row[i_not_graduated]
+        )
+    
+    def has_any(self) -> bool:
+        """Indica si existe al menos una pregunta (sin leer la tabla)."""
+        row = self.db.fetch_one(
+            "SELECT CASE WHEN EXISTS (SELECT 1 FROM questions) THEN 1 ELSE 0 END AS has_any"
+        )
+        return bool(row and row['has_any'])
     
     def update(self, question: Question) -> bool:
         """Actualiza una pregunta existente."""
         if question.id is None:
             raise ValueError("La pregunta debe tener un ID para ser actualizada")
         
-        self.db.execute(
-            """UPDATE questions SET area_id = ?, text = ?, active = ?, penalty_graduated = ?, penalty_not_graduated = ?
-               WHERE id = ?""",
-            (
-                question.area_id,
-                question.text,
-                1 if question.active else 0,
-                question.penalty_graduated,
-                question.penalty_not_graduated,
-                question.id
+        with self.db.transaction():
+            self.db.execute(
+                """UPDATE questions SET area_id = ?, text = ?, active = ?, penalty_graduated = ?, penalty_not_graduated = ?
+                   WHERE id = ?""",
+                (
+                    question.area_id,
+                    question.text,
+                    1 if question.active else 0,
+                    question.penalty_graduated,
+                    question.penalty_not_graduated,
+                    question.id
+                )
             )
-        )
-        self.log_audit('Question', question.id, 'UPDATE', details=f"Texto: {question.text[:50]}...")
+            self.log_audit('Question', question.id, 'UPDATE', details=f"Texto: {question.text[:50]}...")
         return True
     
     def delete(self, question_id: int) -> bool:
         """Elimina una pregunta (soft delete)."""
-        self.db.execute("UPDATE questions SET active = 0 WHERE id = ?", (question_id,))
-        self.log_audit('Question', question_id, 'DELETE')
+        with self.db.transaction():
+            self.db.execute("UPDATE questions SET active = 0 WHERE id = ?", (question_id,))
+            self.log_audit('Question', question_id, 'DELETE')
         return True
     
     def get_default_answer(self, profile_id: int, question_id: int) -> Optional[str]:
@@ -109,19 +129,68 @@ class QuestionRepository(BaseRepository):
     
     def set_default_answer(self, profile_id: int, question_id: int, default_answer: str) -> bool:
         """Establece la respuesta por defecto para un perfil y pregunta."""
-        # Eliminar si existe
-        self.db.execute(
-            """DELETE FROM profile_question_defaults
-               WHERE profile_id = ? AND question_id = ?""",
-            (profile_id, question_id)
+        self.set_defaults(profile_id, {question_id: default_answer})
+        return True
+    
+    def set_defaults(self, profile_id: int, answers: Dict[int, str]) -> int:
+        """Inserta o actualiza las respuestas por defecto de un perfil ({question_id: respuesta})."""
+        return self.upsert_defaults(
+            (profile_id, question_id, answer) for question_id, answer in answers.items()
         )
-        # Insertar nuevo
-        self.db.execute(
-            """INSERT INTO profile_question_defaults (profile_id, question_id, default_answer)
-               VALUES (?, ?, ?)""",
-            (profile_id, question_id, default_answer)
+    
+    def set_defaults_for_profiles(self, matrix: Dict[int, Dict[int, str]]) -> int:
+        """Inserta o actualiza respuestas por defecto de varios perfiles ({profile_id: {question_id: respuesta}})."""
+        return self.upsert_defaults(
+            (profile_id, question_id, answer)
+            for profile_id, answers in matrix.items()
+            for question_id, answer in answers.items()
         )
-        return True
+    
+    def upsert_defaults(self, rows: Iterable[Tuple[int, int, str]]) -> int:
+        """Aplica filas (profile_id, question_id, respuesta) con un upsert (MERGE) por bloque.
+        
+        Las filas repetidas para el mismo par se resuelven antes de enviar (gana
+        la última), ya que MERGE no admite dos filas de origen para un mismo
+        destino. Retorna la cantidad de pares enviados.
+        """
+        unique = {(profile_id, question_id): answer for profile_id, question_id, answer in rows}
+        values: List[Tuple[int, int, str]] = [(p, q, a) for (p, q), a in unique.items()]
+        if not values:
+            return 0
+        with self.db.transaction():
+            for start in range(0, len(values), DEFAULTS_UPSERT_CHUNK_SIZE):
+                chunk = values[start:start + DEFAULTS_UPSERT_CHUNK_SIZE]
+                self.db.execute(
+                    self.db.dialect.upsert_sql(
+                        'profile_question_defaults',
+                        ('profile_id', 'question_id', 'default_answer'),
+                        ('profile_id', 'question_id'),
+                        len(chunk)
+                    ),
+                    [value for row in chunk for value in row]
+                )
+        return len(values)
+    
+    def delete_defaults(self, profile_id: int, question_ids: Optional[Sequence[int]] = None) -> int:
+        """Elimina respuestas por defecto de un perfil (todas si ``question_ids`` es None).
+        
+        Retorna la cantidad de filas eliminadas.
+        """
+        if question_ids is None:
+            return self.db.execute(
+                "DELETE FROM profile_question_defaults WHERE profile_id = ?", (profile_id,)
+            ).rowcount
+        ids = list(dict.fromkeys(question_ids))
+        deleted = 0
+        with self.db.transaction():
+            for start in range(0, len(ids), DEFAULTS_DELETE_CHUNK_SIZE):
+                chunk = ids[start:start + DEFAULTS_DELETE_CHUNK_SIZE]
+                deleted += self.db.execute(
+                    f"""DELETE FROM profile_question_defaults
+                        WHERE profile_id = ? AND question_id IN ({", ".join("?" for _ in chunk)})""",
+                    (profile_id, *chunk)
+                ).rowcount
+        return deleted
     
     def get_defaults_for_profile(self, profile_id: int) -> dict:
         """Obtiene todas las respuestas por defecto para un perfil."""
@@ -131,4 +200,32 @@ class QuestionRepository(BaseRepository):
             (profile_id,)
         )
         return {row['question_id']: row['default_answer'] for row in rows}
-
+    
+    def get_defaults_for_question(self, question_id: int) -> Dict[int, str]:
+        """Obtiene las respuestas por defecto de una pregunta en todos los perfiles ({profile_id: respuesta}).
+        
+        Una sola consulta sobre ``idx_profile_defaults_question``.
+        """
+        rows = self.db.fetch_all(
+            """SELECT profile_id, default_answer FROM profile_question_defaults
+               WHERE question_id = ?""",
+            (question_id,)
+        )
+        return {row['profile_id']: row['default_answer'] for row in rows}
+    
+    def get_defaults_matrix(self, area_id: int) -> Dict[int, Dict[int, str]]:
+        """Obtiene la matriz perfil × pregunta de respuestas por defecto de un área.
+        
+        Retorna ``{profile_id: {question_id: respuesta}}`` con una sola consulta.
+        """
+        rows = self.db.fetch_all(
+            """SELECT d.profile_id, d.question_id, d.default_answer
+               FROM profile_question_defaults d
+               INNER JOIN questions q ON q.id = d.question_id
+               WHERE q.area_id = ?""",
+            (area_id,)
+        )
+        matrix: Dict[int, Dict[int, str]] = {}
+        for row in rows:
+            matrix.setdefault(row['profile_id'], {})[row['question_id']] = row['default_answer']
+        return matrix
@@ -1,43 +1,96 @@
 """Repositorio para gestión de Encuestas."""
-from typing import List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 from datetime import datetime
 from src.repositories.base_repository import BaseRepository
-from src.models.survey import Survey, SurveyResponse
+from src.models.survey import Survey, SurveyFilters, SurveyResponse, SurveySummary
+
+SURVEY_COLUMNS = "id, evaluator_profile, sid, case_id, is_graduated, final_score, tier_id, tier_name, created_at"
+SURVEY_COLUMNS_ALIASED = ", ".join(f"s.{col.strip()}" for col in SURVEY_COLUMNS.split(","))
+RESPONSE_COLUMNS = "id, survey_id, question_id, answer, comment, penalty_applied"
+RESPONSE_COLUMNS_ALIASED = ", ".join(f"r.{col.strip()}" for col in RESPONSE_COLUMNS.split(","))
+
+# Encuestas por consulta ``IN (...)`` (SQL Server admite hasta 2100 parámetros)
+RESPONSES_IN_CHUNK_SIZE = 1000
+
+DEFAULT_PAGE_SIZE = 200
+
+EXPORT_COLUMNS = (
+    'survey_id', 'created_at', 'evaluator_profile', 'sid', 'case_name', 'is_graduated',
+    'question_id', 'answer', 'comment', 'penalty_applied', 'final_score', 'tier_name'
+)
+EXPORT_BATCH_SIZE = 2000
+
+# Filas por envío ``fast_executemany`` al aplicar un recálculo masivo
+RESCORE_WRITE_BATCH_SIZE = 5000
+
+
+def _parse_datetime(value) -> Optional[datetime]:
+    """Normaliza ``created_at``: pyodbc entrega ``datetime``, otros orígenes texto ISO."""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
 
 
 class SurveyRepository(BaseRepository):
     """Repositorio para operaciones CRUD de Encuestas."""
     
     def create(self, survey: Survey) -> int:
-        """Crea una nueva encuesta y retorna su ID."""
-        cursor = self.db.execute(
-            """INSERT INTO surveys (evaluator_profile, sid, case_id, is_graduated, final_score, tier_id, tier_name)
-               VALUES (?, ?, ?, ?, ?, ?, ?)""",
-            (
-                survey.evaluator_profile,
-                survey.sid,
-                survey.case_id,
-                1 if survey.is_graduated else 0,
-                survey.final_score,
-                survey.tier_id,
-                survey.tier_name
-            )
-        )
-        survey_id = cursor.lastrowid
+        """Crea una nueva encuesta y retorna su ID.
         
-        # Insertar respuestas
-        for response in survey.responses:
-            self.create_response(survey_id, response)
-        
-        self.log_audit('Survey', survey_id, 'CREATE', 
-                      survey.evaluator_profile, 
-                      f"SID: {survey.sid}, Score: {survey.final_score}")
+        Encabezado, respuestas y auditoría se guardan en una sola transacción.
+        """
+        with self.db.transaction():
+            survey_id = self.db.insert(
+                """INSERT INTO surveys (evaluator_profile, sid, case_id, is_graduated, final_score, tier_id, tier_name)
+                   OUTPUT INSERTED.id
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                (
+                    survey.evaluator_profile,
+                    survey.sid,
+                    survey.case_id,
+                    1 if survey.is_graduated else 0,
+                    survey.final_score,
+                    survey.tier_id,
+                    survey.tier_name
+                )
+            )
+            
+            # Insertar respuestas en bloque
+            self.create_responses(survey_id, survey.responses)
+            
+            self.log_audit('Survey', survey_id, 'CREATE', 
+                          survey.evaluator_profile, 
+                          f"SID: {survey.sid}, Score: {survey.final_score}")
         return survey_id
     
+    def create_responses(self, survey_id: int, responses: List[SurveyResponse]) -> List[int]:
+        """Inserta todas las respuestas de una encuesta en un solo envío y retorna sus IDs."""
+        response_ids = self.db.insert_many(
+            'survey_responses',
+            ('survey_id', 'question_id', 'answer', 'comment', 'penalty_applied'),
+            [
+                (
+                    survey_id,
+                    response.question_id,
+                    response.answer,
+                    response.comment,
+                    response.penalty_applied
+                )
+                for response in responses
+            ]
+        )
+        for response, response_id in zip(responses, response_ids):
+            response.id = response_id
+            response.survey_id = survey_id
+        return response_ids
+    
     def create_response(self, survey_id: int, response: SurveyResponse) -> int:
         """Crea una respuesta de encuesta."""
-        cursor = self.db.execute(
+        return self.db.insert(
             """INSERT INTO survey_responses (survey_id, question_id, answer, comment, penalty_applied)
+               OUTPUT INSERTED.id
                VALUES (?, ?, ?, ?, ?)""",
             (
                 survey_id,
@@ -47,125 +100,293 @@ class SurveyRepository(BaseRepository):
                 response.penalty_applied
             )
         )
-        return cursor.lastrowid
     
     def find_by_id(self, survey_id: int) -> Optional[Survey]:
         """Busca una encuesta por ID."""
-        row = self.db.fetch_one(
-            """SELECT id, evaluator_profile, sid, case_id, is_graduated, final_score, tier_id, tier_name, created_at
+        surveys = list(self.db.fetch_iter(
+            f"""SELECT {SURVEY_COLUMNS}
                FROM surveys WHERE id = ?""",
-            (survey_id,)
-        )
-        if row:
-            # Cargar respuestas
-            responses = self.get_responses(survey_id)
-            return Survey(
-                id=row['id'],
-                evaluator_profile=row['evaluator_profile'],
-                sid=row['sid'],
-                case_id=row['case_id'],
-                is_graduated=bool(row['is_graduated']),
-                final_score=row['final_score'],
-                tier_id=row['tier_id'],
-                tier_name=row['tier_name'],
-                created_at=datetime.fromisoformat(row['created_at']) if row['created_at'] else None,
-                responses=responses
-            )
-        return None
+            (survey_id,),
+            row_factory=self._survey_loader
+        ))
+        if not surveys:
+            return None
+        surveys[0].responses = self.get_responses(survey_id)
+        return surveys[0]
     
     def get_responses(self, survey_id: int) -> List[SurveyResponse]:
         """Obtiene todas las respuestas de una encuesta."""
-        rows = self.db.fetch_all(
-            """SELECT id, question_id, answer, comment, penalty_applied
-               FROM survey_responses WHERE survey_id = ?""",
-            (survey_id,)
-        )
-        return [
-            SurveyResponse(
-                id=row['id'],
-                survey_id=survey_id,
-                question_id=row['question_id'],
-                answer=row['answer'],
-                comment=row['comment'],
-                penalty_applied=row['penalty_applied']
-            )
-            for row in rows
-        ]
+        return list(self.db.fetch_iter(
+            f"""SELECT {RESPONSE_COLUMNS}
+               FROM survey_responses WHERE survey_id = ?
+               ORDER BY id""",
+            (survey_id,),
+            row_factory=self._response_loader
+        ))
+    
+    def get_responses_for_surveys(self, survey_ids: Sequence[int]) -> Dict[int, List[SurveyResponse]]:
+        """Obtiene las respuestas de varias encuestas agrupadas por ID de encuesta.
+        
+        Consulta con ``survey_id IN (...)`` en bloques que respetan el límite de
+        parámetros de SQL Server, en lugar de una consulta por encuesta.
+        """
+        responses: Dict[int, List[SurveyResponse]] = {survey_id: [] for survey_id in survey_ids}
+        ids = list(responses)
+        for start in range(0, len(ids), RESPONSES_IN_CHUNK_SIZE):
+            chunk = ids[start:start + RESPONSES_IN_CHUNK_SIZE]
+            placeholders = ", ".join("?" for _ in chunk)
+            for response in self.db.fetch_iter(
+                f"""SELECT {RESPONSE_COLUMNS}
+                   FROM survey_responses WHERE survey_id IN ({placeholders})
+                   ORDER BY survey_id, id""",
+                tuple(chunk),
+                row_factory=self._response_loader
+            ):
+                responses[response.survey_id].append(response)
+        return responses
     
     def find_all(self) -> List[Survey]:
         """Obtiene todas las encuestas."""
-        rows = self.db.fetch_all(
-            """SELECT id, evaluator_profile, sid, case_id, is_graduated, final_score, tier_id, tier_name, created_at
-               FROM surveys ORDER BY created_at DESC"""
-        )
-        surveys = []
-        for row in rows:
-            responses = self.get_responses(row['id'])
-            surveys.append(Survey(
-                id=row['id'],
-                evaluator_profile=row['evaluator_profile'],
-                sid=row['sid'],
-                case_id=row['case_id'],
-                is_graduated=bool(row['is_graduated']),
-                final_score=row['final_score'],
-                tier_id=row['tier_id'],
-                tier_name=row['tier_name'],
-                created_at=datetime.fromisoformat(row['created_at']) if row['created_at'] else None,
-                responses=responses
-            ))
-        return surveys
+        return self._find_with_responses()
 
     def find_by_sid(self, sid: str) -> List[Survey]:
         """Obtiene todas las encuestas asociadas a un SID específico."""
-        rows = self.db.fetch_all(
-            """SELECT id, evaluator_profile, sid, case_id, is_graduated, final_score, tier_id, tier_name, created_at
-               FROM surveys
-               WHERE sid = ?
-               ORDER BY created_at DESC""",
-            (sid,)
-        )
-        surveys = []
-        for row in rows:
-            responses = self.get_responses(row['id'])
-            surveys.append(Survey(
-                id=row['id'],
-                evaluator_profile=row['evaluator_profile'],
-                sid=row['sid'],
-                case_id=row['case_id'],
-                is_graduated=bool(row['is_graduated']),
-                final_score=row['final_score'],
-                tier_id=row['tier_id'],
-                tier_name=row['tier_name'],
-                created_at=datetime.fromisoformat(row['created_at']) if row['created_at'] else None,
-                responses=responses
-            ))
+        return self._find_with_responses("s.sid = ?", (sid,))
+    
+    def find_page(self, filters: Optional[SurveyFilters] = None,
+                  after: Optional[Tuple[datetime, int]] = None,
+                  limit: int = DEFAULT_PAGE_SIZE) -> List[SurveySummary]:
+        """Obtiene una página del listado ordenado por (created_at, id) descendente.
+        
+        Paginación por keyset: ``after`` es el ``cursor`` de la última fila de la
+        página anterior, así cada página cuesta lo mismo sin importar la
+        profundidad. Solo trae encabezados; las respuestas se cargan aparte.
+        """
+        conditions, params = self._filter_conditions(filters)
+        if after is not None:
+            created_at, last_id = after
+            conditions.append("(s.created_at < ? OR (s.created_at = ? AND s.id < ?))")
+            params.extend([created_at, created_at, last_id])
+        where_sql = " WHERE " + " AND ".join(conditions) if conditions else ""
+        return list(self.db.fetch_iter(
+            f"""SELECT TOP (?) s.id, s.created_at, s.evaluator_profile, s.sid, s.case_id,
+                      c.name AS case_name, c.area_id, s.is_graduated, s.final_score,
+                      s.tier_id, s.tier_name
+               FROM surveys s
+               LEFT JOIN cases c ON c.id = s.case_id{where_sql}
+               ORDER BY s.created_at DESC, s.id DESC""",
+            (limit, *params),
+            batch_size=max(1, limit),
+            row_factory=self._summary_loader
+        ))
+    
+    @staticmethod
+    def _filter_conditions(filters: Optional[SurveyFilters]) -> Tuple[List[str], List[Any]]:
+        """Traduce los filtros del listado a condiciones SQL (alias ``s`` y ``c``)."""
+        conditions: List[str] = []
+        params: List[Any] = []
+        if filters is None:
+            return conditions, params
+        if filters.date_from is not None:
+            conditions.append("s.created_at >= ?")
+            params.append(filters.date_from)
+        if filters.date_to is not None:
+            conditions.append("s.created_at < ?")
+            params.append(filters.date_to)
+        if filters.case_id is not None:
+            conditions.append("s.case_id = ?")
+            params.append(filters.case_id)
+        if filters.area_id is not None:
+            conditions.append("c.area_id = ?")
+            params.append(filters.area_id)
+        if filters.evaluator_profile:
+            conditions.append("s.evaluator_profile = ?")
+            params.append(filters.evaluator_profile)
+        if filters.tier_id is not None:
+            conditions.append("s.tier_id = ?")
+            params.append(filters.tier_id)
+        if filters.min_score is not None:
+            conditions.append("s.final_score >= ?")
+            params.append(filters.min_score)
+        if filters.max_score is not None:
+            conditions.append("s.final_score < ?")
+            params.append(filters.max_score)
+        return conditions, params
+    
+    def _find_with_responses(self, where: Optional[str] = None, params: Sequence = ()) -> List[Survey]:
+        """Carga encabezados y respuestas con dos consultas, sin importar cuántas encuestas haya.
+        
+        Las respuestas se leen con un JOIN que aplica el mismo filtro que los
+        encabezados y se agrupan en memoria.
+        """
+        where_sql = f" WHERE {where}" if where else ""
+        surveys = list(self.db.fetch_iter(
+            f"""SELECT {SURVEY_COLUMNS_ALIASED}
+               FROM surveys s{where_sql}
+               ORDER BY s.created_at DESC, s.id DESC""",
+            params,
+            row_factory=self._survey_loader
+        ))
+        if not surveys:
+            return []
+        responses: Dict[int, List[SurveyResponse]] = {survey.id: survey.responses for survey in surveys}
+        for response in self.db.fetch_iter(
+            f"""SELECT {RESPONSE_COLUMNS_ALIASED}
+               FROM survey_responses r
+               JOIN surveys s ON s.id = r.survey_id{where_sql}
+               ORDER BY r.survey_id, r.id""",
+            params,
+            row_factory=self._response_loader
+        ):
+            bucket = responses.get(response.survey_id)
+            if bucket is not None:
+                bucket.append(response)
         return surveys
     
+    @staticmethod
+    def _survey_loader(index: Dict[str, int]) -> Callable[[Any], Survey]:
+        """Conversor de filas de ``surveys`` (sin respuestas) para ``fetch_iter``."""
+        i_id, i_profile, i_sid, i_case, i_graduated, i_score, i_tier_id, i_tier_name, i_created = (
+            index[col.strip()] for col in SURVEY_COLUMNS.split(",")
+        )
+        return lambda row: Survey(
+            id=row[i_id],
+            evaluator_profile=row[i_profile],
+            sid=row[i_sid],
+            case_id=row[i_case],
+            is_graduated=bool(row[i_graduated]),
+            final_score=row[i_score],
+            tier_id=row[i_tier_id],
+            tier_name=row[i_tier_name],
+            created_at=_parse_datetime(row[i_created]),
+            responses=[]
+        )
+    
+    @staticmethod
+    def _response_loader(index: Dict[str, int]) -> Callable[[Any], SurveyResponse]:
+        """Conversor de filas de ``survey_responses`` para ``fetch_iter``."""
+        i_id, i_survey, i_question, i_answer, i_comment, i_penalty = (
+            index[col.strip()] for col in RESPONSE_COLUMNS.split(",")
+        )
+        return lambda row: SurveyResponse(
+            id=row[i_id],
+            survey_id=row[i_survey],
+            question_id=row[i_question],
+            answer=row[i_answer],
+            comment=row[i_comment],
+            penalty_applied=row[i_penalty]
+        )
+    
+    @staticmethod
+    def _summary_loader(index: Dict[str, int]) -> Callable[[Any], SurveySummary]:
+        """Conversor de filas del listado paginado para ``fetch_iter``."""
+        columns = ('id', 'created_at', 'evaluator_profile', 'sid', 'case_id', 'case_name',
+                   'area_id', 'is_graduated', 'final_score', 'tier_id', 'tier_name')
+        (i_id, i_created, i_profile, i_sid, i_case, i_case_name, i_area, i_graduated,
+         i_score, i_tier_id, i_tier_name) = (index[col] for col in columns)
+        return lambda row: SurveySummary(
+            id=row[i_id],
+            created_at=_parse_datetime(row[i_created]),
+            evaluator_profile=row[i_profile],
+            sid=row[i_sid],
+            case_id=row[i_case],
+            case_name=row[i_case_name],
+            area_id=row[i_area],
+            is_graduated=bool(row[i_graduated]),
+            final_score=row[i_score],
+            tier_id=row[i_tier_id],
+            tier_name=row[i_tier_name]
+        )
+    
+    def iter_scoring_headers(self, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[Tuple]:
+        """Recorre (id, is_graduated, final_score, tier_id, tier_name, area_id) de cada encuesta."""
+        return self.db.fetch_iter(
+            """SELECT s.id, s.is_graduated, s.final_score, s.tier_id, s.tier_name, c.area_id
+               FROM surveys s
+               LEFT JOIN cases c ON c.id = s.case_id
+               ORDER BY s.id""",
+            batch_size=batch_size
+        )
+    
+    def iter_scoring_responses(self, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[Tuple]:
+        """Recorre (id, survey_id, question_id, answer, penalty_applied) de cada respuesta."""
+        return self.db.fetch_iter(
+            "SELECT id, survey_id, question_id, answer, penalty_applied FROM survey_responses",
+            batch_size=batch_size
+        )
+    
+    def apply_rescore(self, survey_updates: Sequence[Tuple[float, Optional[int], Optional[str], int]],
+                      response_updates: Sequence[Tuple[float, int]],
+                      batch_size: int = RESCORE_WRITE_BATCH_SIZE) -> None:
+        """Escribe un recálculo en una sola transacción.
+        
+        ``survey_updates`` son tuplas (final_score, tier_id, tier_name, id) y
+        ``response_updates`` tuplas (penalty_applied, id).
+        """
+        with self.db.transaction():
+            for start in range(0, len(survey_updates), batch_size):
+                self.db.execute_many(
+                    "UPDATE surveys SET final_score = ?, tier_id = ?, tier_name = ? WHERE id = ?",
+                    survey_updates[start:start + batch_size]
+                )
+            for start in range(0, len(response_updates), batch_size):
+                self.db.execute_many(
+                    "UPDATE survey_responses SET penalty_applied = ? WHERE id = ?",
+                    response_updates[start:start + batch_size]
+                )
+            self.log_audit(
+                'Survey', None, 'UPDATE',
+                details=f"Recálculo: {len(survey_updates)} encuestas y {len(response_updates)} respuestas"
+            )
+    
+    def count_export_rows(self) -> int:
+        """Cuenta las filas (respuestas) que produce la exportación."""
+        row = self.db.fetch_one("SELECT COUNT(*) AS total FROM survey_responses")
+        return int(row['total']) if row else 0
+    
+    def iter_export_rows(self, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[Tuple]:
+        """Recorre las filas de exportación (una por respuesta) en el orden de ``EXPORT_COLUMNS``.
+        
+        Usa una sola consulta con JOIN leída en lotes, por lo que la memoria no
+        depende del tamaño del historial.
+        """
+        for _area_name, row in self.iter_export_rows_with_area(batch_size):
+            yield row
+    
+    def iter_export_rows_with_area(self, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[Tuple[Optional[str], Tuple]]:
+        """Igual que ``iter_export_rows`` pero entrega pares (nombre de área, fila)."""
+        rows = self.db.fetch_iter(
+            """SELECT s.id, s.created_at, s.evaluator_profile, s.sid, c.name, s.is_graduated,
+                      r.question_id, r.answer, r.comment, r.penalty_applied, s.final_score, s.tier_name,
+                      a.name
+               FROM surveys s
+               JOIN survey_responses r ON r.survey_id = s.id
+               LEFT JOIN cases c ON c.id = s.case_id
+               LEFT JOIN areas a ON a.id = c.area_id
+               ORDER BY s.created_at DESC, s.id DESC, r.id""",
+            batch_size=batch_size
+        )
+        for (survey_id, created_at, evaluator_profile, sid, case_name, is_graduated,
+             question_id, answer, comment, penalty_applied, final_score, tier_name, area_name) in rows:
+            created_at = _parse_datetime(created_at)
+            yield area_name, (
+                survey_id,
+                created_at.isoformat() if created_at else '',
+                evaluator_profile,
+                sid,
+                case_name or 'N/A',
+                'Sí' if is_graduated else 'No',
+                question_id,
+                answer,
+                comment or '',
+                penalty_applied,
+                final_score,
+                tier_name or ''
+            )
+    
     def export_to_csv_data(self) -> List[dict]:
-        """Exporta todas las encuestas a formato CSV."""
-        surveys = self.find_all()
-        # Obtener nombres de casos
-        from src.repositories.case_repository import CaseRepository
-        case_repo = CaseRepository()
-        cases = {c.id: c.name for c in case_repo.find_all(active_only=False)}
+        """Exporta todas las encuestas a formato CSV (lista completa en memoria).
         
-        csv_data = []
-        for survey in surveys:
-            case_name = cases.get(survey.case_id, 'N/A')
-            for response in survey.responses:
-                csv_data.append({
-                    'survey_id': survey.id,
-                    'created_at': survey.created_at.isoformat() if survey.created_at else '',
-                    'evaluator_profile': survey.evaluator_profile,
-                    'sid': survey.sid,
-                    'case_name': case_name,
-                    'is_graduated': 'Sí' if survey.is_graduated else 'No',
-                    'question_id': response.question_id,
-                    'answer': response.answer,
-                    'comment': response.comment or '',
-                    'penalty_applied': response.penalty_applied,
-                    'final_score': survey.final_score,
-                    'tier_name': survey.tier_name or ''
-                })
-        return csv_data
-
+        Para volúmenes grandes preferir ``iter_export_rows``.
+        """
+        return [dict(zip(EXPORT_COLUMNS, row)) for row in self.iter_export_rows()]
@@ -1,5 +1,5 @@
 """Repositorio para gestión de Tiers."""
-from typing import List, Optional
+from typing import Iterable, List, Optional, Tuple
 from src.repositories.base_repository import BaseRepository
 from src.models.tier import Tier
 
@@ -9,54 +9,94 @@ class TierRepository(BaseRepository):
     
     def create(self, tier: Tier) -> int:
         """Crea un nuevo tier y retorna su ID."""
-        cursor = self.db.execute(
-            """
-            INSERT INTO tiers (area_id, name, min_score, max_score, description, color, active)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                tier.area_id,
-                tier.name,
-                tier.min_score,
-                tier.max_score,
-                tier.description,
-                tier.color,
-                1 if tier.active else 0
+        with self.db.transaction():
+            tier_id = self.db.insert(
+                """
+                INSERT INTO tiers (area_id, name, min_score, max_score, description, color, active)
+                OUTPUT INSERTED.id
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    tier.area_id,
+                    tier.name,
+                    tier.min_score,
+                    tier.max_score,
+                    tier.description,
+                    tier.color,
+                    1 if tier.active else 0
+                )
             )
-        )
-        tier_id = cursor.lastrowid
-        self.log_audit('Tier', tier_id, 'CREATE', details=f"Tier {tier.name} ({tier.min_score}-{tier.max_score})")
+            self.log_audit('Tier', tier_id, 'CREATE', details=f"Tier {tier.name} ({tier.min_score}-{tier.max_score})")
         return tier_id
     
+    def create_missing_defaults(self, defaults: Iterable[Tuple[str, float, float, str, str]],
+                                area_id: Optional[int] = None) -> List[Tuple[int, int, str]]:
+        """Crea los tiers por defecto que falten (por nombre) en todas las áreas o solo en ``area_id``.
+        
+        ``defaults`` son tuplas (nombre, mínimo, máximo, descripción, color). Un
+        solo INSERT ... SELECT cruza las áreas con los valores por defecto y
+        descarta los que ya existen, así el costo no crece con la cantidad de
+        áreas. Retorna (id, area_id, nombre) de cada tier creado.
+        """
+        defaults = list(defaults)
+        if not defaults:
+            return []
+        source = " UNION ALL ".join(
+            "SELECT ? AS name, ? AS min_score, ? AS max_score, ? AS description, ? AS color"
+            for _ in defaults
+        )
+        params = [value for default in defaults for value in default]
+        area_filter = ""
+        if area_id is not None:
+            area_filter = "a.id = ? AND "
+            params.append(area_id)
+        with self.db.transaction():
+            rows = self.db.fetch_all(
+                f"""INSERT INTO tiers (area_id, name, min_score, max_score, description, color, active)
+                    OUTPUT INSERTED.id, INSERTED.area_id, INSERTED.name
+                    SELECT a.id, d.name, d.min_score, d.max_score, d.description, d.color, 1
+                    FROM areas a CROSS JOIN ({source}) d
+                    WHERE {area_filter}NOT EXISTS (
+                        SELECT 1 FROM tiers t WHERE t.area_id = a.id AND t.name = d.name
+                    )""",
+                params
+            )
+            created = [(row['id'], row['area_id'], row['name']) for row in rows]
+            for tier_id, _area_id, name in created:
+                self.log_audit('Tier', tier_id, 'CREATE', details=f"Tier {name} (por defecto)")
+        return created
+    
     def update(self, tier: Tier) -> bool:
         """Actualiza un tier existente."""
         if tier.id is None:
             raise ValueError("El tier debe tener ID para actualizarse")
         
-        self.db.execute(
-            """
-            UPDATE tiers
-            SET area_id = ?, name = ?, min_score = ?, max_score = ?, description = ?, color = ?, active = ?
-            WHERE id = ?
-            """,
-            (
-                tier.area_id,
-                tier.name,
-                tier.min_score,
-                tier.max_score,
-                tier.description,
-                tier.color,
-                1 if tier.active else 0,
-                tier.id
+        with self.db.transaction():
+            self.db.execute(
+                """
+                UPDATE tiers
+                SET area_id = ?, name = ?, min_score = ?, max_score = ?, description = ?, color = ?, active = ?
+                WHERE id = ?
+                """,
+                (
+                    tier.area_id,
+                    tier.name,
+                    tier.min_score,
+                    tier.max_score,
+                    tier.description,
+                    tier.color,
+                    1 if tier.active else 0,
+                    tier.id
+                )
             )
-        )
-        self.log_audit('Tier', tier.id, 'UPDATE', details=f"Tier {tier.name} ({tier.min_score}-{tier.max_score})")
+            self.log_audit('Tier', tier.id, 'UPDATE', details=f"Tier {tier.name} ({tier.min_score}-{tier.max_score})")
         return True
     
     def delete(self, tier_id: int) -> bool:
         """Elimina (soft delete) un tier."""
-        self.db.execute("UPDATE tiers SET active = 0 WHERE id = ?", (tier_id,))
-        self.log_audit('Tier', tier_id, 'DELETE')
+        with self.db.transaction():
+            self.db.execute("UPDATE tiers SET active = 0 WHERE id = ?", (tier_id,))
+            self.log_audit('Tier', tier_id, 'DELETE')
         return True
     
     def find_by_id(self, tier_id: int) -> Optional[Tier]:
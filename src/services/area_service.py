@@ -2,6 +2,7 @@
 from typing import List, Optional
 from src.models.area import Area
 from src.repositories.area_repository import AreaRepository
+from src.services.catalog_cache import catalog_cache
 
 
 class AreaService:
@@ -10,26 +11,44 @@ class AreaService:
     def __init__(self):
         """Inicializa el servicio."""
         self.area_repo = AreaRepository()
+        self.catalog = catalog_cache
     
     def create_area(self, name: str, description: Optional[str] = None, active: bool = True) -> int:
         """Crea una nueva área."""
         area = Area(id=None, name=name, description=description, active=active)
-        return self.area_repo.create(area)
+        area_id = self.area_repo.create(area)
+        self.catalog.bump()
+        return area_id
     
     def update_area(self, area_id: int, name: str, description: Optional[str] = None, active: bool = True) -> bool:
         """Actualiza un área existente."""
         area = Area(id=area_id, name=name, description=description, active=active)
-        return self.area_repo.update(area)
+        updated = self.area_repo.update(area)
+        self.catalog.bump()
+        return updated
     
     def delete_area(self, area_id: int) -> bool:
         """Elimina un área."""
-        return self.area_repo.delete(area_id)
+        deleted = self.area_repo.delete(area_id)
+        self.catalog.bump()
+        return deleted
     
     def get_area(self, area_id: int) -> Optional[Area]:
         """Obtiene un área por ID."""
         return self.area_repo.find_by_id(area_id)
     
+    def get_area_by_name(self, name: str) -> Optional[Area]:
+        """Obtiene un área por nombre (único) desde un índice en caché."""
+        return self.catalog.get_item(
+            ('areas_by_name',),
+            lambda: {a.name: a for a in self.area_repo.find_all(active_only=False)},
+            name
+        )
+    
     def get_all_areas(self, active_only: bool = True) -> List[Area]:
         """Obtiene todas las áreas."""
-        return self.area_repo.find_all(active_only=active_only)
+        return self.catalog.get(
+            ('areas', active_only),
+            lambda: self.area_repo.find_all(active_only=active_only)
+        )
 
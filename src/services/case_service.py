@@ -2,6 +2,7 @@
 from typing import List, Optional
 from src.models.case import Case
 from src.repositories.case_repository import CaseRepository
+from src.services.catalog_cache import catalog_cache
 
 
 class CaseService:
@@ -10,28 +11,46 @@ class CaseService:
     def __init__(self):
         """Inicializa el servicio."""
         self.case_repo = CaseRepository()
+        self.catalog = catalog_cache
     
     def create_case(self, area_id: int, name: str, description: Optional[str] = None, active: bool = True) -> int:
         """Crea un nuevo caso."""
         case = Case(id=None, area_id=area_id, name=name, description=description, active=active)
-        return self.case_repo.create(case)
+        case_id = self.case_repo.create(case)
+        self.catalog.bump()
+        return case_id
     
     def find_or_create_case(self, area_id: int, name: str) -> int:
-        """Busca un caso por nombre y área, si no existe lo crea."""
-        case = self.case_repo.find_by_name(name, area_id=area_id)
-        if case:
-            return case.id
-        else:
-            return self.create_case(area_id=area_id, name=name, active=True)
+        """Busca un caso por nombre y área, si no existe lo crea.
+        
+        Los casos conocidos se resuelven desde un índice ``(área, nombre) → ID`` en
+        caché; los nuevos se crean de forma atómica con un solo MERGE.
+        """
+        case_id = self.catalog.get_item(
+            ('case_ids',),
+            lambda: {(c.area_id, c.name): c.id for c in self.case_repo.find_all()},
+            (area_id, name)
+        )
+        if case_id is not None:
+            return case_id
+        case_id, created = self.case_repo.find_or_create(area_id, name)
+        if created:
+            # Invalidar una vez confirmado, por si el llamador tiene una transacción abierta
+            self.case_repo.db.on_commit(self.catalog.bump)
+        return case_id
     
     def update_case(self, case_id: int, area_id: int, name: str, description: Optional[str] = None, active: bool = True) -> bool:
         """Actualiza un caso existente."""
         case = Case(id=case_id, area_id=area_id, name=name, description=description, active=active)
-        return self.case_repo.update(case)
+        updated = self.case_repo.update(case)
+        self.catalog.bump()
+        return updated
     
     def delete_case(self, case_id: int) -> bool:
         """Elimina un caso."""
-        return self.case_repo.delete(case_id)
+        deleted = self.case_repo.delete(case_id)
+        self.catalog.bump()
+        return deleted
     
     def get_case(self, case_id: int) -> Optional[Case]:
         """Obtiene un caso por ID."""
@@ -39,5 +58,8 @@ class CaseService:
     
     def get_all_cases(self, active_only: bool = True, area_id: Optional[int] = None) -> List[Case]:
         """Obtiene todos los casos, opcionalmente filtrados por área."""
-        return self.case_repo.find_all(active_only=active_only, area_id=area_id)
+        return self.catalog.get(
+            ('cases', active_only, area_id),
+            lambda: self.case_repo.find_all(active_only=active_only, area_id=area_id)
+        )
 
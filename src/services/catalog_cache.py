@@ -0,0 +1,106 @@
+"""Caché versionada de catálogos (preguntas, áreas, casos, perfiles, defaults)."""
+import copy
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from src.core.config import CATALOG_STAMP_TTL
+
+
+class CatalogCache:
+    """Caché en proceso de lecturas de catálogo invalidada por versión.
+
+    Cada entrada guarda la versión con la que se cargó; los servicios llaman a
+    ``bump`` después de escribir, lo que invalida todas las entradas. Para
+    instalaciones con varios usuarios se puede configurar ``stamp_loader``: cada
+    ``stamp_ttl`` segundos se consulta una marca de cambios en la base de datos
+    y, si difiere de la anterior, también se incrementa la versión.
+    """
+
+    def __init__(self, stamp_loader: Optional[Callable[[], Any]] = None, stamp_ttl: float = 0.0):
+        self._lock = threading.Lock()
+        self._entries: Dict[Hashable, Tuple[int, Any]] = {}
+        self._version = 0
+        self._stamp_loader = stamp_loader
+        self._stamp_ttl = stamp_ttl
+        self._stamp: Any = None
+        self._stamp_checked_at = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def version(self) -> int:
+        """Versión actual del catálogo."""
+        return self._version
+
+    def bump(self) -> int:
+        """Invalida todas las entradas incrementando la versión."""
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+            return self._version
+
+    def get(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Retorna una copia del valor en caché para ``key``, cargándolo con ``loader`` si falta."""
+        return copy.copy(self._load(key, loader))
+
+    def get_item(self, key: Hashable, loader: Callable[[], Dict[Hashable, Any]], item: Hashable) -> Any:
+        """Busca ``item`` en un índice (diccionario) en caché sin copiar el índice completo.
+
+        Retorna una copia del elemento o ``None`` si no existe.
+        """
+        value = self._load(key, loader).get(item)
+        return copy.copy(value) if value is not None else None
+
+    def _load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Retorna el valor en caché (sin copiar), cargándolo si falta o está vencido."""
+        self._check_stamp()
+        with self._lock:
+            entry = self._entries.get(key)
+            version = self._version
+            if entry is not None and entry[0] == version:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        value = loader()
+        with self._lock:
+            # Si hubo una escritura mientras se cargaba, no guardar datos posiblemente viejos
+            if self._version == version:
+                self._entries[key] = (version, value)
+        return value
+
+    def _check_stamp(self) -> None:
+        """Compara la marca de cambios de la base de datos cuando vence el TTL."""
+        if self._stamp_loader is None or self._stamp_ttl <= 0:
+            return
+        now = time.monotonic()
+        if now - self._stamp_checked_at < self._stamp_ttl:
+            return
+        self._stamp_checked_at = now
+        try:
+            stamp = self._stamp_loader()
+        except Exception:
+            # Sin marca no se puede validar: descartar por seguridad
+            self.bump()
+            return
+        if stamp != self._stamp:
+            if self._stamp is not None:
+                self.bump()
+            self._stamp = stamp
+
+    def configure_stamp(self, stamp_loader: Optional[Callable[[], Any]], stamp_ttl: float) -> None:
+        """Configura (o desactiva con ``stamp_ttl=0``) la validación contra la base de datos."""
+        with self._lock:
+            self._stamp_loader = stamp_loader
+            self._stamp_ttl = stamp_ttl
+            self._stamp = None
+            self._stamp_checked_at = 0.0
+
+
+def _load_catalog_stamp():
+    """Obtiene la marca de cambios de catálogo desde la base de datos."""
+    from src.repositories.audit_repository import AuditRepository
+    return AuditRepository().get_catalog_stamp()
+
+
+# Caché compartida por todos los servicios de la aplicación
+catalog_cache = CatalogCache(stamp_loader=_load_catalog_stamp, stamp_ttl=CATALOG_STAMP_TTL)
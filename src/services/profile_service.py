@@ -2,6 +2,7 @@
 from typing import List, Optional
 from src.models.profile import Profile
 from src.repositories.profile_repository import ProfileRepository
+from src.services.catalog_cache import catalog_cache
 
 
 class ProfileService:
@@ -10,26 +11,44 @@ class ProfileService:
     def __init__(self):
         """Inicializa el servicio."""
         self.profile_repo = ProfileRepository()
+        self.catalog = catalog_cache
     
     def create_profile(self, name: str, active: bool = True) -> int:
         """Crea un nuevo perfil."""
         profile = Profile(id=None, name=name, active=active)
-        return self.profile_repo.create(profile)
+        profile_id = self.profile_repo.create(profile)
+        self.catalog.bump()
+        return profile_id
     
     def update_profile(self, profile_id: int, name: str, active: bool) -> bool:
         """Actualiza un perfil existente."""
         profile = Profile(id=profile_id, name=name, active=active)
-        return self.profile_repo.update(profile)
+        updated = self.profile_repo.update(profile)
+        self.catalog.bump()
+        return updated
     
     def delete_profile(self, profile_id: int) -> bool:
         """Elimina un perfil."""
-        return self.profile_repo.delete(profile_id)
+        deleted = self.profile_repo.delete(profile_id)
+        self.catalog.bump()
+        return deleted
     
     def get_profile(self, profile_id: int) -> Optional[Profile]:
         """Obtiene un perfil por ID."""
         return self.profile_repo.find_by_id(profile_id)
     
+    def get_profile_by_name(self, name: str) -> Optional[Profile]:
+        """Obtiene un perfil por nombre (único) desde un índice en caché."""
+        return self.catalog.get_item(
+            ('profiles_by_name',),
+            lambda: {p.name: p for p in self.profile_repo.find_all(active_only=False)},
+            name
+        )
+    
     def get_all_profiles(self, active_only: bool = True) -> List[Profile]:
         """Obtiene todos los perfiles."""
-        return self.profile_repo.find_all(active_only=active_only)
+        return self.catalog.get(
+            ('profiles', active_only),
+            lambda: self.profile_repo.find_all(active_only=active_only)
+        )
 
@@ -1,7 +1,9 @@
 """Servicio de lógica de negocio para Preguntas."""
-from typing import List, Optional
+import copy
+from typing import Dict, List, Optional
 from src.models.question import Question
 from src.repositories.question_repository import QuestionRepository
+from src.services.catalog_cache import catalog_cache
 
 
 class QuestionService:
@@ -10,6 +12,7 @@ class QuestionService:
     def __init__(self):
         """Inicializa el servicio."""
         self.question_repo = QuestionRepository()
+        self.catalog = catalog_cache
     
     def create_question(self, area_id: int, text: str, penalty_graduated: float = 0.0, 
                        penalty_not_graduated: float = 0.0, active: bool = True) -> int:
@@ -22,7 +25,9 @@ class QuestionService:
             penalty_graduated=penalty_graduated,
             penalty_not_graduated=penalty_not_graduated
         )
-        return self.question_repo.create(question)
+        question_id = self.question_repo.create(question)
+        self.catalog.bump()
+        return question_id
     
     def update_question(self, question_id: int, area_id: int, text: str, penalty_graduated: float,
                       penalty_not_graduated: float, active: bool) -> bool:
@@ -35,11 +40,15 @@ class QuestionService:
             penalty_graduated=penalty_graduated,
             penalty_not_graduated=penalty_not_graduated
         )
-        return self.question_repo.update(question)
+        updated = self.question_repo.update(question)
+        self.catalog.bump()
+        return updated
     
     def delete_question(self, question_id: int) -> bool:
         """Elimina una pregunta."""
-        return self.question_repo.delete(question_id)
+        deleted = self.question_repo.delete(question_id)
+        self.catalog.bump()
+        return deleted
     
     def get_question(self, question_id: int) -> Optional[Question]:
         """Obtiene una pregunta por ID."""
@@ -47,15 +56,71 @@ class QuestionService:
     
     def get_all_questions(self, active_only: bool = False, area_id: Optional[int] = None) -> List[Question]:
         """Obtiene todas las preguntas, opcionalmente filtradas por área."""
-        return self.question_repo.find_all(active_only=active_only, area_id=area_id)
+        return self.catalog.get(
+            ('questions', active_only, area_id),
+            lambda: self.question_repo.find_all(active_only=active_only, area_id=area_id)
+        )
+    
+    def has_questions(self) -> bool:
+        """Indica si hay preguntas cargadas (consulta EXISTS, sin traer el catálogo)."""
+        return self.question_repo.has_any()
+    
+    def get_questions_map(self, active_only: bool = False) -> Dict[int, Question]:
+        """Obtiene las preguntas indexadas por ID."""
+        return self.catalog.get(
+            ('questions_map', active_only),
+            lambda: {q.id: q for q in self.get_all_questions(active_only=active_only)}
+        )
     
     def set_default_answer(self, profile_id: int, question_id: int, default_answer: str) -> bool:
         """Establece la respuesta por defecto para un perfil y pregunta."""
-        if default_answer not in ['YES', 'NO', 'NA']:
+        self._validate_default_answers([default_answer])
+        result = self.question_repo.set_default_answer(profile_id, question_id, default_answer)
+        self.catalog.bump()
+        return result
+    
+    def set_defaults(self, profile_id: int, answers: Dict[int, str]) -> int:
+        """Establece varias respuestas por defecto de un perfil en una sola operación."""
+        return self.set_defaults_for_profiles({profile_id: answers})
+    
+    def set_defaults_for_profiles(self, matrix: Dict[int, Dict[int, str]]) -> int:
+        """Establece la matriz perfil × pregunta de respuestas por defecto en una sola operación."""
+        self._validate_default_answers(
+            answer for answers in matrix.values() for answer in answers.values()
+        )
+        count = self.question_repo.set_defaults_for_profiles(matrix)
+        if count:
+            self.catalog.bump()
+        return count
+    
+    def delete_defaults(self, profile_id: int, question_ids: Optional[List[int]] = None) -> int:
+        """Elimina respuestas por defecto de un perfil (todas si ``question_ids`` es None)."""
+        deleted = self.question_repo.delete_defaults(profile_id, question_ids)
+        self.catalog.bump()
+        return deleted
+    
+    @staticmethod
+    def _validate_default_answers(answers) -> None:
+        if any(answer not in ('YES', 'NO', 'NA') for answer in answers):
             raise ValueError("La respuesta por defecto debe ser 'YES', 'NO' o 'NA'")
-        return self.question_repo.set_default_answer(profile_id, question_id, default_answer)
     
     def get_defaults_for_profile(self, profile_id: int) -> dict:
         """Obtiene todas las respuestas por defecto para un perfil."""
-        return self.question_repo.get_defaults_for_profile(profile_id)
-
+        return self.catalog.get(
+            ('defaults', profile_id),
+            lambda: self.question_repo.get_defaults_for_profile(profile_id)
+        )
+    
+    def get_defaults_for_question(self, question_id: int) -> Dict[int, str]:
+        """Obtiene las respuestas por defecto de una pregunta en todos los perfiles."""
+        return self.catalog.get(
+            ('question_defaults', question_id),
+            lambda: self.question_repo.get_defaults_for_question(question_id)
+        )
+    
+    def get_defaults_matrix(self, area_id: int) -> Dict[int, Dict[int, str]]:
+        """Obtiene la matriz perfil × pregunta de respuestas por defecto de un área."""
+        return copy.deepcopy(self.catalog.get(
+            ('defaults_matrix', area_id),
+            lambda: self.question_repo.get_defaults_matrix(area_id)
+        ))
@@ -0,0 +1,283 @@
+"""Recálculo masivo de puntajes y tiers de encuestas históricas.
+
+Cuando cambian las penalizaciones de ``questions`` o los rangos de ``tiers``,
+``final_score``, ``penalty_applied``, ``tier_id`` y ``tier_name`` guardados
+quedan desactualizados. Este servicio los recalcula de forma masiva:
+
+    python -m src.services.rescore_service            # simulación con reporte
+    python -m src.services.rescore_service --apply    # escribe los cambios
+
+Con NumPy instalado el cálculo es vectorizado; sin NumPy se usa un recorrido
+en Python puro con el mismo resultado.
+"""
+import argparse
+import time
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence
+from src.models.question import Question
+from src.models.survey import RescoreReport, ScoreChange
+from src.models.tier import Tier
+from src.repositories.question_repository import QuestionRepository
+from src.repositories.survey_repository import SurveyRepository
+from src.repositories.tier_repository import TierRepository
+from src.services.score_engine import BASE_SCORE, SCORE_SCALE
+from src.services.tier_index import TierIndex
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional
+    np = None
+
+ANSWER_CODES = {'YES': 0, 'NO': 1, 'NA': 2}
+_NO = ANSWER_CODES['NO']
+_NO_ID = -1
+_BASE_CENTS = int(BASE_SCORE * SCORE_SCALE)
+
+
+def _to_cents(value) -> int:
+    """Convierte un puntaje/penalización (float o Decimal) a centésimas enteras."""
+    return int(round((value or 0) * SCORE_SCALE))
+
+
+class ScoringData:
+    """Encuestas y respuestas en columnas compactas (``array``) listas para recalcular.
+
+    Un millón de respuestas ocupa unos 33 MB en lugar de los cientos que
+    requerirían objetos ``SurveyResponse``.
+    """
+
+    def __init__(self):
+        self.survey_ids = array('q')
+        self.graduated = array('b')
+        self.score_cents = array('q')
+        self.tier_ids = array('q')
+        self.area_ids = array('q')
+        self.tier_names: List[Optional[str]] = []
+        self.response_ids = array('q')
+        self.response_surveys = array('q')
+        self.response_questions = array('q')
+        self.answers = array('b')
+        self.penalty_cents = array('q')
+
+    def add_survey(self, survey_id: int, is_graduated: bool, final_score, tier_id: Optional[int],
+                   tier_name: Optional[str], area_id: Optional[int]) -> None:
+        """Agrega el encabezado de una encuesta."""
+        self.survey_ids.append(survey_id)
+        self.graduated.append(1 if is_graduated else 0)
+        self.score_cents.append(_to_cents(final_score))
+        self.tier_ids.append(_NO_ID if tier_id is None else tier_id)
+        self.area_ids.append(_NO_ID if area_id is None else area_id)
+        self.tier_names.append(tier_name)
+
+    def add_response(self, response_id: int, survey_id: int, question_id: int, answer: str,
+                     penalty_applied) -> None:
+        """Agrega una respuesta."""
+        self.response_ids.append(response_id)
+        self.response_surveys.append(survey_id)
+        self.response_questions.append(question_id)
+        self.answers.append(ANSWER_CODES.get(answer, ANSWER_CODES['NA']))
+        self.penalty_cents.append(_to_cents(penalty_applied))
+
+    @classmethod
+    def from_rows(cls, headers: Iterable[Sequence], responses: Iterable[Sequence]) -> 'ScoringData':
+        """Construye las columnas desde filas (ver ``SurveyRepository.iter_scoring_*``)."""
+        data = cls()
+        for row in headers:
+            data.add_survey(*row)
+        for row in responses:
+            data.add_response(*row)
+        return data
+
+
+def _compute_python(data: ScoringData, questions: Sequence[Question], tiers: Sequence[Tier]):
+    """Recalcula recorriendo las respuestas una por una."""
+    positions = {survey_id: pos for pos, survey_id in enumerate(data.survey_ids)}
+    penalties = (
+        {q.id: _to_cents(q.penalty_not_graduated) for q in questions},
+        {q.id: _to_cents(q.penalty_graduated) for q in questions},
+    )
+    deducted = [0] * len(data.survey_ids)
+    response_updates = []
+    for response_id, survey_id, question_id, answer, old_penalty in zip(
+            data.response_ids, data.response_surveys, data.response_questions,
+            data.answers, data.penalty_cents):
+        pos = positions.get(survey_id)
+        # Respuestas a preguntas que ya no existen quedan como están
+        if pos is None or question_id not in penalties[0]:
+            continue
+        penalty = 0
+        if answer == _NO:
+            penalty = penalties[data.graduated[pos]][question_id]
+            deducted[pos] += penalty
+        if penalty != old_penalty:
+            response_updates.append((penalty / SCORE_SCALE, response_id))
+
+    scores = [max(0, _BASE_CENTS - d) for d in deducted]
+    index = TierIndex(lambda: tiers)
+    tier_ids = []
+    for area_id, score in zip(data.area_ids, scores):
+        tier = index.lookup(area_id, score / SCORE_SCALE) if area_id != _NO_ID else None
+        tier_ids.append(tier.id if tier else _NO_ID)
+    return scores, tier_ids, response_updates
+
+
+def _compute_numpy(data: ScoringData, questions: Sequence[Question], tiers: Sequence[Tier]):
+    """Recalcula con NumPy: una suma dispersa por regla de penalización y ``searchsorted`` para tiers.
+
+    El descuento de cada encuesta es el producto de la matriz dispersa
+    encuestas × preguntas (1 donde se respondió 'NO') por el vector de
+    penalizaciones; ``bincount`` con pesos lo calcula sin materializar la matriz.
+    """
+    n = len(data.survey_ids)
+    survey_ids = np.frombuffer(data.survey_ids, dtype=np.int64)
+    graduated = np.frombuffer(data.graduated, dtype=np.int8).astype(bool)
+    resp_surveys = np.frombuffer(data.response_surveys, dtype=np.int64)
+    resp_questions = np.frombuffer(data.response_questions, dtype=np.int64)
+    answers = np.frombuffer(data.answers, dtype=np.int8)
+    old_penalties = np.frombuffer(data.penalty_cents, dtype=np.int64)
+    response_ids = np.frombuffer(data.response_ids, dtype=np.int64)
+
+    # Respuesta -> fila de encuesta
+    order = np.argsort(survey_ids, kind='stable')
+    sorted_ids = survey_ids[order]
+    pos = np.minimum(np.searchsorted(sorted_ids, resp_surveys), max(n - 1, 0))
+    valid = (sorted_ids[pos] == resp_surveys) if n else np.zeros(len(resp_surveys), dtype=bool)
+    rows = order[pos] if n else pos
+
+    # Respuesta -> posición en los vectores de penalización
+    ordered_questions = sorted(questions, key=lambda q: q.id)
+    question_ids = np.array([q.id for q in ordered_questions], dtype=np.int64)
+    qpos = np.minimum(np.searchsorted(question_ids, resp_questions), max(len(question_ids) - 1, 0))
+    if len(question_ids):
+        valid &= question_ids[qpos] == resp_questions
+    else:
+        valid &= False
+    is_no = valid & (answers == _NO)
+
+    new_penalties = np.zeros(len(resp_surveys), dtype=np.int64)
+    deducted = np.zeros(n, dtype=np.int64)
+    for flag, attr in ((False, 'penalty_not_graduated'), (True, 'penalty_graduated')):
+        vector = np.array([_to_cents(getattr(q, attr)) for q in ordered_questions], dtype=np.int64)
+        mask = is_no & (graduated[rows] == flag) if n else is_no
+        if not mask.any():
+            continue
+        values = vector[qpos[mask]]
+        new_penalties[mask] = values
+        # Los pesos se suman en float64: exacto para enteros menores a 2**53
+        deducted += np.bincount(rows[mask], weights=values, minlength=n).astype(np.int64)
+    scores = np.maximum(0, _BASE_CENTS - deducted)
+
+    changed = np.nonzero(valid & (new_penalties != old_penalties))[0]
+    response_updates = list(zip((new_penalties[changed] / SCORE_SCALE).tolist(),
+                                response_ids[changed].tolist()))
+
+    # Tiers por área con searchsorted sobre los mínimos
+    tier_ids = np.full(n, _NO_ID, dtype=np.int64)
+    area_ids = np.frombuffer(data.area_ids, dtype=np.int64)
+    index = TierIndex(lambda: tiers)
+    by_area: Dict[int, List[Tier]] = {}
+    for tier in tiers:
+        if tier.active:
+            by_area.setdefault(tier.area_id, []).append(tier)
+    for area_id, area_tiers in by_area.items():
+        area_tiers.sort(key=lambda t: (_to_cents(t.min_score), t.id or 0))
+        mins = np.array([_to_cents(t.min_score) for t in area_tiers], dtype=np.int64)
+        maxs = np.array([_to_cents(t.max_score) for t in area_tiers], dtype=np.int64)
+        ids = np.array([t.id for t in area_tiers], dtype=np.int64)
+        members = np.nonzero(area_ids == area_id)[0]
+        if not len(members):
+            continue
+        area_scores = scores[members]
+        idx = np.searchsorted(mins, area_scores, side='right') - 1
+        safe = np.maximum(idx, 0)
+        hit = (idx >= 0) & (area_scores <= maxs[safe])
+        tier_ids[members] = np.where(hit, ids[safe], _NO_ID)
+        # Con intervalos solapados un tier anterior podría cubrir el puntaje
+        for member in members[~hit & (idx > 0)].tolist():
+            tier = index.lookup(area_id, scores[member] / SCORE_SCALE)
+            tier_ids[member] = tier.id if tier else _NO_ID
+    return scores.tolist(), tier_ids.tolist(), response_updates
+
+
+def compute_rescore(data: ScoringData, questions: Sequence[Question], tiers: Sequence[Tier],
+                    use_numpy: Optional[bool] = None) -> RescoreReport:
+    """Recalcula puntajes y tiers y retorna las diferencias respecto de lo guardado.
+
+    ``use_numpy=None`` usa NumPy si está instalado.
+    """
+    if use_numpy is None:
+        use_numpy = np is not None
+    if use_numpy and np is None:
+        raise RuntimeError("NumPy no está instalado")
+    start = time.perf_counter()
+    compute = _compute_numpy if use_numpy else _compute_python
+    scores, tier_ids, response_updates = compute(data, questions, tiers)
+
+    tier_names = {t.id: t.name for t in tiers}
+    changes = []
+    for pos, (survey_id, old_score, old_tier, old_name, new_score, new_tier) in enumerate(zip(
+            data.survey_ids, data.score_cents, data.tier_ids, data.tier_names, scores, tier_ids)):
+        new_name = tier_names.get(new_tier)
+        if old_score != new_score or old_tier != new_tier or (new_tier != _NO_ID and old_name != new_name):
+            changes.append(ScoreChange(
+                survey_id=survey_id,
+                old_score=old_score / SCORE_SCALE,
+                new_score=new_score / SCORE_SCALE,
+                old_tier_id=None if old_tier == _NO_ID else old_tier,
+                old_tier_name=old_name,
+                new_tier_id=None if new_tier == _NO_ID else new_tier,
+                new_tier_name=new_name,
+            ))
+    return RescoreReport(
+        surveys_scanned=len(data.survey_ids),
+        responses_scanned=len(data.response_ids),
+        changes=changes,
+        response_updates=response_updates,
+        engine='numpy' if use_numpy else 'python',
+        elapsed=time.perf_counter() - start,
+    )
+
+
+class RescoreService:
+    """Servicio para recalcular en bloque los puntajes guardados."""
+
+    def __init__(self):
+        """Inicializa el servicio."""
+        self.survey_repo = SurveyRepository()
+        self.question_repo = QuestionRepository()
+        self.tier_repo = TierRepository()
+
+    def load_data(self) -> ScoringData:
+        """Lee encuestas y respuestas en streaming hacia columnas compactas."""
+        return ScoringData.from_rows(
+            self.survey_repo.iter_scoring_headers(),
+            self.survey_repo.iter_scoring_responses()
+        )
+
+    def rescore(self, apply: bool = False, use_numpy: Optional[bool] = None) -> RescoreReport:
+        """Recalcula todas las encuestas; solo escribe si ``apply`` es True."""
+        questions = self.question_repo.find_all(active_only=False)
+        tiers = self.tier_repo.find_all(active_only=True)
+        report = compute_rescore(self.load_data(), questions, tiers, use_numpy=use_numpy)
+        if apply and (report.changes or report.response_updates):
+            self.survey_repo.apply_rescore(
+                [(c.new_score, c.new_tier_id, c.new_tier_name, c.survey_id) for c in report.changes],
+                report.response_updates
+            )
+            report.applied = True
+        return report
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Punto de entrada de línea de comandos."""
+    parser = argparse.ArgumentParser(description="Recalcula puntajes y tiers de encuestas guardadas.")
+    parser.add_argument('--apply', action='store_true', help="escribe los cambios (por defecto solo simula)")
+    parser.add_argument('--limit', type=int, default=20, help="diferencias a mostrar en el reporte")
+    parser.add_argument('--no-numpy', action='store_true', help="fuerza el cálculo en Python puro")
+    args = parser.parse_args(argv)
+    report = RescoreService().rescore(apply=args.apply, use_numpy=False if args.no_numpy else None)
+    print(report.format(limit=args.limit))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""Cálculo incremental del puntaje de una evaluación."""
+from typing import Callable, Dict, Iterable, List, Optional
+from src.models.question import Question
+from src.models.tier import Tier
+
+BASE_SCORE = 100.0
+VALID_ANSWERS = ('YES', 'NO', 'NA')
+
+# Las penalizaciones son DECIMAL(6,2): se llevan en centésimas enteras para que
+# sumar y restar deltas nunca acumule error de punto flotante.
+SCORE_SCALE = 100
+
+
+class ScoreEngine:
+    """Estado de puntaje de un formulario con actualización O(1) por respuesta.
+
+    Guarda la penalización de cada pregunta en un arreglo indexado por
+    posición y el total descontado; cambiar una respuesta solo aplica la
+    diferencia. ``SurveyService.calculate_score`` usa la misma clase, por lo que
+    el puntaje en vivo y el guardado no pueden diferir.
+    """
+
+    def __init__(self, questions: Iterable[Question], is_graduated: bool = False,
+                 tier_lookup: Optional[Callable[[float], Optional[Tier]]] = None):
+        self._questions: List[Question] = list(questions)
+        self._slots: Dict[int, int] = {q.id: pos for pos, q in enumerate(self._questions)}
+        self._answers: List[str] = ['NA'] * len(self._questions)
+        self._penalties: List[int] = []
+        self._deducted = 0
+        self._tier_lookup = tier_lookup
+        self._tier_score: Optional[float] = None
+        self._tier: Optional[Tier] = None
+        self.is_graduated = is_graduated
+        self._load_penalties()
+
+    def _load_penalties(self) -> None:
+        """Recalcula las penalizaciones y el total para el estado de graduado actual."""
+        self._penalties = [
+            int(round(q.get_penalty(self.is_graduated) * SCORE_SCALE)) for q in self._questions
+        ]
+        self._deducted = sum(
+            penalty for penalty, answer in zip(self._penalties, self._answers) if answer == 'NO'
+        )
+
+    def __contains__(self, question_id: int) -> bool:
+        return question_id in self._slots
+
+    def set_answer(self, question_id: int, answer: str) -> float:
+        """Registra la respuesta de una pregunta y retorna el puntaje resultante."""
+        if answer not in VALID_ANSWERS:
+            raise ValueError("La respuesta debe ser 'YES', 'NO' o 'NA'")
+        pos = self._slots.get(question_id)
+        if pos is None:
+            raise KeyError(f"Pregunta {question_id} no pertenece al formulario")
+        previous = self._answers[pos]
+        if previous != answer:
+            if previous == 'NO':
+                self._deducted -= self._penalties[pos]
+            elif answer == 'NO':
+                self._deducted += self._penalties[pos]
+            self._answers[pos] = answer
+        return self.score
+
+    def set_graduated(self, is_graduated: bool) -> None:
+        """Cambia la regla de penalización (recalcula todas las preguntas)."""
+        if is_graduated != self.is_graduated:
+            self.is_graduated = is_graduated
+            self._load_penalties()
+
+    def answer(self, question_id: int) -> str:
+        """Respuesta actual de una pregunta."""
+        return self._answers[self._slots[question_id]]
+
+    def answers(self) -> Dict[int, str]:
+        """Respuestas actuales por ID de pregunta, en el orden del formulario."""
+        return {q.id: self._answers[pos] for pos, q in enumerate(self._questions)}
+
+    def penalty_for(self, question_id: int) -> float:
+        """Penalización aplicada hoy a una pregunta (0 si no respondió 'NO')."""
+        pos = self._slots[question_id]
+        return self._penalties[pos] / SCORE_SCALE if self._answers[pos] == 'NO' else 0.0
+
+    @property
+    def score(self) -> float:
+        """Puntaje actual, con mínimo 0."""
+        return max(0, int(BASE_SCORE * SCORE_SCALE) - self._deducted) / SCORE_SCALE
+
+    @property
+    def tier(self) -> Optional[Tier]:
+        """Tier del puntaje actual según ``tier_lookup`` (se recalcula solo si el puntaje cambió)."""
+        if self._tier_lookup is None:
+            return None
+        score = self.score
+        if score != self._tier_score:
+            self._tier = self._tier_lookup(score)
+            self._tier_score = score
+        return self._tier
@@ -1,13 +1,23 @@
 """Servicio de lógica de negocio para Encuestas."""
-from typing import List, Optional
-from src.models.survey import Survey, SurveyResponse
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+from src.models.survey import Survey, SurveyFilters, SurveyResponse, SurveySummary
 from src.models.question import Question
-from src.repositories.survey_repository import SurveyRepository
+from src.repositories.survey_repository import EXPORT_COLUMNS, SurveyRepository
 from src.repositories.question_repository import QuestionRepository
 from src.repositories.profile_repository import ProfileRepository
 from src.repositories.case_repository import CaseRepository
+from src.services.catalog_cache import catalog_cache
+from src.services.score_engine import ScoreEngine
 from src.services.tier_service import TierService
 
+# Firma de los callbacks de progreso de exportación: (filas escritas, total estimado)
+ProgressCallback = Callable[[int, int], None]
+EXPORT_PROGRESS_EVERY = 5000
+
+# Filas de datos por hoja de Excel (1.048.576 filas menos el encabezado)
+EXCEL_MAX_DATA_ROWS = 1_048_575
+
 
 class SurveyService:
     """Servicio para lógica de negocio de encuestas."""
@@ -19,21 +29,18 @@ class SurveyService:
         self.profile_repo = ProfileRepository()
         self.case_repo = CaseRepository()
         self.tier_service = TierService()
+        self.catalog = catalog_cache
     
     def calculate_score(self, responses: List[SurveyResponse], is_graduated: bool, 
                        questions_map: dict) -> float:
-        """Calcula el puntaje final basado en las respuestas."""
-        score = 100.0
+        """Calcula el puntaje final basado en las respuestas (mínimo 0)."""
+        engine = ScoreEngine(questions_map.values(), is_graduated)
         for response in responses:
-            if response.answer == 'NO':
-                question = questions_map.get(response.question_id)
-                if question:
-                    penalty = question.get_penalty(is_graduated)
-                    score -= penalty
-                    response.penalty_applied = penalty
-        
-        # Asegurar que el mínimo sea 0
-        return max(0.0, score)
+            if response.question_id in engine:
+                engine.set_answer(response.question_id, response.answer)
+                if response.answer == 'NO':
+                    response.penalty_applied = engine.penalty_for(response.question_id)
+        return engine.score
     
     def create_survey(self, evaluator_profile: str, sid: str, case_id: int, is_graduated: bool,
                      responses: List[SurveyResponse]) -> int:
@@ -44,8 +51,10 @@ class SurveyService:
                 raise ValueError(f"El comentario es obligatorio para respuestas 'NO' (Pregunta ID: {response.question_id})")
         
         # Obtener preguntas para calcular penalizaciones
-        questions = self.question_repo.find_all(active_only=True)
-        questions_map = {q.id: q for q in questions}
+        questions_map = self.catalog.get(
+            ('questions_map', True),
+            lambda: {q.id: q for q in self.question_repo.find_all(active_only=True)}
+        )
         
         # Crear encuesta temporal para calcular puntaje
         temp_survey = Survey(
@@ -81,6 +90,12 @@ class SurveyService:
     def get_all_surveys(self) -> List[Survey]:
         """Obtiene todas las encuestas."""
         return self.survey_repo.find_all()
+    
+    def get_survey_page(self, filters: Optional[SurveyFilters] = None,
+                        after: Optional[Tuple[datetime, int]] = None,
+                        page_size: int = 200) -> List[SurveySummary]:
+        """Obtiene una página de encabezados de encuesta, más recientes primero."""
+        return self.survey_repo.find_page(filters=filters, after=after, limit=page_size)
 
     def get_history_for_sid(self, sid: str) -> List[Survey]:
         """Obtiene el historial de encuestas para un SID."""
@@ -88,51 +103,98 @@ class SurveyService:
             return []
         return self.survey_repo.find_by_sid(sid)
     
-    def export_to_csv(self, filepath: str) -> bool:
-        """Exporta todas las encuestas a CSV."""
+    def export_to_csv(self, filepath: str, compress: Optional[bool] = None,
+                      progress_callback: Optional[ProgressCallback] = None) -> bool:
+        """Exporta todas las encuestas a CSV en streaming.
+        
+        Las filas se escriben a medida que llegan de la base, sin armar la lista
+        completa en memoria. Con ``compress`` (por defecto si la ruta termina en
+        ``.gz``) se escribe gzip. ``progress_callback(escritas, total)`` se invoca
+        cada ``EXPORT_PROGRESS_EVERY`` filas y al terminar.
+        """
         import csv
+        import gzip
         try:
-            data = self.survey_repo.export_to_csv_data()
-            if not data:
+            total = self.survey_repo.count_export_rows() if progress_callback else 0
+            rows = self.survey_repo.iter_export_rows()
+            first = next(rows, None)
+            if first is None:
                 return False
             
-            with open(filepath, 'w', newline='', encoding='utf-8') as f:
-                if data:
-                    writer = csv.DictWriter(f, fieldnames=data[0].keys())
-                    writer.writeheader()
-                    writer.writerows(data)
+            if compress is None:
+                compress = filepath.lower().endswith('.gz')
+            opener = gzip.open if compress else open
+            with opener(filepath, 'wt', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(EXPORT_COLUMNS)
+                writer.writerow(first)
+                written = 1
+                for row in rows:
+                    writer.writerow(row)
+                    written += 1
+                    if progress_callback and written % EXPORT_PROGRESS_EVERY == 0:
+                        progress_callback(written, total)
+            if progress_callback:
+                progress_callback(written, max(total, written))
             return True
         except Exception:
             return False
     
-    def export_to_excel(self, filepath: str) -> bool:
-        """Exporta todas las encuestas a Excel."""
+    def export_to_excel(self, filepath: str, progress_callback: Optional[ProgressCallback] = None,
+                        max_rows_per_sheet: int = EXCEL_MAX_DATA_ROWS) -> bool:
+        """Exporta todas las encuestas a Excel en streaming, con una hoja por área.
+        
+        Usa el modo ``write_only`` de openpyxl, que escribe cada fila a disco al
+        agregarla, así la memoria no crece con el historial. Si un área supera
+        ``max_rows_per_sheet`` filas se continúa en una hoja nueva ("Área (2)").
+        """
         try:
-            import openpyxl
             from openpyxl import Workbook
+        except ImportError:
+            # Si openpyxl no está instalado, intentar con csv
+            return self.export_to_csv(filepath.replace('.xlsx', '.csv'), progress_callback=progress_callback)
+        
+        try:
+            total = self.survey_repo.count_export_rows() if progress_callback else 0
+            wb = Workbook(write_only=True)
+            sheets = {}  # área -> [hoja, filas escritas, número de parte]
+            used_titles = set()
+            written = 0
             
-            data = self.survey_repo.export_to_csv_data()
-            if not data:
-                return False
-            
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "Encuestas"
-            
-            # Headers
-            if data:
-                headers = list(data[0].keys())
-                ws.append(headers)
-                
-                # Data
-                for row in data:
-                    ws.append([row[h] for h in headers])
+            for area_name, row in self.survey_repo.iter_export_rows_with_area():
+                key = area_name or "Sin área"
+                state = sheets.get(key)
+                if state is None or state[1] >= max_rows_per_sheet:
+                    part = state[2] + 1 if state else 1
+                    ws = wb.create_sheet(title=self._excel_sheet_title(key, part, used_titles))
+                    ws.append(EXPORT_COLUMNS)
+                    state = [ws, 0, part]
+                    sheets[key] = state
+                state[0].append(row)
+                state[1] += 1
+                written += 1
+                if progress_callback and written % EXPORT_PROGRESS_EVERY == 0:
+                    progress_callback(written, total)
             
+            if not written:
+                return False
             wb.save(filepath)
+            if progress_callback:
+                progress_callback(written, max(total, written))
             return True
-        except ImportError:
-            # Si openpyxl no está instalado, intentar con csv
-            return self.export_to_csv(filepath.replace('.xlsx', '.csv'))
         except Exception:
             return False
-
+    
+    @staticmethod
+    def _excel_sheet_title(name: str, part: int, used_titles: set) -> str:
+        """Genera un título de hoja válido (31 caracteres, sin []:*?/\\) y único."""
+        clean = "".join("_" if ch in '[]:*?/\\' else ch for ch in name).strip() or "Hoja"
+        suffix = f" ({part})" if part > 1 else ""
+        title = clean[:31 - len(suffix)] + suffix
+        counter = 2
+        while title.lower() in used_titles:
+            extra = f" ~{counter}"
+            title = clean[:31 - len(suffix) - len(extra)] + suffix + extra
+            counter += 1
+        used_titles.add(title.lower())
+        return title
@@ -0,0 +1,65 @@
+"""Índice en memoria de tiers por área para resolver puntaje → tier."""
+import threading
+from bisect import bisect_right
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from src.models.tier import Tier
+
+
+class TierIndex:
+    """Intervalos de tiers activos ordenados por ``min_score`` para cada área.
+
+    Se carga completo con una sola consulta la primera vez que se usa y queda
+    en memoria hasta que se llame a ``invalidate``. La búsqueda es un ``bisect``
+    sobre los mínimos y replica la regla de ``TierRepository.find_by_score``:
+    entre los tiers que contienen el puntaje gana el de mayor ``min_score``.
+    """
+
+    def __init__(self, loader: Callable[[], Iterable[Tier]]):
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._areas: Optional[Dict[int, Tuple[List[float], List[Tier]]]] = None
+
+    def _build(self) -> Dict[int, Tuple[List[float], List[Tier]]]:
+        """Agrupa los tiers activos por área, ordenados por puntaje mínimo."""
+        grouped: Dict[int, List[Tier]] = {}
+        for tier in self._loader():
+            if tier.active:
+                grouped.setdefault(tier.area_id, []).append(tier)
+        areas = {}
+        for area_id, tiers in grouped.items():
+            tiers.sort(key=lambda t: (float(t.min_score), t.id or 0))
+            areas[area_id] = ([float(t.min_score) for t in tiers], tiers)
+        return areas
+
+    def _get_areas(self) -> Dict[int, Tuple[List[float], List[Tier]]]:
+        """Entrega el índice, cargándolo si fue invalidado."""
+        areas = self._areas
+        if areas is None:
+            with self._lock:
+                if self._areas is None:
+                    self._areas = self._build()
+                areas = self._areas
+        return areas
+
+    def lookup(self, area_id: int, score: float) -> Optional[Tier]:
+        """Retorna el tier activo del área que contiene ``score``."""
+        entry = self._get_areas().get(area_id)
+        if not entry:
+            return None
+        mins, tiers = entry
+        score = float(score)
+        # Recorre hacia atrás solo si hay intervalos solapados que no cubren el puntaje
+        for pos in range(bisect_right(mins, score) - 1, -1, -1):
+            if score <= float(tiers[pos].max_score):
+                return tiers[pos]
+        return None
+
+    def invalidate(self) -> None:
+        """Descarta el índice para que se recargue en la próxima búsqueda."""
+        with self._lock:
+            self._areas = None
+
+    @property
+    def loaded(self) -> bool:
+        """Indica si el índice está cargado en memoria."""
+        return self._areas is not None
@@ -2,6 +2,11 @@
 from typing import List, Optional, Iterable, Tuple
 from src.models.tier import Tier
 from src.repositories.tier_repository import TierRepository
+from src.services.tier_index import TierIndex
+
+# Índice compartido por todas las instancias del servicio para que una edición
+# desde la administración invalide también el que usa el formulario.
+_shared_tier_index = TierIndex(lambda: TierRepository().find_all(active_only=True))
 
 
 class TierService:
@@ -9,6 +14,7 @@ class TierService:
     
     def __init__(self):
         self.tier_repo = TierRepository()
+        self.tier_index = _shared_tier_index
     
     def create_tier(self, area_id: int, name: str, min_score: float, max_score: float,
                     description: Optional[str] = None, color: Optional[str] = None,
@@ -24,7 +30,9 @@ class TierService:
             color=color,
             active=active
         )
-        return self.tier_repo.create(tier)
+        tier_id = self.tier_repo.create(tier)
+        self.tier_index.invalidate()
+        return tier_id
     
     def update_tier(self, tier_id: int, area_id: int, name: str, min_score: float, max_score: float,
                     description: Optional[str] = None, color: Optional[str] = None,
@@ -40,11 +48,15 @@ class TierService:
             color=color,
             active=active
         )
-        return self.tier_repo.update(tier)
+        updated = self.tier_repo.update(tier)
+        self.tier_index.invalidate()
+        return updated
     
     def delete_tier(self, tier_id: int) -> bool:
         """Desactiva un tier."""
-        return self.tier_repo.delete(tier_id)
+        deleted = self.tier_repo.delete(tier_id)
+        self.tier_index.invalidate()
+        return deleted
     
     def get_tier(self, tier_id: int) -> Optional[Tier]:
         """Obtiene un tier por ID."""
@@ -55,27 +67,23 @@ class TierService:
         return self.tier_repo.find_all(area_id=area_id, active_only=active_only)
     
     def get_tier_for_score(self, area_id: int, score: float) -> Optional[Tier]:
-        """Obtiene el tier correspondiente para un puntaje."""
-        return self.tier_repo.find_by_score(area_id, score)
+        """Obtiene el tier correspondiente para un puntaje (desde el índice en memoria)."""
+        return self.tier_index.lookup(area_id, score)
     
-    def ensure_default_tiers(self, area_id: int, defaults: Iterable[Tuple[str, float, float, str, str]]):
-        """Crea tiers por defecto si no existen para un área."""
-        existing = self.get_tiers(area_id=area_id, active_only=False)
-        existing_names = {tier.name for tier in existing}
-        for name, min_score, max_score, description, color in defaults:
-            if name in existing_names:
-                continue
-            try:
-                self.create_tier(
-                    area_id=area_id,
-                    name=name,
-                    min_score=min_score,
-                    max_score=max_score,
-                    description=description,
-                    color=color,
-                    active=True
-                )
-            except Exception:
-                # Si hay algún error (por ejemplo, solapamiento), continuar
-                continue
-
+    def refresh_tiers(self) -> None:
+        """Fuerza la recarga del índice de tiers (p. ej. tras cambios externos)."""
+        self.tier_index.invalidate()
+    
+    def ensure_default_tiers(self, area_id: int, defaults: Iterable[Tuple[str, float, float, str, str]]) -> int:
+        """Crea tiers por defecto si no existen para un área. Retorna cuántos creó."""
+        return self._create_missing_defaults(defaults, area_id)
+    
+    def ensure_default_tiers_for_all_areas(self, defaults: Iterable[Tuple[str, float, float, str, str]]) -> int:
+        """Crea los tiers por defecto que falten en todas las áreas con una sola sentencia."""
+        return self._create_missing_defaults(defaults)
+    
+    def _create_missing_defaults(self, defaults, area_id: Optional[int] = None) -> int:
+        created = self.tier_repo.create_missing_defaults(defaults, area_id=area_id)
+        if created:
+            self.tier_index.invalidate()
+        return len(created)
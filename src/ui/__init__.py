@@ -1,10 +1,37 @@
-"""Interfaz de usuario Tkinter."""
-from .main_window import MainWindow
-from .area_admin_window import AreaAdminWindow
-from .case_admin_window import CaseAdminWindow
-from .question_admin_window import QuestionAdminWindow
-from .profile_admin_window import ProfileAdminWindow
-from .surveys_view_window import SurveysViewWindow
+"""Interfaz de usuario Tkinter.
 
-__all__ = ['MainWindow', 'AreaAdminWindow', 'CaseAdminWindow', 'QuestionAdminWindow', 'ProfileAdminWindow', 'SurveysViewWindow']
+Las ventanas se importan recién al usarlas por primera vez (``load_window`` o
+``from src.ui import AreaAdminWindow``), así el arranque no paga el costo de
+módulos de administración que el evaluador quizás nunca abra.
+"""
+from importlib import import_module
 
+# Clase -> módulo que la define
+WINDOWS = {
+    'MainWindow': 'src.ui.main_window',
+    'AreaAdminWindow': 'src.ui.area_admin_window',
+    'CaseAdminWindow': 'src.ui.case_admin_window',
+    'QuestionAdminWindow': 'src.ui.question_admin_window',
+    'ProfileAdminWindow': 'src.ui.profile_admin_window',
+    'TierAdminWindow': 'src.ui.tier_admin_window',
+    'SurveysViewWindow': 'src.ui.surveys_view_window',
+    'SurveyHistoryWindow': 'src.ui.survey_history_window',
+}
+
+
+def load_window(name: str) -> type:
+    """Importa (solo la primera vez) y retorna la clase de ventana ``name``."""
+    try:
+        module = WINDOWS[name]
+    except KeyError:
+        raise ValueError(f"Ventana desconocida: {name}") from None
+    return getattr(import_module(module), name)
+
+
+def __getattr__(name: str):
+    if name in WINDOWS:
+        return load_window(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = list(WINDOWS) + ['load_window']
@@ -3,34 +3,50 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from typing import Callable, Dict, Optional
 from src.services.area_service import AreaService
+from src.ui.task_runner import Spinner, TaskRunner
 
 
 class AreaAdminWindow(ttk.Frame):
     """Vista incrustada para CRUD de áreas."""
     
+    TASK_KEYS = ('area_admin_list', 'area_admin_select', 'area_admin_save')
+    
     def __init__(
         self,
         parent,
         area_service: AreaService,
         colors: Dict[str, str],
         on_back: Callable[[], None],
+        task_runner: Optional[TaskRunner] = None,
     ):
         super().__init__(parent, padding="20 20 20 15", style="Main.TFrame")
         self.area_service = area_service
         self.colors = colors
         self.on_back = on_back
+        self._owns_tasks = task_runner is None
+        self.tasks = task_runner or TaskRunner(self)
         
         self.selected_id: Optional[int] = None
         
         self._setup_ui()
         self._load_areas()
     
+    def destroy(self):
+        """Cancela las consultas pendientes de esta vista antes de destruirla."""
+        for key in self.TASK_KEYS:
+            self.tasks.cancel(key)
+        if self._owns_tasks:
+            self.tasks.shutdown()
+        super().destroy()
+    
     def _setup_ui(self):
         """Configura la interfaz incrustada."""
         header = ttk.Frame(self, style="Header.TFrame")
         header.pack(fill=tk.X, pady=(0, 15))
         
         ttk.Button(header, text="< Volver al Panel", command=self.on_back, style="Secondary.TButton").pack(side=tk.LEFT)
+        self.spinner = Spinner(header, style="HeaderSubtitle.TLabel")
+        self.spinner.pack(side=tk.RIGHT, padx=10)
         
         ttk.Label(header, text="Administración de Áreas", style="HeaderTitle.TLabel").pack(anchor=tk.W, pady=(8, 0))
         ttk.Label(
@@ -100,12 +116,22 @@ class AreaAdminWindow(ttk.Frame):
         ttk.Button(action_frame, text="Eliminar", command=self._delete, style="Secondary.TButton").pack(side=tk.LEFT, padx=5)
     
     def _load_areas(self):
-        """Carga las áreas en la lista."""
+        """Carga en segundo plano las áreas de la lista."""
+        self.tasks.submit(
+            'area_admin_list',
+            self.area_service.get_all_areas,
+            active_only=False,
+            on_success=self._show_areas,
+            on_error=lambda e: messagebox.showerror("Error", f"Error al cargar áreas: {str(e)}"),
+            spinner=self.spinner,
+            replace=True
+        )
+    
+    def _show_areas(self, areas):
+        """Llena la lista con las áreas leídas."""
         for item in self.tree.get_children():
             self.tree.delete(item)
         
-        areas = self.area_service.get_all_areas(active_only=False)
-        
         for area in areas:
             desc_short = (area.description or '')[:50] + '...' if area.description and len(area.description) > 50 else (area.description or '')
             self.tree.insert('', tk.END, values=(
@@ -121,14 +147,44 @@ class AreaAdminWindow(ttk.Frame):
         if selection:
             item = self.tree.item(selection[0])
             self.selected_id = item['values'][0]
-            area = self.area_service.get_area(self.selected_id)
-            if area:
-                self.name_entry.delete(0, tk.END)
-                self.name_entry.insert(0, area.name)
-                self.description_entry.delete('1.0', tk.END)
-                if area.description:
-                    self.description_entry.insert('1.0', area.description)
-                self.active_var.set(area.active)
+            # Solo importa la última selección
+            self.tasks.submit(
+                'area_admin_select',
+                self.area_service.get_area,
+                self.selected_id,
+                on_success=self._fill_form,
+                on_error=lambda e: messagebox.showerror("Error", f"Error al cargar el área: {str(e)}"),
+                spinner=self.spinner,
+                replace=True
+            )
+    
+    def _fill_form(self, area):
+        """Muestra el área seleccionada en el formulario."""
+        if area:
+            self.name_entry.delete(0, tk.END)
+            self.name_entry.insert(0, area.name)
+            self.description_entry.delete('1.0', tk.END)
+            if area.description:
+                self.description_entry.insert('1.0', area.description)
+            self.active_var.set(area.active)
+    
+    def _save(self, action: str, func: Callable, *args, success: str, **kwargs):
+        """Ejecuta una escritura en segundo plano; un doble clic no la repite."""
+        self.tasks.submit(
+            'area_admin_save',
+            func,
+            *args,
+            on_success=lambda _result: self._on_saved(success),
+            on_error=lambda e: messagebox.showerror("Error", f"Error al {action}: {str(e)}"),
+            spinner=self.spinner,
+            **kwargs
+        )
+    
+    def _on_saved(self, message: str):
+        """Confirma la escritura y recarga la lista."""
+        messagebox.showinfo("Éxito", message)
+        self._clear_form()
+        self._load_areas()
     
     def _create(self):
         """Crea una nueva área."""
@@ -139,17 +195,14 @@ class AreaAdminWindow(ttk.Frame):
         
         description = self.description_entry.get('1.0', tk.END).strip() or None
         
-        try:
-            self.area_service.create_area(
-                name=name,
-                description=description,
-                active=self.active_var.get()
-            )
-            messagebox.showinfo("Éxito", "Área creada correctamente")
-            self._clear_form()
-            self._load_areas()
-        except Exception as e:
-            messagebox.showerror("Error", f"Error al crear: {str(e)}")
+        self._save(
+            "crear",
+            self.area_service.create_area,
+            name=name,
+            description=description,
+            active=self.active_var.get(),
+            success="Área creada correctamente"
+        )
     
     def _update(self):
         """Actualiza un área."""
@@ -164,18 +217,15 @@ class AreaAdminWindow(ttk.Frame):
         
         description = self.description_entry.get('1.0', tk.END).strip() or None
         
-        try:
-            self.area_service.update_area(
-                area_id=self.selected_id,
-                name=name,
-                description=description,
-                active=self.active_var.get()
-            )
-            messagebox.showinfo("Éxito", "Área actualizada correctamente")
-            self._clear_form()
-            self._load_areas()
-        except Exception as e:
-            messagebox.showerror("Error", f"Error al actualizar: {str(e)}")
+        self._save(
+            "actualizar",
+            self.area_service.update_area,
+            area_id=self.selected_id,
+            name=name,
+            description=description,
+            active=self.active_var.get(),
+            success="Área actualizada correctamente"
+        )
     
     def _delete(self):
         """Elimina un área."""
@@ -184,13 +234,8 @@ class AreaAdminWindow(ttk.Frame):
             return
         
         if messagebox.askyesno("Confirmar", "¿Está seguro de eliminar esta área?"):
-            try:
-                self.area_service.delete_area(self.selected_id)
-                messagebox.showinfo("Éxito", "Área eliminada correctamente")
-                self._clear_form()
-                self._load_areas()
-            except Exception as e:
-                messagebox.showerror("Error", f"Error al eliminar: {str(e)}")
+            self._save("eliminar", self.area_service.delete_area, self.selected_id,
+                       success="Área eliminada correctamente")
     
     def _edit(self):
         """Habilita edición del elemento seleccionado."""
@@ -202,5 +247,6 @@ class AreaAdminWindow(ttk.Frame):
         self.description_entry.delete('1.0', tk.END)
         self.active_var.set(True)
         self.selected_id = None
+        self.tasks.cancel('area_admin_select')
         self.tree.selection_remove(self.tree.selection())
 
@@ -4,11 +4,14 @@ from tkinter import ttk, messagebox
 from typing import Callable, Dict, Optional
 from src.services.case_service import CaseService
 from src.services.area_service import AreaService
+from src.ui.task_runner import Spinner, TaskRunner
 
 
 class CaseAdminWindow(ttk.Frame):
     """Vista incrustada para CRUD de casos."""
     
+    TASK_KEYS = ('case_admin_list', 'case_admin_select', 'case_admin_save')
+    
     def __init__(
         self,
         parent,
@@ -16,25 +19,37 @@ class CaseAdminWindow(ttk.Frame):
         area_service: AreaService,
         colors: Dict[str, str],
         on_back: Callable[[], None],
+        task_runner: Optional[TaskRunner] = None,
     ):
         super().__init__(parent, padding="20 20 20 15", style="Main.TFrame")
         self.case_service = case_service
         self.area_service = area_service
         self.colors = colors
         self.on_back = on_back
+        self._owns_tasks = task_runner is None
+        self.tasks = task_runner or TaskRunner(self)
         
         self.selected_id: Optional[int] = None
         
         self._setup_ui()
-        self._load_areas()
         self._load_cases()
     
+    def destroy(self):
+        """Cancela las consultas pendientes de esta vista antes de destruirla."""
+        for key in self.TASK_KEYS:
+            self.tasks.cancel(key)
+        if self._owns_tasks:
+            self.tasks.shutdown()
+        super().destroy()
+    
     def _setup_ui(self):
         """Configura la interfaz."""
         header = ttk.Frame(self, style="Header.TFrame")
         header.pack(fill=tk.X, pady=(0, 15))
         
         ttk.Button(header, text="< Volver al Panel", command=self.on_back, style="Secondary.TButton").pack(side=tk.LEFT)
+        self.spinner = Spinner(header, style="HeaderSubtitle.TLabel")
+        self.spinner.pack(side=tk.RIGHT, padx=10)
         ttk.Label(header, text="Administración de Casos", style="HeaderTitle.TLabel").pack(anchor=tk.W, pady=(8, 0))
         ttk.Label(
             header,
@@ -105,20 +120,27 @@ class CaseAdminWindow(ttk.Frame):
         ttk.Button(action_frame, text="Editar", command=self._edit, style="Secondary.TButton").pack(side=tk.LEFT, padx=5)
         ttk.Button(action_frame, text="Eliminar", command=self._delete, style="Secondary.TButton").pack(side=tk.LEFT, padx=5)
     
-    def _load_areas(self):
-        """Carga las áreas."""
-        areas = self.area_service.get_all_areas(active_only=False)
-        area_names = [a.name for a in areas]
-        self.area_combo['values'] = area_names
-    
     def _load_cases(self):
-        """Carga los casos en la lista."""
+        """Carga en segundo plano los casos y las áreas."""
+        self.tasks.submit(
+            'case_admin_list',
+            lambda: (self.case_service.get_all_cases(active_only=False),
+                     self.area_service.get_all_areas(active_only=False)),
+            on_success=self._show_cases,
+            on_error=lambda e: messagebox.showerror("Error", f"Error al cargar casos: {str(e)}"),
+            spinner=self.spinner,
+            replace=True
+        )
+    
+    def _show_cases(self, result):
+        """Llena el combo de áreas y la lista de casos."""
+        cases, all_areas = result
+        self.area_combo['values'] = [a.name for a in all_areas]
+        areas = {a.id: a.name for a in all_areas}
+        
         for item in self.tree.get_children():
             self.tree.delete(item)
         
-        cases = self.case_service.get_all_cases(active_only=False)
-        areas = {a.id: a.name for a in self.area_service.get_all_areas(active_only=False)}
-        
         for case in cases:
             desc_short = (case.description or '')[:50] + '...' if case.description and len(case.description) > 50 else (case.description or '')
             area_name = areas.get(case.area_id, 'N/A')
@@ -136,19 +158,36 @@ class CaseAdminWindow(ttk.Frame):
         if selection:
             item = self.tree.item(selection[0])
             self.selected_id = item['values'][0]
-            case = self.case_service.get_case(self.selected_id)
-            if case:
-                areas = self.area_service.get_all_areas(active_only=False)
-                area = next((a for a in areas if a.id == case.area_id), None)
-                if area:
-                    self.area_combo.set(area.name)
-                
-                self.name_entry.delete(0, tk.END)
-                self.name_entry.insert(0, case.name)
-                self.description_entry.delete('1.0', tk.END)
-                if case.description:
-                    self.description_entry.insert('1.0', case.description)
-                self.active_var.set(case.active)
+            # Solo importa la última selección
+            self.tasks.submit(
+                'case_admin_select',
+                self._fetch_case,
+                self.selected_id,
+                on_success=self._fill_form,
+                on_error=lambda e: messagebox.showerror("Error", f"Error al cargar el caso: {str(e)}"),
+                spinner=self.spinner,
+                replace=True
+            )
+    
+    def _fetch_case(self, case_id: int):
+        """Lee el caso y el nombre de su área (corre fuera del hilo de Tk)."""
+        case = self.case_service.get_case(case_id)
+        area = self.area_service.get_area(case.area_id) if case else None
+        return case, (area.name if area else None)
+    
+    def _fill_form(self, result):
+        """Muestra el caso seleccionado en el formulario."""
+        case, area_name = result
+        if case:
+            if area_name:
+                self.area_combo.set(area_name)
+            
+            self.name_entry.delete(0, tk.END)
+            self.name_entry.insert(0, case.name)
+            self.description_entry.delete('1.0', tk.END)
+            if case.description:
+                self.description_entry.insert('1.0', case.description)
+            self.active_var.set(case.active)
     
     def _create(self):
         """Crea un nuevo caso."""
@@ -161,24 +200,18 @@ class CaseAdminWindow(ttk.Frame):
             messagebox.showwarning("Advertencia", "El nombre es obligatorio")
             return
         
-        area = self._get_selected_area()
-        if not area:
-            return
-        
         description = self.description_entry.get('1.0', tk.END).strip() or None
         
-        try:
-            self.case_service.create_case(
-                area_id=area.id,
-                name=name,
-                description=description,
-                active=self.active_var.get()
-            )
-            messagebox.showinfo("Éxito", "Caso creado correctamente")
-            self._clear_form()
-            self._load_cases()
-        except Exception as e:
-            messagebox.showerror("Error", f"Error al crear: {str(e)}")
+        self._save(
+            "crear",
+            self._save_with_area,
+            self.case_service.create_case,
+            self.area_combo.get(),
+            name=name,
+            description=description,
+            active=self.active_var.get(),
+            success="Caso creado correctamente"
+        )
     
     def _update(self):
         """Actualiza un caso."""
@@ -195,25 +228,19 @@ class CaseAdminWindow(ttk.Frame):
             messagebox.showwarning("Advertencia", "El nombre es obligatorio")
             return
         
-        area = self._get_selected_area()
-        if not area:
-            return
-        
         description = self.description_entry.get('1.0', tk.END).strip() or None
         
-        try:
-            self.case_service.update_case(
-                case_id=self.selected_id,
-                area_id=area.id,
-                name=name,
-                description=description,
-                active=self.active_var.get()
-            )
-            messagebox.showinfo("Éxito", "Caso actualizado correctamente")
-            self._clear_form()
-            self._load_cases()
-        except Exception as e:
-            messagebox.showerror("Error", f"Error al actualizar: {str(e)}")
+        self._save(
+            "actualizar",
+            self._save_with_area,
+            self.case_service.update_case,
+            self.area_combo.get(),
+            case_id=self.selected_id,
+            name=name,
+            description=description,
+            active=self.active_var.get(),
+            success="Caso actualizado correctamente"
+        )
     
     def _delete(self):
         """Elimina un caso."""
@@ -222,13 +249,26 @@ class CaseAdminWindow(ttk.Frame):
             return
         
         if messagebox.askyesno("Confirmar", "¿Está seguro de eliminar este caso?"):
-            try:
-                self.case_service.delete_case(self.selected_id)
-                messagebox.showinfo("Éxito", "Caso eliminado correctamente")
-                self._clear_form()
-                self._load_cases()
-            except Exception as e:
-                messagebox.showerror("Error", f"Error al eliminar: {str(e)}")
+            self._save("eliminar", self.case_service.delete_case, self.selected_id,
+                       success="Caso eliminado correctamente")
+    
+    def _save(self, action: str, func: Callable, *args, success: str, **kwargs):
+        """Ejecuta una escritura en segundo plano; un doble clic no la repite."""
+        self.tasks.submit(
+            'case_admin_save',
+            func,
+            *args,
+            on_success=lambda _result: self._on_saved(success),
+            on_error=lambda e: messagebox.showerror("Error", f"Error al {action}: {str(e)}"),
+            spinner=self.spinner,
+            **kwargs
+        )
+    
+    def _on_saved(self, message: str):
+        """Confirma la escritura y recarga la lista."""
+        messagebox.showinfo("Éxito", message)
+        self._clear_form()
+        self._load_cases()
     
     def _edit(self):
         """Habilita edición del elemento seleccionado."""
@@ -241,14 +281,13 @@ class CaseAdminWindow(ttk.Frame):
         self.description_entry.delete('1.0', tk.END)
         self.active_var.set(True)
         self.selected_id = None
+        self.tasks.cancel('case_admin_select')
         self.tree.selection_remove(self.tree.selection())
     
-    def _get_selected_area(self):
-        """Obtiene el objeto área a partir del combo."""
-        area_name = self.area_combo.get()
-        areas = self.area_service.get_all_areas(active_only=False)
-        area = next((a for a in areas if a.name == area_name), None)
+    def _save_with_area(self, save: Callable, area_name: str, **fields):
+        """Resuelve el área por nombre y ejecuta ``save`` (corre fuera del hilo de Tk)."""
+        area = self.area_service.get_area_by_name(area_name)
         if not area:
-            messagebox.showerror("Error", "Área no encontrada")
-        return area
+            raise LookupError("Área no encontrada")
+        return save(area_id=area.id, **fields)
 
@@ -8,6 +8,10 @@ from src.services.profile_service import ProfileService
 from src.services.area_service import AreaService
 from src.services.case_service import CaseService
 from src.services.tier_service import TierService
+from src.services.score_engine import ScoreEngine
+from src.ui import load_window
+from src.ui.task_runner import Spinner, TaskRunner
+from src.ui.question_list import QuestionFormModel, VirtualQuestionList
 from src.models.survey import SurveyResponse
 from src.models.question import Question
 
@@ -41,11 +45,13 @@ class MainWindow:
         self.area_service = AreaService()
         self.case_service = CaseService()
         self.tier_service = TierService()
+        # Toda consulta a la base de datos desde la UI pasa por aquí
+        self.tasks = TaskRunner(self.root)
         
         self.questions: List[Question] = []
-        self.current_responses: Dict[int, SurveyResponse] = {}
-        self.answer_vars: Dict[int, tk.StringVar] = {}
-        self.comment_entries: Dict[int, tk.Text] = {}
+        self.score_engine: Optional[ScoreEngine] = None
+        # Respuestas y comentarios del formulario (independientes de los widgets)
+        self.form_model: Optional[QuestionFormModel] = None
         self.current_score: float = 100.0
         self.current_tier = None
         self.selected_area_id: Optional[int] = None
@@ -317,6 +323,8 @@ class MainWindow:
             text="Selecciona un perfil y un área para cargar automáticamente las preguntas disponibles.",
             style="MutedCard.TLabel"
         ).grid(row=3, column=0, columnspan=4, sticky=tk.W, padx=5, pady=(8, 0))
+        self.spinner = Spinner(top_frame)
+        self.spinner.grid(row=3, column=4, sticky=tk.E, padx=5, pady=(8, 0))
         
         # Puntaje actual
         score_frame = ttk.Frame(self.main_dashboard, style="Card.TFrame", padding="15 12")
@@ -356,20 +364,13 @@ class MainWindow:
         questions_frame = ttk.LabelFrame(self.main_dashboard, text="Preguntas", padding="10", style="Card.TLabelframe")
         questions_frame.pack(fill=tk.BOTH, expand=True)
         
-        canvas = tk.Canvas(questions_frame, highlightthickness=0, bg=self.colors["card"])
-        scrollbar = ttk.Scrollbar(questions_frame, orient="vertical", command=canvas.yview)
-        self.questions_container = ttk.Frame(canvas, style="QuestionContainer.TFrame")
-        
-        self.questions_container.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+        # Solo se crean widgets para las preguntas visibles
+        self.question_list = VirtualQuestionList(
+            questions_frame,
+            self.colors,
+            on_answer_change=self._on_answer_change
         )
-        
-        canvas.create_window((0, 0), window=self.questions_container, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
-        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 5))
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.question_list.pack(fill=tk.BOTH, expand=True)
         
         button_frame = ttk.Frame(self.main_dashboard, style="Main.TFrame")
         button_frame.pack(fill=tk.X, pady=10)
@@ -397,45 +398,54 @@ class MainWindow:
         self.root.title(f"{self.base_title} - {title_suffix}")
     
     def _load_data(self):
-        """Carga datos iniciales."""
-        try:
-            # Cargar perfiles
-            profiles = self.profile_service.get_all_profiles(active_only=True)
-            if profiles:
-                profile_names = [p.name for p in profiles]
-                self.profile_combo.config(state='normal')
-                self.profile_combo['values'] = profile_names
-                self.profile_combo.config(state='readonly')
-                print(f"Perfiles cargados: {profile_names}")
-            else:
-                self.profile_combo.config(state='normal')
-                self.profile_combo['values'] = []
-                self.profile_combo.config(state='readonly')
-            
-            # Cargar áreas
-            areas = self.area_service.get_all_areas(active_only=True)
-            if areas:
-                area_names = [a.name for a in areas]
-                self.area_combo.config(state='normal')
-                self.area_combo['values'] = area_names
-                self.area_combo.config(state='readonly')
-                print(f"Áreas cargadas: {area_names}")
-            else:
-                self.area_combo.config(state='normal')
-                self.area_combo['values'] = []
-                self.area_combo.config(state='readonly')
-                messagebox.showwarning(
-                    "Advertencia",
-                    "No se encontraron áreas activas.\n\nVaya a Administración → Áreas para crear áreas."
-                )
-            
-            # Los casos se cargarán cuando se seleccione un área
-            self._update_cases_for_area()
-        except Exception as e:
-            print(f"Error al cargar datos: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            messagebox.showerror("Error", f"Error al cargar datos: {str(e)}")
+        """Carga en segundo plano perfiles y áreas iniciales."""
+        self.tasks.submit(
+            'main_initial_data',
+            lambda: (self.profile_service.get_all_profiles(active_only=True),
+                     self.area_service.get_all_areas(active_only=True)),
+            on_success=self._apply_initial_data,
+            on_error=self._on_initial_data_error,
+            spinner=self.spinner
+        )
+    
+    def _apply_initial_data(self, result):
+        """Llena los combos de perfil y área."""
+        profiles, areas = result
+        if profiles:
+            profile_names = [p.name for p in profiles]
+            self.profile_combo.config(state='normal')
+            self.profile_combo['values'] = profile_names
+            self.profile_combo.config(state='readonly')
+            print(f"Perfiles cargados: {profile_names}")
+        else:
+            self.profile_combo.config(state='normal')
+            self.profile_combo['values'] = []
+            self.profile_combo.config(state='readonly')
+        
+        if areas:
+            area_names = [a.name for a in areas]
+            self.area_combo.config(state='normal')
+            self.area_combo['values'] = area_names
+            self.area_combo.config(state='readonly')
+            print(f"Áreas cargadas: {area_names}")
+        else:
+            self.area_combo.config(state='normal')
+            self.area_combo['values'] = []
+            self.area_combo.config(state='readonly')
+            messagebox.showwarning(
+                "Advertencia",
+                "No se encontraron áreas activas.\n\nVaya a Administración → Áreas para crear áreas."
+            )
+        
+        # Los casos se cargarán cuando se seleccione un área
+        self._update_cases_for_area()
+    
+    def _on_initial_data_error(self, error: Exception):
+        """Informa un error en la carga inicial."""
+        print(f"Error al cargar datos: {str(error)}")
+        import traceback
+        traceback.print_exception(type(error), error, error.__traceback__)
+        messagebox.showerror("Error", f"Error al cargar datos: {str(error)}")
 
     def _open_history_window(self):
         """Abre la ventana con el historial de respuestas para el SID actual."""
@@ -445,9 +455,7 @@ class MainWindow:
             return
 
         try:
-            from src.ui.survey_history_window import SurveyHistoryWindow
-
-            SurveyHistoryWindow(
+            load_window('SurveyHistoryWindow')(
                 self.root,
                 sid,
                 self.survey_service,
@@ -467,29 +475,41 @@ class MainWindow:
     def _on_area_changed(self, event=None):
         """Maneja el cambio de área seleccionada."""
         self._update_cases_for_area()
-        self._update_tier_info(self.current_score)
     
     def _update_cases_for_area(self):
         """Actualiza la lista de casos según el área seleccionada."""
         area_name = self.area_combo.get()
-        if area_name:
-            areas = self.area_service.get_all_areas(active_only=False)
-            area = next((a for a in areas if a.name == area_name), None)
-            if area:
-                cases = self.case_service.get_all_cases(active_only=True, area_id=area.id)
-                case_names = [c.name for c in cases]
-                self.case_combo.config(state='normal')
-                self.case_combo['values'] = case_names
-                print(f"Casos cargados para área {area_name}: {case_names}")
-                self.selected_area_id = area.id
-            else:
-                self.case_combo.config(state='normal')
-                self.case_combo['values'] = []
-                self.selected_area_id = None
-        else:
-            self.case_combo.config(state='normal')
-            self.case_combo['values'] = []
-            self.selected_area_id = None
+        if not area_name:
+            self.tasks.cancel('main_cases')
+            self._apply_cases_for_area((None, []))
+            return
+        self.tasks.submit(
+            'main_cases',
+            self._fetch_cases_for_area,
+            area_name,
+            on_success=self._apply_cases_for_area,
+            on_error=lambda e: messagebox.showerror("Error", f"Error al cargar casos: {str(e)}"),
+            spinner=self.spinner,
+            replace=True
+        )
+    
+    def _fetch_cases_for_area(self, area_name: str):
+        """Retorna (ID de área, casos activos) para un nombre de área."""
+        area = self.area_service.get_area_by_name(area_name)
+        if not area:
+            return None, []
+        return area.id, self.case_service.get_all_cases(active_only=True, area_id=area.id)
+    
+    def _apply_cases_for_area(self, result):
+        """Llena el combo de casos y actualiza el tier mostrado."""
+        area_id, cases = result
+        case_names = [c.name for c in cases]
+        self.case_combo.config(state='normal')
+        self.case_combo['values'] = case_names
+        if area_id is not None:
+            print(f"Casos cargados para área {self.area_combo.get()}: {case_names}")
+        self.selected_area_id = area_id
+        self._update_tier_info(self.current_score)
     
     def _load_questions(self):
         """Carga las preguntas activas."""
@@ -501,196 +521,77 @@ class MainWindow:
             messagebox.showwarning("Advertencia", "Por favor seleccione un área")
             return
         
-        # Obtener perfil ID
-        profile_name = self.profile_combo.get()
-        profiles = self.profile_service.get_all_profiles(active_only=False)
-        profile = next((p for p in profiles if p.name == profile_name), None)
-        
+        # La última selección gana: una carga anterior en curso se descarta
+        self.tasks.submit(
+            'main_questions',
+            self._fetch_questions,
+            self.profile_combo.get(),
+            self.area_combo.get(),
+            on_success=self._apply_questions,
+            on_error=lambda e: messagebox.showerror("Error", str(e)),
+            spinner=self.spinner,
+            replace=True
+        )
+    
+    def _fetch_questions(self, profile_name: str, area_name: str):
+        """Lee preguntas y prefills del perfil/área (corre fuera del hilo de Tk)."""
+        profile = self.profile_service.get_profile_by_name(profile_name)
         if not profile:
-            messagebox.showerror("Error", "Perfil no encontrado")
-            return
-        
-        profile_id = profile.id
-        
-        # Obtener área ID
-        area_name = self.area_combo.get()
-        areas = self.area_service.get_all_areas(active_only=False)
-        area = next((a for a in areas if a.name == area_name), None)
+            raise LookupError("Perfil no encontrado")
         
+        area = self.area_service.get_area_by_name(area_name)
         if not area:
-            messagebox.showerror("Error", "Área no encontrada")
-            return
+            raise LookupError("Área no encontrada")
         
-        area_id = area.id
+        # Preguntas activas del área y prefills del perfil
+        questions = self.question_service.get_all_questions(active_only=True, area_id=area.id)
+        defaults = self.question_service.get_defaults_for_profile(profile.id) if questions else {}
+        return area.id, questions, defaults
+    
+    def _apply_questions(self, result):
+        """Renderiza las preguntas cargadas."""
+        area_id, questions, defaults = result
         self.selected_area_id = area_id
-        
-        # Cargar preguntas activas del área seleccionada
-        self.questions = self.question_service.get_all_questions(active_only=True, area_id=area_id)
+        self.questions = questions
         
         if not self.questions:
             messagebox.showinfo("Información", "No hay preguntas activas")
             return
         
-        # Obtener prefills para este perfil
-        defaults = self.question_service.get_defaults_for_profile(profile_id)
+        # Estado de puntaje incremental para el formulario
+        self.score_engine = ScoreEngine(
+            self.questions,
+            is_graduated=self._current_graduated_status(),
+            tier_lookup=lambda score: self.tier_service.get_tier_for_score(area_id, score)
+        )
         
         # Renderizar preguntas
         self._render_questions(defaults)
         self._update_score()
     
     def _render_questions(self, defaults: Dict[int, str]):
-        """Renderiza las preguntas en el panel."""
-        # Limpiar contenedor
-        for widget in self.questions_container.winfo_children():
-            widget.destroy()
-        
-        self.current_responses = {}
-        self.answer_vars = {}
-        self.comment_entries = {}
-        
-        for question in self.questions:
-            q_frame = ttk.LabelFrame(
-                self.questions_container,
-                text=f"Pregunta #{question.id}",
-                padding="12",
-                style="Question.TLabelframe"
-            )
-            q_frame.pack(fill=tk.X, pady=8, padx=5)
-            
-            # Texto de la pregunta
-            ttk.Label(q_frame, text=question.text, style="QuestionText.TLabel", wraplength=900).pack(anchor=tk.W, pady=(0, 8))
-            
-            # Obtener respuesta por defecto
-            default_answer = defaults.get(question.id, 'NA')
-            
-            # RadioButtons para respuestas
-            answer_var = tk.StringVar(value=default_answer)
-            self.answer_vars[question.id] = answer_var
-            
-            answer_frame = ttk.Frame(q_frame, style="QuestionBody.TFrame")
-            answer_frame.pack(fill=tk.X, pady=5)
-            
-            ttk.Radiobutton(
-                answer_frame,
-                text="Sí",
-                variable=answer_var,
-                value="YES",
-                style="Question.TRadiobutton",
-                command=lambda qid=question.id: self._on_answer_change(qid)
-            ).pack(side=tk.LEFT, padx=(0, 10))
-            
-            ttk.Radiobutton(
-                answer_frame,
-                text="No",
-                variable=answer_var,
-                value="NO",
-                style="Question.TRadiobutton",
-                command=lambda qid=question.id: self._on_answer_change(qid)
-            ).pack(side=tk.LEFT, padx=10)
-            
-            ttk.Radiobutton(
-                answer_frame,
-                text="N/A",
-                variable=answer_var,
-                value="NA",
-                style="Question.TRadiobutton",
-                command=lambda qid=question.id: self._on_answer_change(qid)
-            ).pack(side=tk.LEFT, padx=10)
-            
-            # Mostrar penalizaciones
-            penalty_text = f"Penalización Graduado: {question.penalty_graduated} | No Graduado: {question.penalty_not_graduated}"
-            ttk.Label(answer_frame, text=penalty_text, style="Penalty.TLabel").pack(side=tk.LEFT, padx=10)
-            
-            # Campo de comentario (visible solo si respuesta es NO)
-            comment_frame = ttk.Frame(q_frame, style="QuestionBody.TFrame")
-            comment_frame.pack(fill=tk.X, pady=5)
-            
-            ttk.Label(comment_frame, text="Comentario (obligatorio si No):", style="MutedCard.TLabel").pack(anchor=tk.W)
-            comment_entry = tk.Text(comment_frame, height=3, width=80, wrap=tk.WORD)
-            comment_entry.pack(fill=tk.X, pady=2)
-            comment_entry.configure(
-                bg="#f8fafc",
-                relief="flat",
-                font=("Segoe UI", 10),
-                highlightthickness=1,
-                highlightbackground=self.colors["border"],
-                highlightcolor=self.colors["accent"],
-                bd=0,
-                padx=8,
-                pady=6,
-                insertbackground="#0f172a"
-            )
-            self.comment_entries[question.id] = comment_entry
-            
-            # Inicializar respuesta
-            self._on_answer_change(question.id)
+        """Carga el modelo del formulario y lo muestra en la lista virtualizada."""
+        self.form_model = QuestionFormModel(self.questions, defaults)
+        # Inicializar el motor sin recalcular el puntaje por pregunta
+        for question_id, answer in self.form_model.answers.items():
+            self.score_engine.set_answer(question_id, answer)
+        self.question_list.set_model(self.form_model)
     
-    def _on_answer_change(self, question_id: int):
+    def _on_answer_change(self, question_id: int, answer: str):
         """Maneja el cambio de respuesta."""
-        answer = self.answer_vars[question_id].get()
-        comment_entry = self.comment_entries[question_id]
-        
-        # Mostrar/ocultar comentario según respuesta
-        if answer == 'NO':
-            self._set_comment_entry_state(comment_entry, enabled=True)
-        else:
-            comment_entry.config(state='normal')
-            comment_entry.delete('1.0', tk.END)
-            self._set_comment_entry_state(comment_entry, enabled=False)
-        
-        # Actualizar respuesta
-        question = next((q for q in self.questions if q.id == question_id), None)
-        if question:
-            comment = comment_entry.get('1.0', tk.END).strip() if answer == 'NO' else None
-            
-            # Calcular penalización
-            penalty = 0.0
-            if answer == 'NO':
-                penalty = question.get_penalty(self._current_graduated_status())
-            
-            self.current_responses[question_id] = SurveyResponse(
-                id=None,
-                survey_id=0,  # Temporal
-                question_id=question_id,
-                answer=answer,
-                comment=comment,
-                penalty_applied=penalty
-            )
+        # El comentario ya quedó en el modelo; se valida al guardar
+        if self.score_engine and question_id in self.score_engine:
+            self.score_engine.set_answer(question_id, answer)
         
         self._update_score()
     
-    def _set_comment_entry_state(self, entry: tk.Text, enabled: bool) -> None:
-        """Actualiza el estado y colores del campo de comentario."""
-        if enabled:
-            entry.config(
-                state='normal',
-                background="#f8fafc",
-                foreground="#0f172a",
-                insertbackground="#0f172a"
-            )
-        else:
-            entry.config(
-                state='disabled',
-                background="#f1f5f9",
-                foreground="#94a3b8"
-            )
-    
     def _current_graduated_status(self) -> bool:
         """Indica si la evaluación aplica reglas de graduado (actualmente deshabilitado)."""
         return False
     
     def _update_score(self):
         """Actualiza el puntaje actual."""
-        score = 100.0
-        is_graduated = self._current_graduated_status()
-        
-        for question in self.questions:
-            response = self.current_responses.get(question.id)
-            if response and response.answer == 'NO':
-                penalty = question.get_penalty(is_graduated)
-                score -= penalty
-        
-        score = max(0.0, score)
+        score = self.score_engine.score if self.score_engine else 100.0
         self.current_score = score
         self.score_label.config(text=f"Puntaje Actual: {score:.2f}")
         self._update_score_visuals()
@@ -728,7 +629,12 @@ class MainWindow:
             self.tier_label.config(text="Tier Actual: Seleccione un área", foreground=self.colors["text_muted"])
             return
         
-        tier = self.tier_service.get_tier_for_score(self.selected_area_id, score)
+        # El motor solo conoce los tiers del área con la que se cargaron las preguntas
+        if (self.score_engine and score == self.score_engine.score
+                and self.questions and self.questions[0].area_id == self.selected_area_id):
+            tier = self.score_engine.tier
+        else:
+            tier = self.tier_service.get_tier_for_score(self.selected_area_id, score)
         self.current_tier = tier
         if tier:
             color = tier.color or self.colors["accent"]
@@ -758,71 +664,84 @@ class MainWindow:
             messagebox.showwarning("Advertencia", "Por favor cargue las preguntas")
             return
         
-        # Validar comentarios obligatorios
-        for question_id, response in self.current_responses.items():
-            if response.answer == 'NO':
-                comment_entry = self.comment_entries[question_id]
-                comment = comment_entry.get('1.0', tk.END).strip()
+        # Validar comentarios obligatorios y armar las respuestas finales
+        responses = []
+        for question_id, answer in self.score_engine.answers().items():
+            comment = None
+            if answer == 'NO':
+                comment = self.form_model.comment(question_id)
                 if not comment:
                     messagebox.showerror("Error", f"El comentario es obligatorio para la Pregunta #{question_id}")
                     return
-                response.comment = comment
+            responses.append(SurveyResponse(
+                id=None,
+                survey_id=0,  # Temporal
+                question_id=question_id,
+                answer=answer,
+                comment=comment,
+                penalty_applied=self.score_engine.penalty_for(question_id)
+            ))
+        
+        # Un doble clic mientras se guarda no crea otra evaluación
+        self.tasks.submit(
+            'main_save_survey',
+            self._persist_survey,
+            self.area_combo.get(),
+            self.case_combo.get().strip(),
+            self.profile_combo.get(),
+            self.sid_entry.get().strip(),
+            self._current_graduated_status(),
+            responses,
+            on_success=self._on_survey_saved,
+            on_error=lambda e: messagebox.showerror("Error", f"Error al guardar: {str(e)}"),
+            spinner=self.spinner
+        )
+    
+    def _persist_survey(self, area_name: str, case_name: str, evaluator_profile: str, sid: str,
+                        is_graduated: bool, responses: List[SurveyResponse]) -> int:
+        """Resuelve área y caso y guarda la evaluación (corre fuera del hilo de Tk)."""
+        area = self.area_service.get_area_by_name(area_name)
+        if not area:
+            raise LookupError("Área no encontrada")
         
-        try:
-            # Obtener área
-            area_name = self.area_combo.get()
-            areas = self.area_service.get_all_areas(active_only=False)
-            area = next((a for a in areas if a.name == area_name), None)
-            if not area:
-                messagebox.showerror("Error", "Área no encontrada")
-                return
-            
-            # Obtener o crear caso
-            case_name = self.case_combo.get().strip()
-            case_id = self.case_service.find_or_create_case(area_id=area.id, name=case_name)
-            
-            # Crear respuestas finales
-            responses = list(self.current_responses.values())
-            
-            survey_id = self.survey_service.create_survey(
-                evaluator_profile=self.profile_combo.get(),
-                sid=self.sid_entry.get().strip(),
-                case_id=case_id,
-                is_graduated=self._current_graduated_status(),
-                responses=responses
-            )
-            
-            tier_text = self.current_tier.name if self.current_tier else "No configurado"
-            messagebox.showinfo(
-                "Éxito",
-                f"Evaluación guardada correctamente.\nPuntaje Final: {self.current_score:.2f}\nTier: {tier_text}"
-            )
-            
-            # Limpiar formulario
-            self.sid_entry.delete(0, tk.END)
-            self.case_combo.set('')
-            self.selected_area_id = None
-            self.tier_label.config(text="Tier Actual: Sin asignar", foreground=self.colors["text_muted"])
-            self.current_tier = None
-            for widget in self.questions_container.winfo_children():
-                widget.destroy()
-            self.questions = []
-            self.current_responses = {}
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Error al guardar: {str(e)}")
+        # Obtener o crear caso
+        case_id = self.case_service.find_or_create_case(area_id=area.id, name=case_name)
+        
+        return self.survey_service.create_survey(
+            evaluator_profile=evaluator_profile,
+            sid=sid,
+            case_id=case_id,
+            is_graduated=is_graduated,
+            responses=responses
+        )
+    
+    def _on_survey_saved(self, survey_id: int):
+        """Confirma el guardado y limpia el formulario."""
+        tier_text = self.current_tier.name if self.current_tier else "No configurado"
+        messagebox.showinfo(
+            "Éxito",
+            f"Evaluación guardada correctamente.\nPuntaje Final: {self.current_score:.2f}\nTier: {tier_text}"
+        )
+        
+        # Limpiar formulario
+        self.sid_entry.delete(0, tk.END)
+        self.case_combo.set('')
+        self.selected_area_id = None
+        self.tier_label.config(text="Tier Actual: Sin asignar", foreground=self.colors["text_muted"])
+        self.current_tier = None
+        self.question_list.clear()
+        self.form_model = None
+        self.questions = []
+        self.score_engine = None
     
     def _export_csv(self):
         """Exporta las encuestas a CSV."""
         filepath = filedialog.asksaveasfilename(
             defaultextension=".csv",
-            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+            filetypes=[("CSV files", "*.csv"), ("CSV comprimido", "*.csv.gz"), ("All files", "*.*")]
         )
         if filepath:
-            if self.survey_service.export_to_csv(filepath):
-                messagebox.showinfo("Éxito", f"Datos exportados a {filepath}")
-            else:
-                messagebox.showerror("Error", "Error al exportar datos")
+            self._run_export(self.survey_service.export_to_csv, filepath, "Error al exportar datos")
     
     def _export_excel(self):
         """Exporta las encuestas a Excel."""
@@ -831,30 +750,65 @@ class MainWindow:
             filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")]
         )
         if filepath:
-            if self.survey_service.export_to_excel(filepath):
+            self._run_export(
+                self.survey_service.export_to_excel, filepath,
+                "Error al exportar datos. Asegúrese de tener openpyxl instalado."
+            )
+    
+    def _run_export(self, export: Callable[..., bool], filepath: str, error_message: str):
+        """Ejecuta una exportación en segundo plano mostrando el avance en el título."""
+        if self.tasks.is_running('main_export'):
+            messagebox.showinfo("Información", "Ya hay una exportación en curso")
+            return
+        
+        def on_finished(exported: bool):
+            if exported:
                 messagebox.showinfo("Éxito", f"Datos exportados a {filepath}")
             else:
-                messagebox.showerror("Error", "Error al exportar datos. Asegúrese de tener openpyxl instalado.")
+                messagebox.showerror("Error", error_message)
+        
+        self.tasks.submit(
+            'main_export',
+            export,
+            filepath,
+            progress_callback=lambda written, total: self.tasks.call_in_ui(
+                self._report_export_progress, written, total
+            ),
+            on_success=on_finished,
+            on_error=lambda e: messagebox.showerror("Error", f"{error_message}\n\n{str(e)}"),
+            on_done=lambda: self.root.title(self.base_title),
+            spinner=self.spinner
+        )
+    
+    def _report_export_progress(self, written: int, total: int):
+        """Muestra el avance de una exportación en el título."""
+        percent = f" {written * 100 // total}%" if total else ""
+        self.root.title(f"{self.base_title} - Exportando{percent} ({written} filas)")
     
     def _open_area_admin(self):
         """Abre ventana de administración de áreas."""
-        from src.ui.area_admin_window import AreaAdminWindow
+        AreaAdminWindow = load_window('AreaAdminWindow')
         self._display_module(
-            lambda parent: AreaAdminWindow(parent, self.area_service, self.colors, self._show_dashboard),
+            lambda parent: AreaAdminWindow(
+                parent, self.area_service, self.colors, self._show_dashboard, task_runner=self.tasks
+            ),
             "Administración de Áreas"
         )
     
     def _open_case_admin(self):
         """Abre ventana de administración de casos."""
-        from src.ui.case_admin_window import CaseAdminWindow
+        CaseAdminWindow = load_window('CaseAdminWindow')
         self._display_module(
-            lambda parent: CaseAdminWindow(parent, self.case_service, self.area_service, self.colors, self._show_dashboard),
+            lambda parent: CaseAdminWindow(
+                parent, self.case_service, self.area_service, self.colors, self._show_dashboard,
+                task_runner=self.tasks
+            ),
             "Administración de Casos"
         )
     
     def _open_question_admin(self):
         """Abre ventana de administración de preguntas."""
-        from src.ui.question_admin_window import QuestionAdminWindow
+        QuestionAdminWindow = load_window('QuestionAdminWindow')
         self._display_module(
             lambda parent: QuestionAdminWindow(
                 parent,
@@ -862,22 +816,25 @@ class MainWindow:
                 self.profile_service,
                 self.area_service,
                 self.colors,
-                self._show_dashboard
+                self._show_dashboard,
+                task_runner=self.tasks
             ),
             "Administración de Preguntas"
         )
     
     def _open_profile_admin(self):
         """Abre ventana de administración de perfiles."""
-        from src.ui.profile_admin_window import ProfileAdminWindow
+        ProfileAdminWindow = load_window('ProfileAdminWindow')
         self._display_module(
-            lambda parent: ProfileAdminWindow(parent, self.profile_service, self.colors, self._show_dashboard),
+            lambda parent: ProfileAdminWindow(
+                parent, self.profile_service, self.colors, self._show_dashboard, task_runner=self.tasks
+            ),
             "Administración de Perfiles"
         )
     
     def _open_surveys_view(self):
         """Abre ventana de visualización de encuestas."""
-        from src.ui.surveys_view_window import SurveysViewWindow
+        SurveysViewWindow = load_window('SurveysViewWindow')
         self._display_module(
             lambda parent: SurveysViewWindow(
                 parent,
@@ -885,21 +842,26 @@ class MainWindow:
                 self.case_service,
                 self.question_service,
                 self.colors,
-                self._show_dashboard
+                self._show_dashboard,
+                area_service=self.area_service,
+                profile_service=self.profile_service,
+                tier_service=self.tier_service,
+                task_runner=self.tasks
             ),
             "Visualizador de Encuestas"
         )
     
     def _open_tier_admin(self):
         """Abre ventana de administración de tiers."""
-        from src.ui.tier_admin_window import TierAdminWindow
+        TierAdminWindow = load_window('TierAdminWindow')
         self._display_module(
             lambda parent: TierAdminWindow(
                 parent,
                 self.tier_service,
                 self.area_service,
                 self.colors,
-                self._show_dashboard
+                self._show_dashboard,
+                task_runner=self.tasks
             ),
             "Administración de Tiers"
         )
@@ -3,34 +3,50 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from typing import Callable, Dict, Optional
 from src.services.profile_service import ProfileService
+from src.ui.task_runner import Spinner, TaskRunner
 
 
 class ProfileAdminWindow(ttk.Frame):
     """Vista incrustada para CRUD de perfiles."""
     
+    TASK_KEYS = ('profile_admin_list', 'profile_admin_select', 'profile_admin_save')
+    
     def __init__(
         self,
         parent,
         profile_service: ProfileService,
         colors: Dict[str, str],
         on_back: Callable[[], None],
+        task_runner: Optional[TaskRunner] = None,
     ):
         super().__init__(parent, padding="20 20 20 15", style="Main.TFrame")
         self.profile_service = profile_service
         self.colors = colors
         self.on_back = on_back
+        self._owns_tasks = task_runner is None
+        self.tasks = task_runner or TaskRunner(self)
         
         self.selected_id: Optional[int] = None
         
         self._setup_ui()
         self._load_profiles()
     
+    def destroy(self):
+        """Cancela las consultas pendientes de esta vista antes de destruirla."""
+        for key in self.TASK_KEYS:
+            self.tasks.cancel(key)
+        if self._owns_tasks:
+            self.tasks.shutdown()
+        super().destroy()
+    
     def _setup_ui(self):
         """Configura la interfaz."""
         header = ttk.Frame(self, style="Header.TFrame")
         header.pack(fill=tk.X, pady=(0, 15))
         
         ttk.Button(header, text="< Volver al Panel", command=self.on_back, style="Secondary.TButton").pack(side=tk.LEFT)
+        self.spinner = Spinner(header, style="HeaderSubtitle.TLabel")
+        self.spinner.pack(side=tk.RIGHT, padx=10)
         ttk.Label(header, text="Administración de Perfiles", style="HeaderTitle.TLabel").pack(anchor=tk.W, pady=(8, 0))
         ttk.Label(
             header,
@@ -84,12 +100,22 @@ class ProfileAdminWindow(ttk.Frame):
         ttk.Button(action_frame, text="Eliminar", command=self._delete, style="Secondary.TButton").pack(side=tk.LEFT, padx=5)
     
     def _load_profiles(self):
-        """Carga los perfiles en la lista."""
+        """Carga en segundo plano los perfiles de la lista."""
+        self.tasks.submit(
+            'profile_admin_list',
+            self.profile_service.get_all_profiles,
+            active_only=False,
+            on_success=self._show_profiles,
+            on_error=lambda e: messagebox.showerror("Error", f"Error al cargar perfiles: {str(e)}"),
+            spinner=self.spinner,
+            replace=True
+        )
+    
+    def _show_profiles(self, profiles):
+        """Llena la lista con los perfiles leídos."""
         for item in self.tree.get_children():
             self.tree.delete(item)
         
-        profiles = self.profile_service.get_all_profiles(active_only=False)
-        
         for profile in profiles:
             self.tree.insert('', tk.END, values=(
                 profile.id,
@@ -103,11 +129,23 @@ class ProfileAdminWindow(ttk.Frame):
         if selection:
             item = self.tree.item(selection[0])
             self.selected_id = item['values'][0]
-            profile = self.profile_service.get_profile(self.selected_id)
-            if profile:
-                self.name_entry.delete(0, tk.END)
-                self.name_entry.insert(0, profile.name)
-                self.active_var.set(profile.active)
+            # Solo importa la última selección
+            self.tasks.submit(
+                'profile_admin_select',
+                self.profile_service.get_profile,
+                self.selected_id,
+                on_success=self._fill_form,
+                on_error=lambda e: messagebox.showerror("Error", f"Error al cargar el perfil: {str(e)}"),
+                spinner=self.spinner,
+                replace=True
+            )
+    
+    def _fill_form(self, profile):
+        """Muestra el perfil seleccionado en el formulario."""
+        if profile:
+            self.name_entry.delete(0, tk.END)
+            self.name_entry.insert(0, profile.name)
+            self.active_var.set(profile.active)
     
     def _create(self):
         """Crea un nuevo perfil."""
@@ -116,13 +154,8 @@ class ProfileAdminWindow(ttk.Frame):
             messagebox.showwarning("Advertencia", "El nombre es obligatorio")
             return
         
-        try:
-            self.profile_service.create_profile(name=name, active=self.active_var.get())
-            messagebox.showinfo("Éxito", "Perfil creado correctamente")
-            self._clear_form()
-            self._load_profiles()
-        except Exception as e:
-            messagebox.showerror("Error", f"Error al crear: {str(e)}")
+        self._save("crear", self.profile_service.create_profile, name=name, active=self.active_var.get(),
+                   success="Perfil creado correctamente")
     
     def _update(self):
         """Actualiza un perfil."""
@@ -135,17 +168,14 @@ class ProfileAdminWindow(ttk.Frame):
             messagebox.showwarning("Advertencia", "El nombre es obligatorio")
             return
         
-        try:
-            self.profile_service.update_profile(
-                profile_id=self.selected_id,
-                name=name,
-                active=self.active_var.get()
-            )
-            messagebox.showinfo("Éxito", "Perfil actualizado correctamente")
-            self._clear_form()
-            self._load_profiles()
-        except Exception as e:
-            messagebox.showerror("Error", f"Error al actualizar: {str(e)}")
+        self._save(
+            "actualizar",
+            self.profile_service.update_profile,
+            profile_id=self.selected_id,
+            name=name,
+            active=self.active_var.get(),
+            success="Perfil actualizado correctamente"
+        )
     
     def _delete(self):
         """Elimina un perfil."""
@@ -154,13 +184,26 @@ class ProfileAdminWindow(ttk.Frame):
             return
         
         if messagebox.askyesno("Confirmar", "¿Está seguro de eliminar este perfil?"):
-            try:
-                self.profile_service.delete_profile(self.selected_id)
-                messagebox.showinfo("Éxito", "Perfil eliminado correctamente")
-                self._clear_form()
-                self._load_profiles()
-            except Exception as e:
-                messagebox.showerror("Error", f"Error al eliminar: {str(e)}")
+            self._save("eliminar", self.profile_service.delete_profile, self.selected_id,
+                       success="Perfil eliminado correctamente")
+    
+    def _save(self, action: str, func: Callable, *args, success: str, **kwargs):
+        """Ejecuta una escritura en segundo plano; un doble clic no la repite."""
+        self.tasks.submit(
+            'profile_admin_save',
+            func,
+            *args,
+            on_success=lambda _result: self._on_saved(success),
+            on_error=lambda e: messagebox.showerror("Error", f"Error al {action}: {str(e)}"),
+            spinner=self.spinner,
+            **kwargs
+        )
+    
+    def _on_saved(self, message: str):
+        """Confirma la escritura y recarga la lista."""
+        messagebox.showinfo("Éxito", message)
+        self._clear_form()
+        self._load_profiles()
     
     def _edit(self):
         """Habilita edición del elemento seleccionado."""
@@ -171,5 +214,6 @@ class ProfileAdminWindow(ttk.Frame):
         self.name_entry.delete(0, tk.END)
         self.active_var.set(True)
         self.selected_id = None
+        self.tasks.cancel('profile_admin_select')
         self.tree.selection_remove(self.tree.selection())
 
@@ -5,11 +5,20 @@ from typing import Callable, Dict, Optional
 from src.services.question_service import QuestionService
 from src.services.profile_service import ProfileService
 from src.services.area_service import AreaService
+from src.ui.task_runner import Spinner, TaskRunner
 
 
 class QuestionAdminWindow(ttk.Frame):
     """Vista incrustada para administrar preguntas y prefills."""
     
+    TASK_KEYS = (
+        'question_admin_list',
+        'question_admin_profiles',
+        'question_admin_select',
+        'question_admin_prefills',
+        'question_admin_save',
+    )
+    
     def __init__(
         self,
         parent,
@@ -18,6 +27,7 @@ class QuestionAdminWindow(ttk.Frame):
         area_service: AreaService,
         colors: Dict[str, str],
         on_back: Callable[[], None],
+        task_runner: Optional[TaskRunner] = None,
     ):
         super().__init__(parent, padding="20 20 20 15", style="Main.TFrame")
         self.question_service = question_service
@@ -25,13 +35,22 @@ class QuestionAdminWindow(ttk.Frame):
         self.area_service = area_service
         self.colors = colors
         self.on_back = on_back
+        self._owns_tasks = task_runner is None
+        self.tasks = task_runner or TaskRunner(self)
         
         self.selected_id: Optional[int] = None
         
         self._setup_ui()
         self._load_questions()
         self._load_profiles()
-        self._load_areas()
+    
+    def destroy(self):
+        """Cancela las consultas pendientes de esta vista antes de destruirla."""
+        for key in self.TASK_KEYS:
+            self.tasks.cancel(key)
+        if self._owns_tasks:
+            self.tasks.shutdown()
+        super().destroy()
     
     def _setup_ui(self):
         """Configura la interfaz."""
@@ -39,6 +58,8 @@ class QuestionAdminWindow(ttk.Frame):
         header.pack(fill=tk.X, pady=(0, 15))
         
         ttk.Button(header, text="< Volver al Panel", command=self.on_back, style="Secondary.TButton").pack(side=tk.LEFT)
+        self.spinner = Spinner(header, style="HeaderSubtitle.TLabel")
+        self.spinner.pack(side=tk.RIGHT, padx=10)
         ttk.Label(header, text="Administración de Preguntas", style="HeaderTitle.TLabel").pack(anchor=tk.W, pady=(8, 0))
         ttk.Label(
             header,
@@ -153,25 +174,38 @@ class QuestionAdminWindow(ttk.Frame):
         ttk.Button(action_frame, text="Eliminar", command=self._delete, style="Secondary.TButton").pack(side=tk.LEFT, padx=5)
     
     def _load_profiles(self):
-        """Carga los perfiles."""
-        profiles = self.profile_service.get_all_profiles(active_only=False)
-        profile_names = [p.name for p in profiles]
-        self.profile_combo['values'] = profile_names
-    
-    def _load_areas(self):
-        """Carga las áreas."""
-        areas = self.area_service.get_all_areas(active_only=False)
-        area_names = [a.name for a in areas]
-        self.area_combo['values'] = area_names
+        """Carga en segundo plano los perfiles del combo de prefills."""
+        self.tasks.submit(
+            'question_admin_profiles',
+            self.profile_service.get_all_profiles,
+            active_only=False,
+            on_success=lambda profiles: self.profile_combo.configure(values=[p.name for p in profiles]),
+            on_error=lambda e: messagebox.showerror("Error", f"Error al cargar perfiles: {str(e)}"),
+            spinner=self.spinner,
+            replace=True
+        )
     
     def _load_questions(self):
-        """Carga las preguntas en la lista."""
+        """Carga en segundo plano las preguntas y las áreas."""
+        self.tasks.submit(
+            'question_admin_list',
+            lambda: (self.question_service.get_all_questions(active_only=False),
+                     self.area_service.get_all_areas(active_only=False)),
+            on_success=self._show_questions,
+            on_error=lambda e: messagebox.showerror("Error", f"Error al cargar preguntas: {str(e)}"),
+            spinner=self.spinner,
+            replace=True
+        )
+    
+    def _show_questions(self, result):
+        """Llena el combo de áreas y la lista de preguntas."""
+        questions, all_areas = result
+        self.area_combo['values'] = [a.name for a in all_areas]
+        areas = {a.id: a.name for a in all_areas}
+        
         for item in self.tree.get_children():
             self.tree.delete(item)
         
-        questions = self.question_service.get_all_questions(active_only=False)
-        areas = {a.id: a.name for a in self.area_service.get_all_areas(active_only=False)}
-        
         for question in questions:
             text_short = question.text[:50] + '...' if len(question.text) > 50 else question.text
             area_name = areas.get(question.area_id, 'N/A')
@@ -185,24 +219,34 @@ class QuestionAdminWindow(ttk.Frame):
             ))
     
     def _load_prefills(self):
-        """Carga los prefills para la pregunta seleccionada."""
+        """Carga en segundo plano los prefills de la pregunta seleccionada."""
         if not self.selected_id:
+            self.tasks.cancel('question_admin_prefills')
             return
         
-        # Limpiar tree
+        # Perfiles y prefills de esta pregunta (una sola consulta cada uno)
+        question_id = self.selected_id
+        self.tasks.submit(
+            'question_admin_prefills',
+            lambda: (self.profile_service.get_all_profiles(active_only=False),
+                     self.question_service.get_defaults_for_question(question_id)),
+            on_success=self._show_prefills,
+            on_error=lambda e: messagebox.showerror("Error", f"Error al cargar prefills: {str(e)}"),
+            spinner=self.spinner,
+            replace=True
+        )
+    
+    def _show_prefills(self, result):
+        """Llena la lista de prefills configurados."""
+        profiles, defaults = result
         for item in self.prefills_tree.get_children():
             self.prefills_tree.delete(item)
         
-        # Obtener perfiles
-        profiles = self.profile_service.get_all_profiles(active_only=False)
-        
-        # Obtener prefills para esta pregunta
         for profile in profiles:
-            defaults = self.question_service.get_defaults_for_profile(profile.id)
-            if self.selected_id in defaults:
+            if profile.id in defaults:
                 self.prefills_tree.insert('', tk.END, values=(
                     profile.name,
-                    defaults[self.selected_id]
+                    defaults[profile.id]
                 ))
     
     def _on_select(self, event):
@@ -211,22 +255,47 @@ class QuestionAdminWindow(ttk.Frame):
         if selection:
             item = self.tree.item(selection[0])
             self.selected_id = item['values'][0]
-            question = self.question_service.get_question(self.selected_id)
-            if question:
-                # Cargar área
-                areas = self.area_service.get_all_areas(active_only=False)
-                area = next((a for a in areas if a.id == question.area_id), None)
-                if area:
-                    self.area_combo.set(area.name)
-                
-                self.text_entry.delete('1.0', tk.END)
-                self.text_entry.insert('1.0', question.text)
-                self.penalty_graduated_entry.delete(0, tk.END)
-                self.penalty_graduated_entry.insert(0, str(question.penalty_graduated))
-                self.penalty_not_graduated_entry.delete(0, tk.END)
-                self.penalty_not_graduated_entry.insert(0, str(question.penalty_not_graduated))
-                self.active_var.set(question.active)
-                self._load_prefills()
+            # Solo importa la última selección
+            self.tasks.submit(
+                'question_admin_select',
+                self._fetch_question,
+                self.selected_id,
+                on_success=self._fill_form,
+                on_error=lambda e: messagebox.showerror("Error", f"Error al cargar la pregunta: {str(e)}"),
+                spinner=self.spinner,
+                replace=True
+            )
+    
+    def _fetch_question(self, question_id: int):
+        """Lee la pregunta y el nombre de su área (corre fuera del hilo de Tk)."""
+        question = self.question_service.get_question(question_id)
+        area = self.area_service.get_area(question.area_id) if question else None
+        return question, (area.name if area else None)
+    
+    def _fill_form(self, result):
+        """Muestra la pregunta seleccionada en el formulario."""
+        question, area_name = result
+        if question:
+            if area_name:
+                self.area_combo.set(area_name)
+            
+            self.text_entry.delete('1.0', tk.END)
+            self.text_entry.insert('1.0', question.text)
+            self.penalty_graduated_entry.delete(0, tk.END)
+            self.penalty_graduated_entry.insert(0, str(question.penalty_graduated))
+            self.penalty_not_graduated_entry.delete(0, tk.END)
+            self.penalty_not_graduated_entry.insert(0, str(question.penalty_not_graduated))
+            self.active_var.set(question.active)
+            self._load_prefills()
+    
+    def _read_penalties(self):
+        """Lee las penalizaciones del formulario; retorna None si no son números."""
+        try:
+            return (float(self.penalty_graduated_entry.get()),
+                    float(self.penalty_not_graduated_entry.get()))
+        except ValueError:
+            messagebox.showerror("Error", "Las penalizaciones deben ser números")
+            return None
     
     def _create(self):
         """Crea una nueva pregunta."""
@@ -239,34 +308,21 @@ class QuestionAdminWindow(ttk.Frame):
             messagebox.showwarning("Advertencia", "El texto es obligatorio")
             return
         
-        # Obtener área ID
-        area_name = self.area_combo.get()
-        areas = self.area_service.get_all_areas(active_only=False)
-        area = next((a for a in areas if a.name == area_name), None)
-        if not area:
-            messagebox.showerror("Error", "Área no encontrada")
+        penalties = self._read_penalties()
+        if penalties is None:
             return
         
-        try:
-            penalty_graduated = float(self.penalty_graduated_entry.get())
-            penalty_not_graduated = float(self.penalty_not_graduated_entry.get())
-        except ValueError:
-            messagebox.showerror("Error", "Las penalizaciones deben ser números")
-            return
-        
-        try:
-            self.question_service.create_question(
-                area_id=area.id,
-                text=text,
-                penalty_graduated=penalty_graduated,
-                penalty_not_graduated=penalty_not_graduated,
-                active=self.active_var.get()
-            )
-            messagebox.showinfo("Éxito", "Pregunta creada correctamente")
-            self._clear_form()
-            self._load_questions()
-        except Exception as e:
-            messagebox.showerror("Error", f"Error al crear: {str(e)}")
+        self._save(
+            "crear",
+            self._save_with_area,
+            self.question_service.create_question,
+            self.area_combo.get(),
+            text=text,
+            penalty_graduated=penalties[0],
+            penalty_not_graduated=penalties[1],
+            active=self.active_var.get(),
+            success="Pregunta creada correctamente"
+        )
     
     def _update(self):
         """Actualiza una pregunta."""
@@ -283,35 +339,22 @@ class QuestionAdminWindow(ttk.Frame):
             messagebox.showwarning("Advertencia", "El texto es obligatorio")
             return
         
-        # Obtener área ID
-        area_name = self.area_combo.get()
-        areas = self.area_service.get_all_areas(active_only=False)
-        area = next((a for a in areas if a.name == area_name), None)
-        if not area:
-            messagebox.showerror("Error", "Área no encontrada")
-            return
-        
-        try:
-            penalty_graduated = float(self.penalty_graduated_entry.get())
-            penalty_not_graduated = float(self.penalty_not_graduated_entry.get())
-        except ValueError:
-            messagebox.showerror("Error", "Las penalizaciones deben ser números")
+        penalties = self._read_penalties()
+        if penalties is None:
             return
         
-        try:
-            self.question_service.update_question(
-                question_id=self.selected_id,
-                area_id=area.id,
-                text=text,
-                penalty_graduated=penalty_graduated,
-                penalty_not_graduated=penalty_not_graduated,
-                active=self.active_var.get()
-            )
-            messagebox.showinfo("Éxito", "Pregunta actualizada correctamente")
-            self._clear_form()
-            self._load_questions()
-        except Exception as e:
-            messagebox.showerror("Error", f"Error al actualizar: {str(e)}")
+        self._save(
+            "actualizar",
+            self._save_with_area,
+            self.question_service.update_question,
+            self.area_combo.get(),
+            question_id=self.selected_id,
+            text=text,
+            penalty_graduated=penalties[0],
+            penalty_not_graduated=penalties[1],
+            active=self.active_var.get(),
+            success="Pregunta actualizada correctamente"
+        )
     
     def _delete(self):
         """Elimina una pregunta."""
@@ -320,13 +363,33 @@ class QuestionAdminWindow(ttk.Frame):
             return
         
         if messagebox.askyesno("Confirmar", "¿Está seguro de eliminar esta pregunta?"):
-            try:
-                self.question_service.delete_question(self.selected_id)
-                messagebox.showinfo("Éxito", "Pregunta eliminada correctamente")
-                self._clear_form()
-                self._load_questions()
-            except Exception as e:
-                messagebox.showerror("Error", f"Error al eliminar: {str(e)}")
+            self._save("eliminar", self.question_service.delete_question, self.selected_id,
+                       success="Pregunta eliminada correctamente")
+    
+    def _save(self, action: str, func: Callable, *args, success: str, **kwargs):
+        """Ejecuta una escritura en segundo plano; un doble clic no la repite."""
+        self.tasks.submit(
+            'question_admin_save',
+            func,
+            *args,
+            on_success=lambda _result: self._on_saved(success),
+            on_error=lambda e: messagebox.showerror("Error", f"Error al {action}: {str(e)}"),
+            spinner=self.spinner,
+            **kwargs
+        )
+    
+    def _on_saved(self, message: str):
+        """Confirma la escritura y recarga la lista."""
+        messagebox.showinfo("Éxito", message)
+        self._clear_form()
+        self._load_questions()
+    
+    def _save_with_area(self, save: Callable, area_name: str, **fields):
+        """Resuelve el área por nombre y ejecuta ``save`` (corre fuera del hilo de Tk)."""
+        area = self.area_service.get_area_by_name(area_name)
+        if not area:
+            raise LookupError("Área no encontrada")
+        return save(area_id=area.id, **fields)
     
     def _save_prefill(self):
         """Guarda un prefill."""
@@ -342,24 +405,32 @@ class QuestionAdminWindow(ttk.Frame):
             messagebox.showwarning("Advertencia", "Seleccione una respuesta por defecto")
             return
         
-        profile_name = self.profile_combo.get()
-        profiles = self.profile_service.get_all_profiles(active_only=False)
-        profile = next((p for p in profiles if p.name == profile_name), None)
-        
+        self.tasks.submit(
+            'question_admin_save',
+            self._store_prefill,
+            self.profile_combo.get(),
+            self.selected_id,
+            self.default_answer_combo.get(),
+            on_success=self._on_prefill_saved,
+            on_error=lambda e: messagebox.showerror("Error", f"Error al guardar prefill: {str(e)}"),
+            spinner=self.spinner
+        )
+    
+    def _store_prefill(self, profile_name: str, question_id: int, default_answer: str):
+        """Resuelve el perfil por nombre y guarda el prefill (corre fuera del hilo de Tk)."""
+        profile = self.profile_service.get_profile_by_name(profile_name)
         if not profile:
-            messagebox.showerror("Error", "Perfil no encontrado")
-            return
-        
-        try:
-            self.question_service.set_default_answer(
-                profile_id=profile.id,
-                question_id=self.selected_id,
-                default_answer=self.default_answer_combo.get()
-            )
-            messagebox.showinfo("Éxito", "Prefill guardado correctamente")
-            self._load_prefills()
-        except Exception as e:
-            messagebox.showerror("Error", f"Error al guardar prefill: {str(e)}")
+            raise LookupError("Perfil no encontrado")
+        return self.question_service.set_default_answer(
+            profile_id=profile.id,
+            question_id=question_id,
+            default_answer=default_answer
+        )
+    
+    def _on_prefill_saved(self, _result):
+        """Confirma el prefill y recarga la lista de prefills."""
+        messagebox.showinfo("Éxito", "Prefill guardado correctamente")
+        self._load_prefills()
     
     def _edit(self):
         """Habilita edición del elemento seleccionado."""
@@ -375,6 +446,7 @@ class QuestionAdminWindow(ttk.Frame):
         self.penalty_not_graduated_entry.insert(0, "0.0")
         self.active_var.set(True)
         self.selected_id = None
+        self.tasks.cancel('question_admin_select')
         self.tree.selection_remove(self.tree.selection())
         self._load_prefills()
 
@@ -0,0 +1,304 @@
+"""Lista virtualizada de preguntas para el formulario de evaluación."""
+import tkinter as tk
+from bisect import bisect_right
+from itertools import accumulate
+from tkinter import ttk
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+from src.models.question import Question
+
+# Alto estimado de una fila (px) antes de medirla, separación entre filas y
+# filas extra que se mantienen fuera de la vista
+ROW_HEIGHT = 215
+ROW_GAP = 16
+BUFFER_ROWS = 2
+# Ancho que ocupan el borde y el padding de la fila alrededor del texto
+TEXT_MARGIN = 40
+MIN_WRAPLENGTH = 200
+
+
+def row_offsets(heights: Iterable[int]) -> List[int]:
+    """Posición vertical de cada fila; el último elemento es el alto total."""
+    return list(accumulate(heights, initial=0))
+
+
+def visible_range(top: float, height: float, count: int, buffer: int = BUFFER_ROWS,
+                  offsets: Optional[Sequence[int]] = None) -> range:
+    """Índices de preguntas a materializar para la vista ``[top, top + height)``.
+
+    ``offsets`` (ver ``row_offsets``) da la posición de cada fila cuando los
+    altos varían; sin él todas miden ``ROW_HEIGHT``.
+    """
+    if offsets is None:
+        first = int(top) // ROW_HEIGHT
+        last = int(top + height) // ROW_HEIGHT + 1
+    else:
+        first = bisect_right(offsets, top) - 1
+        last = bisect_right(offsets, top + height)
+    first = max(0, first - buffer)
+    last = min(count, last + buffer)
+    return range(first, max(first, last))
+
+
+class QuestionFormModel:
+    """Respuestas y comentarios del formulario, independientes de los widgets."""
+
+    def __init__(self, questions: Iterable[Question], defaults: Optional[Dict[int, str]] = None):
+        defaults = defaults or {}
+        self.questions: List[Question] = list(questions)
+        self.answers: Dict[int, str] = {q.id: defaults.get(q.id, 'NA') for q in self.questions}
+        self.comments: Dict[int, str] = {}
+
+    def comment(self, question_id: int) -> str:
+        """Comentario actual (vacío si no hay)."""
+        return self.comments.get(question_id, '')
+
+
+class QuestionRow(ttk.LabelFrame):
+    """Fila reutilizable: se vuelve a enlazar a otra pregunta al desplazarse."""
+
+    def __init__(self, parent, colors: Dict[str, str], on_answer: Callable[[int, str], None],
+                 on_comment: Callable[[int, str], None]):
+        super().__init__(parent, padding="12", style="Question.TLabelframe")
+        self._on_answer = on_answer
+        self._on_comment = on_comment
+        self.question_id: Optional[int] = None
+
+        self.text_label = ttk.Label(self, style="QuestionText.TLabel", wraplength=900)
+        self.text_label.pack(anchor=tk.W, pady=(0, 8))
+
+        self.answer_var = tk.StringVar(value='NA')
+        answer_frame = ttk.Frame(self, style="QuestionBody.TFrame")
+        answer_frame.pack(fill=tk.X, pady=5)
+        for text, value, padx in (("Sí", "YES", (0, 10)), ("No", "NO", 10), ("N/A", "NA", 10)):
+            ttk.Radiobutton(
+                answer_frame,
+                text=text,
+                variable=self.answer_var,
+                value=value,
+                style="Question.TRadiobutton",
+                command=self._answer_changed
+            ).pack(side=tk.LEFT, padx=padx)
+        self.penalty_label = ttk.Label(answer_frame, style="Penalty.TLabel")
+        self.penalty_label.pack(side=tk.LEFT, padx=10)
+
+        # Campo de comentario (habilitado solo si la respuesta es NO)
+        comment_frame = ttk.Frame(self, style="QuestionBody.TFrame")
+        comment_frame.pack(fill=tk.X, pady=5)
+        ttk.Label(comment_frame, text="Comentario (obligatorio si No):", style="MutedCard.TLabel").pack(anchor=tk.W)
+        self.comment_entry = tk.Text(comment_frame, height=3, width=80, wrap=tk.WORD)
+        self.comment_entry.pack(fill=tk.X, pady=2)
+        self.comment_entry.configure(
+            bg="#f8fafc",
+            relief="flat",
+            font=("Segoe UI", 10),
+            highlightthickness=1,
+            highlightbackground=colors["border"],
+            highlightcolor=colors["accent"],
+            bd=0,
+            padx=8,
+            pady=6,
+            insertbackground="#0f172a"
+        )
+        self.comment_entry.bind("<KeyRelease>", self._comment_changed)
+        self.comment_entry.bind("<FocusOut>", self._comment_changed)
+
+    def set_wraplength(self, wraplength: int) -> None:
+        """Ajusta el ancho al que se corta el texto de la pregunta."""
+        self.text_label.config(wraplength=wraplength)
+
+    def bind_question(self, question: Question, answer: str, comment: str) -> None:
+        """Muestra una pregunta con su respuesta y comentario del modelo."""
+        self.question_id = question.id
+        self.config(text=f"Pregunta #{question.id}")
+        self.text_label.config(text=question.text)
+        self.penalty_label.config(
+            text=f"Penalización Graduado: {question.penalty_graduated} | No Graduado: {question.penalty_not_graduated}"
+        )
+        self.answer_var.set(answer)
+        self.comment_entry.config(state='normal')
+        self.comment_entry.delete('1.0', tk.END)
+        if comment:
+            self.comment_entry.insert('1.0', comment)
+        self._set_comment_enabled(answer == 'NO')
+
+    def _answer_changed(self) -> None:
+        answer = self.answer_var.get()
+        if answer != 'NO':
+            self.comment_entry.config(state='normal')
+            self.comment_entry.delete('1.0', tk.END)
+        self._set_comment_enabled(answer == 'NO')
+        if self.question_id is not None:
+            self._on_answer(self.question_id, answer)
+
+    def _comment_changed(self, _event=None) -> None:
+        if self.question_id is not None:
+            self._on_comment(self.question_id, self.comment_entry.get('1.0', tk.END).strip())
+
+    def _set_comment_enabled(self, enabled: bool) -> None:
+        """Actualiza el estado y colores del campo de comentario."""
+        if enabled:
+            self.comment_entry.config(
+                state='normal',
+                background="#f8fafc",
+                foreground="#0f172a",
+                insertbackground="#0f172a"
+            )
+        else:
+            self.comment_entry.config(
+                state='disabled',
+                background="#f1f5f9",
+                foreground="#94a3b8"
+            )
+
+
+class VirtualQuestionList(ttk.Frame):
+    """Lista de preguntas que solo crea widgets para la parte visible.
+
+    El alto de cada pregunta se mide una vez (según el ancho disponible) y se
+    guarda como desplazamientos acumulados; al desplazarse las filas se
+    reubican y se vuelven a enlazar a otras preguntas del ``QuestionFormModel``,
+    así un área con cientos de preguntas usa la misma cantidad de widgets que
+    una con diez.
+    """
+
+    def __init__(self, parent, colors: Dict[str, str],
+                 on_answer_change: Callable[[int, str], None]):
+        super().__init__(parent, style="Card.TFrame")
+        self.colors = colors
+        self.on_answer_change = on_answer_change
+        self.model: Optional[QuestionFormModel] = None
+        self._rows: List[QuestionRow] = []
+        self._windows: List[int] = []
+        self._bound: List[Optional[int]] = []  # índice de pregunta mostrado por cada fila
+        self._width = 0
+        self._wraplength = 900
+        self._offsets: List[int] = [0]
+        self._text_heights: Dict[str, int] = {}  # alto del texto por pregunta con el ancho actual
+        self._chrome: Optional[int] = None  # alto de la fila sin el texto de la pregunta
+        self._measurer: Optional[QuestionRow] = None
+
+        self.canvas = tk.Canvas(self, highlightthickness=0, bg=colors["card"])
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._yview)
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 5))
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.canvas.bind("<Configure>", self._on_resize)
+        self.canvas.bind("<Enter>", lambda _e: self.canvas.bind_all("<MouseWheel>", self._on_mousewheel))
+        self.canvas.bind("<Leave>", lambda _e: self.canvas.unbind_all("<MouseWheel>"))
+
+    def set_model(self, model: QuestionFormModel) -> None:
+        """Muestra las preguntas del modelo desde el inicio."""
+        self.model = model
+        self._layout()
+        self.canvas.yview_moveto(0)
+        self._refresh()
+
+    def clear(self) -> None:
+        """Vacía la lista (las filas quedan en el pool, ocultas)."""
+        self.model = None
+        self._layout()
+        self._refresh()
+
+    def _row_height(self, question: Question) -> int:
+        """Alto de la fila de ``question`` con el ancho actual (medido una sola vez)."""
+        height = self._text_heights.get(question.text)
+        if height is None:
+            if self._measurer is None:
+                # Fila nunca mostrada: solo se usa para medir
+                self._measurer = QuestionRow(self.canvas, self.colors, lambda *_a: None, lambda *_a: None)
+            label = self._measurer.text_label
+            label.config(text=question.text, wraplength=self._wraplength)
+            if self._chrome is None:
+                self._measurer.update_idletasks()
+                self._chrome = self._measurer.winfo_reqheight() - label.winfo_reqheight()
+            height = self._text_heights[question.text] = label.winfo_reqheight()
+        return self._chrome + height
+
+    def _layout(self) -> None:
+        """Recalcula la posición de cada pregunta y la región de desplazamiento."""
+        questions = self.model.questions if self.model else []
+        self._offsets = row_offsets(self._row_height(q) + ROW_GAP for q in questions)
+        self.canvas.configure(scrollregion=(0, 0, self._width, self._offsets[-1]))
+        # Las filas enlazadas pueden haber cambiado de posición o de alto
+        self._bound = [None] * len(self._rows)
+
+    def _yview(self, *args) -> None:
+        self.canvas.yview(*args)
+        self._refresh()
+
+    def _on_mousewheel(self, event) -> None:
+        self.canvas.yview_scroll(int(-event.delta / 120) or (-1 if event.delta > 0 else 1), "units")
+        self._refresh()
+
+    def _on_resize(self, event) -> None:
+        self._width = event.width
+        for window in self._windows:
+            self.canvas.itemconfigure(window, width=max(event.width - 10, 1))
+        wraplength = max(event.width - TEXT_MARGIN, MIN_WRAPLENGTH)
+        if wraplength != self._wraplength:
+            # El texto se corta distinto: hay que volver a medir
+            self._wraplength = wraplength
+            self._text_heights.clear()
+            for row in self._rows:
+                row.set_wraplength(wraplength)
+            self._layout()
+        else:
+            self.canvas.configure(scrollregion=(0, 0, event.width, self._offsets[-1]))
+        self._refresh()
+
+    def _ensure_pool(self, size: int) -> None:
+        """Crea filas hasta tener ``size`` en el pool."""
+        while len(self._rows) < size:
+            row = QuestionRow(self.canvas, self.colors, self._answer_changed, self._comment_changed)
+            row.set_wraplength(self._wraplength)
+            window = self.canvas.create_window(
+                5, -ROW_HEIGHT, window=row, anchor="nw",
+                width=max(self._width - 10, 1), height=ROW_HEIGHT - ROW_GAP, state="hidden"
+            )
+            self._rows.append(row)
+            self._windows.append(window)
+            self._bound.append(None)
+
+    def _refresh(self) -> None:
+        """Enlaza las filas del pool a las preguntas visibles más el búfer."""
+        count = len(self.model.questions) if self.model else 0
+        height = max(self.canvas.winfo_height(), ROW_HEIGHT)
+        wanted = set(visible_range(self.canvas.canvasy(0), height, count, offsets=self._offsets))
+        self._ensure_pool(len(wanted))
+
+        # Conservar filas que ya muestran una pregunta visible y reciclar el resto
+        free = []
+        for slot, index in enumerate(self._bound):
+            if index in wanted:
+                wanted.discard(index)
+            else:
+                free.append(slot)
+        for index in sorted(wanted):
+            slot = free.pop()
+            question = self.model.questions[index]
+            self._rows[slot].bind_question(
+                question, self.model.answers[question.id], self.model.comment(question.id)
+            )
+            top = self._offsets[index]
+            self.canvas.coords(self._windows[slot], 5, top)
+            self.canvas.itemconfigure(
+                self._windows[slot], height=self._offsets[index + 1] - top - ROW_GAP, state="normal"
+            )
+            self._bound[slot] = index
+        for slot in free:
+            self.canvas.itemconfigure(self._windows[slot], state="hidden")
+            self._bound[slot] = None
+            self._rows[slot].question_id = None
+
+    def _answer_changed(self, question_id: int, answer: str) -> None:
+        self.model.answers[question_id] = answer
+        if answer != 'NO':
+            self.model.comments.pop(question_id, None)
+        self.on_answer_change(question_id, answer)
+
+    def _comment_changed(self, question_id: int, comment: str) -> None:
+        if comment:
+            self.model.comments[question_id] = comment
+        else:
+            self.model.comments.pop(question_id, None)
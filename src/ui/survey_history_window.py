@@ -6,6 +6,7 @@ from src.services.survey_service import SurveyService
 from src.services.case_service import CaseService
 from src.services.question_service import QuestionService
 from src.models.survey import Survey
+from src.ui.task_runner import Spinner, TaskRunner
 
 
 class SurveyHistoryWindow(tk.Toplevel):
@@ -31,13 +32,17 @@ class SurveyHistoryWindow(tk.Toplevel):
         self.colors = colors
         self.history: List[Survey] = []
         self.selected_survey: Optional[Survey] = None
-        self.questions_map = {
-            q.id: q for q in self.question_service.get_all_questions(active_only=False)
-        }
+        self.questions_map: Dict[int, object] = {}
+        self.tasks = TaskRunner(self)
 
         self._build_ui()
         self._load_history()
 
+    def destroy(self):
+        """Cancela la carga pendiente antes de cerrar la ventana."""
+        self.tasks.shutdown()
+        super().destroy()
+
     def _build_ui(self):
         """Crea los widgets principales."""
         header = ttk.Frame(self, style="Header.TFrame", padding="15 15 15 5")
@@ -57,6 +62,8 @@ class SurveyHistoryWindow(tk.Toplevel):
         ttk.Button(
             header, text="Cerrar", command=self.destroy, style="Secondary.TButton"
         ).pack(side=tk.RIGHT)
+        self.spinner = Spinner(header, style="HeaderSubtitle.TLabel")
+        self.spinner.pack(side=tk.RIGHT, padx=10)
 
         main_paned = ttk.PanedWindow(self, orient=tk.HORIZONTAL)
         main_paned.pack(fill=tk.BOTH, expand=True, padx=15, pady=10)
@@ -132,56 +139,68 @@ class SurveyHistoryWindow(tk.Toplevel):
         responses_scroll.pack(side=tk.RIGHT, fill=tk.Y)
 
     def _load_history(self):
-        """Carga las evaluaciones del SID."""
-        try:
-            self.history = self.survey_service.get_history_for_sid(self.sid)
-            for item in self.history_tree.get_children():
-                self.history_tree.delete(item)
-
-            if not self.history:
-                messagebox.showinfo(
-                    "Sin registros",
-                    f"No se encontraron evaluaciones previas para el SID {self.sid}.",
-                )
-                return
-
-            cases = {c.id: c.name for c in self.case_service.get_all_cases(active_only=False)}
-
-            for survey in self.history:
-                fecha = (
-                    survey.created_at.strftime("%Y-%m-%d %H:%M")
-                    if survey.created_at
-                    else "N/A"
-                )
-                case_name = cases.get(survey.case_id, "N/A")
-                graduado = "Sí" if survey.is_graduated else "No"
-                tier = survey.tier_name or "Sin tier"
-                tag = self._get_score_tag(survey.final_score)
-
-                self.history_tree.insert(
-                    "",
-                    tk.END,
-                    values=(
-                        survey.id,
-                        fecha,
-                        case_name,
-                        survey.evaluator_profile,
-                        graduado,
-                        f"{survey.final_score:.2f}",
-                        tier,
-                    ),
-                    tags=(tag,),
-                )
-
-            self.history_tree.tag_configure("low_score", background="#ffe2e5")
-            self.history_tree.tag_configure("medium_score", background="#fff6db")
-            self.history_tree.tag_configure("high_score", background="#e4ffe1")
-
-        except Exception as exc:
-            messagebox.showerror(
+        """Carga en segundo plano las evaluaciones del SID."""
+        self.tasks.submit(
+            'history',
+            self._fetch_history,
+            on_success=self._show_history,
+            on_error=lambda exc: messagebox.showerror(
                 "Error",
                 f"Ocurrió un error al cargar el historial para SID {self.sid}.\n\n{exc}",
+            ),
+            spinner=self.spinner,
+        )
+
+    def _fetch_history(self):
+        """Lee historial, nombres de casos y preguntas (corre fuera del hilo de Tk)."""
+        history = self.survey_service.get_history_for_sid(self.sid)
+        if not history:
+            return history, {}, {}
+        cases = {c.id: c.name for c in self.case_service.get_all_cases(active_only=False)}
+        return history, cases, self.question_service.get_questions_map(active_only=False)
+
+    def _show_history(self, result):
+        """Llena la tabla con el historial leído."""
+        self.history, cases, self.questions_map = result
+        for item in self.history_tree.get_children():
+            self.history_tree.delete(item)
+
+        if not self.history:
+            messagebox.showinfo(
+                "Sin registros",
+                f"No se encontraron evaluaciones previas para el SID {self.sid}.",
+            )
+            return
+
+        for survey in self.history:
+            fecha = (
+                survey.created_at.strftime("%Y-%m-%d %H:%M")
+                if survey.created_at
+                else "N/A"
             )
+            case_name = cases.get(survey.case_id, "N/A")
+            graduado = "Sí" if survey.is_graduated else "No"
+            tier = survey.tier_name or "Sin tier"
+            tag = self._get_score_tag(survey.final_score)
+
+            self.history_tree.insert(
+                "",
+                tk.END,
+                values=(
+                    survey.id,
+                    fecha,
+                    case_name,
+                    survey.evaluator_profile,
+                    graduado,
+                    f"{survey.final_score:.2f}",
+                    tier,
+                ),
+                tags=(tag,),
+            )
+
+        self.history_tree.tag_configure("low_score", background="#ffe2e5")
+        self.history_tree.tag_configure("medium_score", background="#fff6db")
+        self.history_tree.tag_configure("high_score", background="#e4ffe1")
 
     @staticmethod
     def _get_score_tag(score: float) -> str:
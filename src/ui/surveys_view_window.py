@@ -1,16 +1,33 @@
 """Ventana para visualizar todas las encuestas y respuestas."""
 import tkinter as tk
 from tkinter import ttk, messagebox
-from typing import Callable, Dict, Optional
-from datetime import datetime
+from typing import Callable, Dict, Optional, Tuple
+from datetime import datetime, timedelta
+from src.models.survey import SurveyFilters
 from src.services.survey_service import SurveyService
 from src.services.case_service import CaseService
 from src.services.question_service import QuestionService
+from src.services.area_service import AreaService
+from src.services.profile_service import ProfileService
+from src.services.tier_service import TierService
+from src.ui.task_runner import Spinner, TaskRunner
+
+PAGE_SIZE = 200
+
+# Bandas de puntaje: (mínimo inclusivo, máximo exclusivo)
+SCORE_BANDS: Dict[str, Tuple[Optional[float], Optional[float]]] = {
+    "Todos": (None, None),
+    "Bajo (< 60)": (None, 60.0),
+    "Medio (60 - 79.99)": (60.0, 80.0),
+    "Alto (>= 80)": (80.0, None),
+}
 
 
 class SurveysViewWindow(ttk.Frame):
     """Vista incrustada para ver todas las encuestas y sus respuestas."""
     
+    TASK_KEYS = ('surveys_filter_options', 'surveys_area_options', 'surveys_page', 'surveys_detail')
+    
     def __init__(
         self,
         parent,
@@ -19,19 +36,47 @@ class SurveysViewWindow(ttk.Frame):
         question_service: QuestionService,
         colors: Dict[str, str],
         on_back: Callable[[], None],
+        area_service: Optional[AreaService] = None,
+        profile_service: Optional[ProfileService] = None,
+        tier_service: Optional[TierService] = None,
+        task_runner: Optional[TaskRunner] = None,
     ):
         super().__init__(parent, padding="20 20 20 15", style="Main.TFrame")
         self.survey_service = survey_service
         self.case_service = case_service
         self.question_service = question_service
+        self.area_service = area_service or AreaService()
+        self.profile_service = profile_service or ProfileService()
+        self.tier_service = tier_service or TierService()
         self.colors = colors
         self.on_back = on_back
+        self._owns_tasks = task_runner is None
+        self.tasks = task_runner or TaskRunner(self)
         
         self.selected_survey_id: Optional[int] = None
+        self.area_map: Dict[str, int] = {}
+        self.case_map: Dict[str, int] = {}
+        self.tier_map: Dict[str, int] = {}
+        
+        # Estado de paginación (keyset sobre created_at, id)
+        self.current_filters: Optional[SurveyFilters] = None
+        self.page_cursor: Optional[Tuple[datetime, int]] = None
+        self.has_more = False
+        self.loading_page = False
+        self.loaded_count = 0
         
         self._setup_ui()
+        self._load_filter_options()
         self._load_surveys()
     
+    def destroy(self):
+        """Cancela las consultas pendientes de esta vista antes de destruirla."""
+        for key in self.TASK_KEYS:
+            self.tasks.cancel(key)
+        if self._owns_tasks:
+            self.tasks.shutdown()
+        super().destroy()
+    
     def _setup_ui(self):
         """Configura la interfaz."""
         header = ttk.Frame(self, style="Header.TFrame")
@@ -45,6 +90,8 @@ class SurveysViewWindow(ttk.Frame):
             style="HeaderSubtitle.TLabel"
         ).pack(anchor=tk.W)
         
+        self._build_filters()
+        
         main_paned = ttk.PanedWindow(self, orient=tk.HORIZONTAL)
         main_paned.pack(fill=tk.BOTH, expand=True)
         
@@ -73,11 +120,23 @@ class SurveysViewWindow(ttk.Frame):
         self.surveys_tree.column('Puntaje', width=80)
         self.surveys_tree.column('Tier', width=120)
         
-        scrollbar_surveys = ttk.Scrollbar(left_frame, orient=tk.VERTICAL, command=self.surveys_tree.yview)
-        self.surveys_tree.configure(yscrollcommand=scrollbar_surveys.set)
+        status_frame = ttk.Frame(left_frame, style="Card.TFrame")
+        status_frame.pack(side=tk.BOTTOM, fill=tk.X, pady=(6, 0))
+        self.status_label = ttk.Label(status_frame, text="", style="MutedCard.TLabel")
+        self.status_label.pack(side=tk.LEFT)
+        self.spinner = Spinner(status_frame)
+        self.spinner.pack(side=tk.RIGHT)
+        
+        self.scrollbar_surveys = ttk.Scrollbar(left_frame, orient=tk.VERTICAL, command=self.surveys_tree.yview)
+        self.surveys_tree.configure(yscrollcommand=self._on_surveys_scroll)
         
         self.surveys_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar_surveys.pack(side=tk.RIGHT, fill=tk.Y)
+        self.scrollbar_surveys.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        # Configurar tags para colorear según puntaje
+        self.surveys_tree.tag_configure('low_score', background='#ffcccc')  # Rojo claro para < 60
+        self.surveys_tree.tag_configure('medium_score', background='#ffffcc')  # Amarillo claro para 60-79
+        self.surveys_tree.tag_configure('high_score', background='#ccffcc')  # Verde claro para >= 80
         
         self.surveys_tree.bind('<<TreeviewSelect>>', self._on_survey_select)
         
@@ -127,53 +186,229 @@ class SurveysViewWindow(ttk.Frame):
         button_frame.pack(fill=tk.X, pady=10)
         
         ttk.Button(button_frame, text="Actualizar", command=self._load_surveys, style="Accent.TButton").pack(side=tk.LEFT, padx=5)
+        self.more_button = ttk.Button(button_frame, text="Cargar más", command=self._load_next_page, style="Secondary.TButton")
+        self.more_button.pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="Volver al Panel", command=self.on_back, style="Secondary.TButton").pack(side=tk.RIGHT, padx=5)
     
+    def _build_filters(self):
+        """Crea la barra de filtros del listado."""
+        filters_frame = ttk.LabelFrame(self, text="Filtros", padding="10", style="Card.TLabelframe")
+        filters_frame.pack(fill=tk.X, pady=(0, 10))
+        for col in (1, 3, 5, 7):
+            filters_frame.columnconfigure(col, weight=1)
+        
+        ttk.Label(filters_frame, text="Desde (AAAA-MM-DD):", style="LabelCard.TLabel").grid(row=0, column=0, sticky=tk.W, padx=5, pady=3)
+        self.date_from_entry = ttk.Entry(filters_frame, width=12, style="Main.TEntry")
+        self.date_from_entry.grid(row=0, column=1, sticky=tk.EW, padx=5, pady=3)
+        
+        ttk.Label(filters_frame, text="Hasta (AAAA-MM-DD):", style="LabelCard.TLabel").grid(row=0, column=2, sticky=tk.W, padx=5, pady=3)
+        self.date_to_entry = ttk.Entry(filters_frame, width=12, style="Main.TEntry")
+        self.date_to_entry.grid(row=0, column=3, sticky=tk.EW, padx=5, pady=3)
+        
+        ttk.Label(filters_frame, text="Área:", style="LabelCard.TLabel").grid(row=0, column=4, sticky=tk.W, padx=5, pady=3)
+        self.area_filter = ttk.Combobox(filters_frame, state="readonly", width=18, style="Main.TCombobox")
+        self.area_filter.grid(row=0, column=5, sticky=tk.EW, padx=5, pady=3)
+        self.area_filter.bind('<<ComboboxSelected>>', self._on_area_filter_changed)
+        
+        ttk.Label(filters_frame, text="Caso:", style="LabelCard.TLabel").grid(row=0, column=6, sticky=tk.W, padx=5, pady=3)
+        self.case_filter = ttk.Combobox(filters_frame, state="readonly", width=18, style="Main.TCombobox")
+        self.case_filter.grid(row=0, column=7, sticky=tk.EW, padx=5, pady=3)
+        
+        ttk.Label(filters_frame, text="Perfil:", style="LabelCard.TLabel").grid(row=1, column=0, sticky=tk.W, padx=5, pady=3)
+        self.profile_filter = ttk.Combobox(filters_frame, state="readonly", width=18, style="Main.TCombobox")
+        self.profile_filter.grid(row=1, column=1, sticky=tk.EW, padx=5, pady=3)
+        
+        ttk.Label(filters_frame, text="Tier:", style="LabelCard.TLabel").grid(row=1, column=2, sticky=tk.W, padx=5, pady=3)
+        self.tier_filter = ttk.Combobox(filters_frame, state="readonly", width=18, style="Main.TCombobox")
+        self.tier_filter.grid(row=1, column=3, sticky=tk.EW, padx=5, pady=3)
+        
+        ttk.Label(filters_frame, text="Puntaje:", style="LabelCard.TLabel").grid(row=1, column=4, sticky=tk.W, padx=5, pady=3)
+        self.score_filter = ttk.Combobox(filters_frame, state="readonly", values=list(SCORE_BANDS), width=18, style="Main.TCombobox")
+        self.score_filter.grid(row=1, column=5, sticky=tk.EW, padx=5, pady=3)
+        self.score_filter.set("Todos")
+        
+        buttons = ttk.Frame(filters_frame, style="Card.TFrame")
+        buttons.grid(row=1, column=6, columnspan=2, sticky=tk.E, padx=5, pady=3)
+        ttk.Button(buttons, text="Filtrar", command=self._load_surveys, style="Accent.TButton").pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Button(buttons, text="Limpiar", command=self._clear_filters, style="Secondary.TButton").pack(side=tk.LEFT)
+    
+    def _load_filter_options(self):
+        """Carga en segundo plano las opciones de área y perfil de los filtros."""
+        self.tasks.submit(
+            'surveys_filter_options',
+            lambda: (self.area_service.get_all_areas(active_only=False),
+                     self.profile_service.get_all_profiles(active_only=False)),
+            on_success=self._apply_filter_options,
+            on_error=lambda e: messagebox.showerror("Error", f"Error al cargar filtros: {str(e)}"),
+            spinner=self.spinner
+        )
+    
+    def _apply_filter_options(self, result):
+        """Llena los combos de área y perfil."""
+        areas, profiles = result
+        self.area_map = {a.name: a.id for a in areas}
+        self.area_filter['values'] = ["Todas"] + list(self.area_map)
+        self.area_filter.set("Todas")
+        self.profile_filter['values'] = ["Todos"] + [p.name for p in profiles]
+        self.profile_filter.set("Todos")
+        self._on_area_filter_changed()
+    
+    def _on_area_filter_changed(self, event=None):
+        """Actualiza casos y tiers disponibles según el área filtrada."""
+        area_id = self.area_map.get(self.area_filter.get())
+        if area_id is None:
+            self._apply_area_options(([], []))
+            self.tasks.cancel('surveys_area_options')
+            return
+        self.tasks.submit(
+            'surveys_area_options',
+            lambda: (self.case_service.get_all_cases(active_only=False, area_id=area_id),
+                     self.tier_service.get_tiers(area_id=area_id)),
+            on_success=self._apply_area_options,
+            on_error=lambda e: messagebox.showerror("Error", f"Error al cargar filtros: {str(e)}"),
+            spinner=self.spinner,
+            replace=True
+        )
+    
+    def _apply_area_options(self, result):
+        """Llena los combos de caso y tier del área filtrada."""
+        cases, tiers = result
+        self.case_map = {c.name: c.id for c in cases}
+        self.tier_map = {t.name: t.id for t in tiers}
+        self.case_filter['values'] = ["Todos"] + list(self.case_map)
+        self.case_filter.set("Todos")
+        self.tier_filter['values'] = ["Todos"] + list(self.tier_map)
+        self.tier_filter.set("Todos")
+    
+    def _clear_filters(self):
+        """Restablece los filtros y recarga el listado."""
+        self.date_from_entry.delete(0, tk.END)
+        self.date_to_entry.delete(0, tk.END)
+        self.area_filter.set("Todas")
+        self.profile_filter.set("Todos")
+        self.score_filter.set("Todos")
+        self._on_area_filter_changed()
+        self._load_surveys()
+    
+    def _read_filters(self) -> SurveyFilters:
+        """Construye los filtros a partir de los controles."""
+        date_from = self._parse_date(self.date_from_entry.get())
+        date_to = self._parse_date(self.date_to_entry.get())
+        if date_to is not None:
+            # El filtro "hasta" incluye el día completo
+            date_to += timedelta(days=1)
+        min_score, max_score = SCORE_BANDS.get(self.score_filter.get(), (None, None))
+        profile = self.profile_filter.get()
+        return SurveyFilters(
+            date_from=date_from,
+            date_to=date_to,
+            area_id=self.area_map.get(self.area_filter.get()),
+            case_id=self.case_map.get(self.case_filter.get()),
+            evaluator_profile=profile if profile and profile != "Todos" else None,
+            tier_id=self.tier_map.get(self.tier_filter.get()),
+            min_score=min_score,
+            max_score=max_score
+        )
+    
+    @staticmethod
+    def _parse_date(text: str) -> Optional[datetime]:
+        """Convierte AAAA-MM-DD a datetime; vacío equivale a sin filtro."""
+        text = text.strip()
+        if not text:
+            return None
+        try:
+            return datetime.strptime(text, '%Y-%m-%d')
+        except ValueError:
+            raise ValueError(f"Fecha inválida '{text}'. Use el formato AAAA-MM-DD.")
+    
     def _load_surveys(self):
-        """Carga todas las encuestas en la tabla."""
+        """Reinicia el listado con los filtros actuales y carga la primera página."""
+        try:
+            self.current_filters = self._read_filters()
+        except ValueError as e:
+            messagebox.showwarning("Advertencia", str(e))
+            return
+        
         # Limpiar tabla
         for item in self.surveys_tree.get_children():
             self.surveys_tree.delete(item)
-        
-        try:
-            surveys = self.survey_service.get_all_surveys()
-            
-            # Obtener nombres de casos
-            cases = {c.id: c.name for c in self.case_service.get_all_cases(active_only=False)}
+        self.page_cursor = None
+        self.loaded_count = 0
+        self.has_more = True
+        # Una página en curso con los filtros anteriores se descarta
+        self.loading_page = False
+        self._load_next_page(replace=True)
+    
+    def _load_next_page(self, replace: bool = False):
+        """Pide en segundo plano la siguiente página de encuestas."""
+        if self.loading_page or not self.has_more:
+            return
+        self.loading_page = True
+        self._update_status()
+        self.tasks.submit(
+            'surveys_page',
+            self.survey_service.get_survey_page,
+            filters=self.current_filters,
+            after=self.page_cursor,
+            page_size=PAGE_SIZE,
+            on_success=self._append_page,
+            on_error=self._on_page_error,
+            on_done=self._on_page_done,
+            spinner=self.spinner,
+            replace=replace
+        )
+    
+    def _append_page(self, page):
+        """Agrega una página de encuestas a la tabla."""
+        for survey in page:
+            fecha_str = survey.created_at.strftime('%Y-%m-%d %H:%M:%S') if survey.created_at else 'N/A'
+            graduado_str = 'Sí' if survey.is_graduated else 'No'
             
-            # Configurar tags para colorear según puntaje
-            self.surveys_tree.tag_configure('low_score', background='#ffcccc')  # Rojo claro para < 60
-            self.surveys_tree.tag_configure('medium_score', background='#ffffcc')  # Amarillo claro para 60-79
-            self.surveys_tree.tag_configure('high_score', background='#ccffcc')  # Verde claro para >= 80
+            # Determinar tag según puntaje
+            if survey.final_score < 60:
+                tag = 'low_score'
+            elif survey.final_score < 80:
+                tag = 'medium_score'
+            else:
+                tag = 'high_score'
             
-            for survey in surveys:
-                case_name = cases.get(survey.case_id, 'N/A')
-                fecha_str = survey.created_at.strftime('%Y-%m-%d %H:%M:%S') if survey.created_at else 'N/A'
-                graduado_str = 'Sí' if survey.is_graduated else 'No'
-                
-                # Determinar tag según puntaje
-                if survey.final_score < 60:
-                    tag = 'low_score'
-                elif survey.final_score < 80:
-                    tag = 'medium_score'
-                else:
-                    tag = 'high_score'
-                
-                self.surveys_tree.insert('', tk.END, values=(
-                    survey.id,
-                    fecha_str,
-                    survey.evaluator_profile,
-                    survey.sid,
-                    case_name,
-                    graduado_str,
-                    f"{survey.final_score:.2f}",
-                    survey.tier_name or 'Sin tier'
-                ), tags=(tag,))
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Error al cargar encuestas: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            self.surveys_tree.insert('', tk.END, values=(
+                survey.id,
+                fecha_str,
+                survey.evaluator_profile,
+                survey.sid,
+                survey.case_name or 'N/A',
+                graduado_str,
+                f"{survey.final_score:.2f}",
+                survey.tier_name or 'Sin tier'
+            ), tags=(tag,))
+        
+        if page:
+            self.page_cursor = page[-1].cursor
+        self.loaded_count += len(page)
+        self.has_more = len(page) == PAGE_SIZE
+    
+    def _on_page_error(self, error: Exception):
+        """Detiene la paginación y muestra el error."""
+        self.has_more = False
+        messagebox.showerror("Error", f"Error al cargar encuestas: {str(error)}")
+    
+    def _on_page_done(self):
+        """Libera la paginación al terminar una página (con o sin error)."""
+        self.loading_page = False
+        self._update_status()
+    
+    def _update_status(self):
+        """Actualiza el contador de encuestas cargadas."""
+        suffix = " (desplázate para cargar más)" if self.has_more else ""
+        self.status_label.config(text=f"Mostrando {self.loaded_count} encuestas{suffix}")
+        self.more_button.config(state=tk.NORMAL if self.has_more and not self.loading_page else tk.DISABLED)
+    
+    def _on_surveys_scroll(self, first: str, last: str):
+        """Sincroniza la barra y pide otra página al acercarse al final."""
+        self.scrollbar_surveys.set(first, last)
+        if self.has_more and not self.loading_page and float(last) >= 0.9:
+            self.after_idle(self._load_next_page)
     
     def _on_survey_select(self, event):
         """Maneja la selección de una encuesta."""
@@ -185,31 +420,39 @@ class SurveysViewWindow(ttk.Frame):
         survey_id = item['values'][0]
         self.selected_survey_id = survey_id
         
-        try:
-            survey = self.survey_service.get_survey(survey_id)
-            if not survey:
-                messagebox.showerror("Error", "Encuesta no encontrada")
-                return
-            
-            # Mostrar información de la encuesta
-            self._show_survey_info(survey)
-            
-            # Mostrar respuestas
-            self._show_responses(survey)
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Error al cargar detalles: {str(e)}")
-            import traceback
-            traceback.print_exc()
+        # Solo importa la última selección: las anteriores en curso se descartan
+        self.tasks.submit(
+            'surveys_detail',
+            self._fetch_survey_detail,
+            survey_id,
+            on_success=self._show_survey_detail,
+            on_error=lambda e: messagebox.showerror("Error", f"Error al cargar detalles: {str(e)}"),
+            spinner=self.spinner,
+            replace=True
+        )
+    
+    def _fetch_survey_detail(self, survey_id: int):
+        """Lee encuesta, nombre del caso y textos de preguntas (corre fuera del hilo de Tk)."""
+        survey = self.survey_service.get_survey(survey_id)
+        if not survey:
+            return None
+        case = self.case_service.get_case(survey.case_id)
+        return survey, (case.name if case else 'N/A'), self.question_service.get_questions_map(active_only=False)
+    
+    def _show_survey_detail(self, detail):
+        """Muestra el detalle leído en segundo plano."""
+        if detail is None:
+            messagebox.showerror("Error", "Encuesta no encontrada")
+            return
+        survey, case_name, questions_map = detail
+        self._show_survey_info(survey, case_name)
+        self._show_responses(survey, questions_map)
     
-    def _show_survey_info(self, survey):
+    def _show_survey_info(self, survey, case_name: str):
         """Muestra la información de la encuesta seleccionada."""
         self.info_text.config(state=tk.NORMAL)
         self.info_text.delete('1.0', tk.END)
         
-        case = self.case_service.get_case(survey.case_id)
-        case_name = case.name if case else 'N/A'
-        
         fecha_str = survey.created_at.strftime('%Y-%m-%d %H:%M:%S') if survey.created_at else 'N/A'
         
         tier_label = survey.tier_name or 'No definido'
@@ -227,17 +470,13 @@ Total de Respuestas: {len(survey.responses)}
         self.info_text.insert('1.0', info)
         self.info_text.config(state=tk.DISABLED)
     
-    def _show_responses(self, survey):
+    def _show_responses(self, survey, questions_map: Dict[int, object]):
         """Muestra las respuestas de la encuesta seleccionada."""
         # Limpiar tabla
         for item in self.responses_tree.get_children():
             self.responses_tree.delete(item)
         
         try:
-            # Obtener todas las preguntas para mostrar el texto
-            questions = self.question_service.get_all_questions(active_only=False)
-            questions_map = {q.id: q for q in questions}
-            
             for response in survey.responses:
                 question = questions_map.get(response.question_id)
                 question_text = question.text if question else f"Pregunta ID: {response.question_id}"
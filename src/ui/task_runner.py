@@ -0,0 +1,215 @@
+"""Ejecución de tareas en segundo plano para la interfaz Tkinter."""
+import queue
+import threading
+import traceback
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import ttk
+from typing import Any, Callable, Dict, Hashable, Optional
+
+# Intervalo de sondeo de resultados desde el hilo de Tk
+POLL_INTERVAL_MS = 30
+
+
+class Spinner(ttk.Label):
+    """Indicador de carga animado; admite varios ``start`` anidados."""
+
+    FRAMES = ("◐", "◓", "◑", "◒")
+
+    def __init__(self, parent, text: str = "Cargando...", style: str = "MutedCard.TLabel"):
+        super().__init__(parent, text="", style=style)
+        self._text = text
+        self._active = 0
+        self._frame = 0
+        self._job = None
+
+    def start(self) -> None:
+        """Muestra y anima el indicador."""
+        self._active += 1
+        if self._active == 1:
+            self._animate()
+
+    def stop(self) -> None:
+        """Detiene el indicador cuando termina la última tarea que lo usa."""
+        self._active = max(0, self._active - 1)
+        if self._active == 0:
+            if self._job is not None:
+                self.after_cancel(self._job)
+                self._job = None
+            self.config(text="")
+
+    def _animate(self) -> None:
+        self.config(text=f"{self.FRAMES[self._frame]} {self._text}")
+        self._frame = (self._frame + 1) % len(self.FRAMES)
+        self._job = self.after(120, self._animate)
+
+
+class TaskHandle:
+    """Referencia a una tarea enviada a ``TaskRunner``."""
+
+    def __init__(self, key: Hashable, on_success, on_error, on_done, spinner: Optional[Spinner]):
+        self.key = key
+        self.on_success = on_success
+        self.on_error = on_error
+        self.on_done = on_done
+        self.spinner = spinner
+        self._cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        """Descarta el resultado; si aún no empezó, la tarea no se ejecuta."""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+
+class TaskRunner:
+    """Ejecuta llamadas bloqueantes en un pool de hilos y entrega el resultado en el hilo de Tk.
+
+    Tk no es seguro entre hilos: los trabajadores solo dejan el resultado en
+    una cola y un ``after`` del hilo principal la vacía y llama a los callbacks.
+    Las tareas se identifican por ``key``: enviar una clave que ya está en
+    curso devuelve la misma tarea (sin duplicar la consulta), salvo que se pida
+    ``replace=True``, que cancela la anterior y deja ganar a la más reciente.
+    """
+
+    def __init__(self, widget: tk.Misc, max_workers: int = 4):
+        self._widget = widget
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ui-task")
+        self._results: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._inflight: Dict[Hashable, TaskHandle] = {}
+        self._poll_job = None
+        self._closed = False
+
+    def submit(self, key: Hashable, func: Callable[..., Any], *args,
+               on_success: Optional[Callable[[Any], None]] = None,
+               on_error: Optional[Callable[[Exception], None]] = None,
+               on_done: Optional[Callable[[], None]] = None,
+               spinner: Optional[Spinner] = None,
+               replace: bool = False, **kwargs) -> TaskHandle:
+        """Ejecuta ``func(*args, **kwargs)`` en segundo plano.
+
+        ``on_success``/``on_error`` reciben el resultado o la excepción y
+        ``on_done`` se llama siempre al terminar; todos corren en el hilo de Tk
+        y no se llaman si la tarea fue cancelada.
+        """
+        if self._closed:
+            raise RuntimeError("El ejecutor de tareas está cerrado")
+        existing = self._inflight.get(key)
+        if existing is not None:
+            if not replace:
+                return existing
+            self._release(existing)
+            existing.cancel()
+
+        handle = TaskHandle(key, on_success, on_error, on_done, spinner)
+        self._inflight[key] = handle
+        if spinner is not None:
+            spinner.start()
+        self._executor.submit(self._run, handle, func, args, kwargs)
+        self._schedule_poll()
+        return handle
+
+    def call_in_ui(self, func: Callable[..., Any], *args) -> None:
+        """Programa ``func(*args)`` en el hilo de Tk desde un hilo trabajador.
+
+        Solo se entrega mientras haya una tarea de este ejecutor en curso (p. ej.
+        para informar progreso desde la propia tarea): el sondeo de la cola se
+        detiene cuando no quedan tareas y ``after`` no puede llamarse fuera del
+        hilo de Tk.
+        """
+        self._results.put((None, func, args))
+
+    def _run(self, handle: TaskHandle, func, args, kwargs) -> None:
+        """Cuerpo del hilo trabajador."""
+        if handle.cancelled:
+            self._results.put((handle, None, None))
+            return
+        try:
+            result = func(*args, **kwargs)
+        except Exception as exc:
+            self._results.put((handle, None, exc))
+        else:
+            self._results.put((handle, result, None))
+
+    def _schedule_poll(self) -> None:
+        if self._poll_job is None and not self._closed:
+            try:
+                self._poll_job = self._widget.after(POLL_INTERVAL_MS, self._poll)
+            except tk.TclError:
+                # La ventana ya no existe
+                self.shutdown()
+
+    def _poll(self) -> None:
+        """Vacía la cola de resultados en el hilo de Tk."""
+        self._poll_job = None
+        try:
+            while True:
+                try:
+                    handle, result, error = self._results.get_nowait()
+                except queue.Empty:
+                    break
+                # Un callback que falla no debe dejar sin entregar al resto
+                try:
+                    if handle is None:
+                        # Llamada programada con call_in_ui
+                        result(*error)
+                    else:
+                        self._finish(handle, result, error)
+                except Exception:
+                    traceback.print_exc()
+        finally:
+            if self._inflight or not self._results.empty():
+                self._schedule_poll()
+
+    def _release(self, handle: TaskHandle) -> None:
+        """Quita la tarea de las pendientes y detiene su indicador."""
+        if self._inflight.get(handle.key) is handle:
+            del self._inflight[handle.key]
+        if handle.spinner is not None:
+            handle.spinner.stop()
+            handle.spinner = None
+
+    def _finish(self, handle: TaskHandle, result, error: Optional[Exception]) -> None:
+        self._release(handle)
+        if handle.cancelled or self._closed:
+            return
+        try:
+            if error is not None:
+                if handle.on_error is not None:
+                    handle.on_error(error)
+                else:
+                    traceback.print_exception(type(error), error, error.__traceback__)
+            elif handle.on_success is not None:
+                handle.on_success(result)
+        finally:
+            if handle.on_done is not None:
+                handle.on_done()
+
+    def is_running(self, key: Hashable) -> bool:
+        """Indica si hay una tarea en curso con esa clave."""
+        return key in self._inflight
+
+    def cancel(self, key: Hashable) -> None:
+        """Cancela la tarea en curso con esa clave, si existe."""
+        handle = self._inflight.get(key)
+        if handle is not None:
+            self._release(handle)
+            handle.cancel()
+
+    def shutdown(self) -> None:
+        """Cancela todo lo pendiente y libera los hilos sin esperar."""
+        if self._closed:
+            return
+        self._closed = True
+        for handle in list(self._inflight.values()):
+            handle.cancel()
+        self._inflight.clear()
+        if self._poll_job is not None:
+            try:
+                self._widget.after_cancel(self._poll_job)
+            except tk.TclError:
+                pass
+            self._poll_job = None
+        self._executor.shutdown(wait=False)
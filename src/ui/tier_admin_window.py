@@ -4,11 +4,14 @@ from tkinter import ttk, messagebox, colorchooser
 from typing import Callable, Dict, Optional
 from src.services.tier_service import TierService
 from src.services.area_service import AreaService
+from src.ui.task_runner import Spinner, TaskRunner
 
 
 class TierAdminWindow(ttk.Frame):
     """Vista incrustada para crear y administrar tiers por área."""
     
+    TASK_KEYS = ('tier_admin_areas', 'tier_admin_list', 'tier_admin_select', 'tier_admin_save')
+    
     def __init__(
         self,
         parent,
@@ -16,12 +19,15 @@ class TierAdminWindow(ttk.Frame):
         area_service: AreaService,
         colors: Dict[str, str],
         on_back: Callable[[], None],
+        task_runner: Optional[TaskRunner] = None,
     ):
         super().__init__(parent, padding="20 20 20 15", style="Main.TFrame")
         self.tier_service = tier_service
         self.area_service = area_service
         self.colors = colors
         self.on_back = on_back
+        self._owns_tasks = task_runner is None
+        self.tasks = task_runner or TaskRunner(self)
         
         self.selected_tier_id: Optional[int] = None
         self.area_map = {}
@@ -29,12 +35,22 @@ class TierAdminWindow(ttk.Frame):
         self._setup_ui()
         self._load_areas()
     
+    def destroy(self):
+        """Cancela las consultas pendientes de esta vista antes de destruirla."""
+        for key in self.TASK_KEYS:
+            self.tasks.cancel(key)
+        if self._owns_tasks:
+            self.tasks.shutdown()
+        super().destroy()
+    
     def _setup_ui(self):
         """Configura la interfaz."""
         header = ttk.Frame(self, style="Header.TFrame")
         header.pack(fill=tk.X, pady=(0, 15))
         
         ttk.Button(header, text="< Volver al Panel", command=self.on_back, style="Secondary.TButton").pack(side=tk.LEFT)
+        self.spinner = Spinner(header, style="HeaderSubtitle.TLabel")
+        self.spinner.pack(side=tk.RIGHT, padx=10)
         ttk.Label(header, text="Administración de Tiers", style="HeaderTitle.TLabel").pack(anchor=tk.W, pady=(8, 0))
         ttk.Label(
             header,
@@ -137,8 +153,19 @@ class TierAdminWindow(ttk.Frame):
         self.tree.bind('<<TreeviewSelect>>', self._on_select)
     
     def _load_areas(self):
-        """Carga las áreas en el combo."""
-        areas = self.area_service.get_all_areas(active_only=False)
+        """Carga en segundo plano las áreas del combo."""
+        self.tasks.submit(
+            'tier_admin_areas',
+            self.area_service.get_all_areas,
+            active_only=False,
+            on_success=self._show_areas,
+            on_error=lambda e: messagebox.showerror("Error", f"Error al cargar áreas: {str(e)}"),
+            spinner=self.spinner,
+            replace=True
+        )
+    
+    def _show_areas(self, areas):
+        """Llena el combo de áreas y carga los tiers de la primera."""
         self.area_map = {area.name: area.id for area in areas}
         area_names = list(self.area_map.keys())
         self.area_combo['values'] = area_names
@@ -154,15 +181,30 @@ class TierAdminWindow(ttk.Frame):
         return self.area_map.get(area_name)
     
     def _load_tiers(self):
-        """Carga los tiers del área seleccionada."""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
+        """Carga en segundo plano los tiers del área seleccionada."""
         area_id = self._get_selected_area_id()
         if not area_id:
+            self.tasks.cancel('tier_admin_list')
+            self._show_tiers([])
             return
         
-        tiers = self.tier_service.get_tiers(area_id=area_id, active_only=False)
+        # Al cambiar de área solo importa la última consulta
+        self.tasks.submit(
+            'tier_admin_list',
+            self.tier_service.get_tiers,
+            area_id=area_id,
+            active_only=False,
+            on_success=self._show_tiers,
+            on_error=lambda e: messagebox.showerror("Error", f"Error al cargar tiers: {str(e)}"),
+            spinner=self.spinner,
+            replace=True
+        )
+    
+    def _show_tiers(self, tiers):
+        """Llena la lista con los tiers leídos."""
+        for item in self.tree.get_children():
+            self.tree.delete(item)
+        
         for tier in tiers:
             rango = f"{tier.min_score:.2f} - {tier.max_score:.2f}"
             self.tree.insert(
@@ -212,16 +254,31 @@ class TierAdminWindow(ttk.Frame):
         
         return area_id, name, min_score, max_score, description, color, active
     
+    def _save(self, func: Callable, *args, success: str):
+        """Ejecuta una escritura en segundo plano; un doble clic no la repite."""
+        self.tasks.submit(
+            'tier_admin_save',
+            func,
+            *args,
+            on_success=lambda _result: self._on_saved(success),
+            on_error=lambda e: messagebox.showerror("Error", str(e)),
+            spinner=self.spinner
+        )
+    
+    def _on_saved(self, message: str):
+        """Confirma la escritura y recarga la lista."""
+        messagebox.showinfo("Éxito", message)
+        self._clear_form()
+        self._load_tiers()
+    
     def _create(self):
         """Crea un nuevo tier."""
         try:
             data = self._read_form()
-            self.tier_service.create_tier(*data)
-            messagebox.showinfo("Éxito", "Tier creado correctamente")
-            self._clear_form()
-            self._load_tiers()
-        except Exception as exc:
+        except ValueError as exc:
             messagebox.showerror("Error", str(exc))
+            return
+        self._save(self.tier_service.create_tier, *data, success="Tier creado correctamente")
     
     def _update(self):
         """Actualiza el tier seleccionado."""
@@ -230,12 +287,11 @@ class TierAdminWindow(ttk.Frame):
             return
         try:
             data = self._read_form()
-            self.tier_service.update_tier(self.selected_tier_id, *data)
-            messagebox.showinfo("Éxito", "Tier actualizado correctamente")
-            self._clear_form()
-            self._load_tiers()
-        except Exception as exc:
+        except ValueError as exc:
             messagebox.showerror("Error", str(exc))
+            return
+        self._save(self.tier_service.update_tier, self.selected_tier_id, *data,
+                   success="Tier actualizado correctamente")
     
     def _delete(self):
         """Desactiva el tier seleccionado."""
@@ -243,22 +299,28 @@ class TierAdminWindow(ttk.Frame):
             messagebox.showwarning("Advertencia", "Seleccione un tier para eliminar")
             return
         if messagebox.askyesno("Confirmar", "¿Desea desactivar este tier?"):
-            try:
-                self.tier_service.delete_tier(self.selected_tier_id)
-                messagebox.showinfo("Éxito", "Tier desactivado correctamente")
-                self._clear_form()
-                self._load_tiers()
-            except Exception as exc:
-                messagebox.showerror("Error", str(exc))
+            self._save(self.tier_service.delete_tier, self.selected_tier_id,
+                       success="Tier desactivado correctamente")
     
     def _on_select(self, event):
-        """Llena el formulario con el tier seleccionado."""
+        """Lee en segundo plano el tier seleccionado."""
         selection = self.tree.selection()
         if not selection:
             return
         item = self.tree.item(selection[0])
-        tier_id = item['values'][0]
-        tier = self.tier_service.get_tier(tier_id)
+        # Solo importa la última selección
+        self.tasks.submit(
+            'tier_admin_select',
+            self.tier_service.get_tier,
+            item['values'][0],
+            on_success=self._fill_form,
+            on_error=lambda e: messagebox.showerror("Error", f"Error al cargar el tier: {str(e)}"),
+            spinner=self.spinner,
+            replace=True
+        )
+    
+    def _fill_form(self, tier):
+        """Llena el formulario con el tier leído."""
         if not tier:
             return
         self.selected_tier_id = tier.id
@@ -285,5 +347,6 @@ class TierAdminWindow(ttk.Frame):
         self.description_text.delete('1.0', tk.END)
         self.color_entry.delete(0, tk.END)
         self.active_var.set(True)
+        self.tasks.cancel('tier_admin_select')
         self.tree.selection_remove(self.tree.selection())
 
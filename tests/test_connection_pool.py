@@ -0,0 +1,105 @@
+"""Tests para el pool de conexiones."""
+import threading
+import time
+import unittest
+from src.core.connection_pool import ConnectionPool, PoolTimeoutError
+
+
+class FakeCursor:
+    """Cursor mínimo para simular el health check."""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def execute(self, query, params=()):
+        if self.connection.broken:
+            raise RuntimeError("08S01", "Conexión perdida")
+
+    def fetchone(self):
+        return (1,)
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    """Conexión simulada que registra si fue cerrada."""
+
+    def __init__(self):
+        self.closed = False
+        self.broken = False
+        self.rollbacks = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+class TestConnectionPool(unittest.TestCase):
+    """Tests para ConnectionPool."""
+
+    def test_reuses_released_connection(self):
+        """Test que una conexión devuelta se reutiliza."""
+        pool = ConnectionPool(FakeConnection, min_size=0, max_size=2)
+        conn = pool.acquire()
+        pool.release(conn)
+        self.assertIs(pool.acquire(), conn)
+        self.assertEqual(pool.stats()['created'], 1)
+        self.assertEqual(conn.rollbacks, 1)
+
+    def test_timeout_when_exhausted(self):
+        """Test que se lanza PoolTimeoutError al agotar el pool."""
+        pool = ConnectionPool(FakeConnection, min_size=0, max_size=1, timeout=0.05)
+        pool.acquire()
+        with self.assertRaises(PoolTimeoutError):
+            pool.acquire()
+
+    def test_waiter_receives_released_connection(self):
+        """Test que un hilo en espera recibe la conexión liberada."""
+        pool = ConnectionPool(FakeConnection, min_size=0, max_size=1, timeout=2)
+        conn = pool.acquire()
+        received = []
+        waiter = threading.Thread(target=lambda: received.append(pool.acquire()))
+        waiter.start()
+        time.sleep(0.05)
+        pool.release(conn)
+        waiter.join(1)
+        self.assertEqual(received, [conn])
+
+    def test_health_check_discards_broken_connection(self):
+        """Test que una conexión rota se reemplaza al entregarla."""
+        pool = ConnectionPool(FakeConnection, min_size=0, max_size=1, health_check_after=0)
+        conn = pool.acquire()
+        pool.release(conn)
+        conn.broken = True
+        fresh = pool.acquire()
+        self.assertIsNot(fresh, conn)
+        self.assertTrue(conn.closed)
+
+    def test_idle_eviction_keeps_min_size(self):
+        """Test que las conexiones ociosas se cierran respetando el mínimo."""
+        pool = ConnectionPool(FakeConnection, min_size=1, max_size=3, idle_timeout=0)
+        first, second = pool.acquire(), pool.acquire()
+        pool.release(first)
+        pool.release(second)
+        stats = pool.stats()
+        self.assertEqual(stats['size'], 1)
+        self.assertEqual(stats['evicted'], 1)
+
+    def test_connection_error_discards(self):
+        """Test que un error de conexión (SQLSTATE 08xxx) descarta la conexión."""
+        pool = ConnectionPool(FakeConnection, min_size=0, max_size=1)
+        with self.assertRaises(RuntimeError):
+            with pool.connection() as conn:
+                raise RuntimeError("08S01", "Enlace de comunicación fallido")
+        self.assertTrue(conn.closed)
+        self.assertEqual(pool.stats()['size'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
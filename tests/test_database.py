@@ -0,0 +1,357 @@
+"""Tests para DatabaseConnection sin servidor (pool con conexiones simuladas)."""
+import io
+import re
+import threading
+import unittest
+from contextlib import contextmanager, redirect_stderr
+from datetime import datetime
+from src.core.audit_sink import AUDIT_COLUMNS, AuditSink
+from src.core.connection_pool import ConnectionPool
+from src.core.database import DatabaseConnection
+
+
+class FakeCursor:
+    """Cursor que registra las sentencias en su conexión."""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.fast_executemany = False
+        self._result = None
+
+    def execute(self, query, params=()):
+        self.connection.statements.append(query.strip())
+        if query.startswith("IF @@TRANCOUNT"):
+            self._result = (1 if self.connection.pending else 0,)
+        elif query.startswith("MERGE"):
+            # Simula que SQL Server devuelve el OUTPUT en orden inverso
+            ordinals = [int(o) for o in re.findall(r"\?, (\d+)\)", query)]
+            self._result = [(o, 100 + o) for o in reversed(ordinals)]
+            self.connection.pending = True
+        elif "OUTPUT INSERTED.id" in query:
+            self._result = (len(self.connection.statements),)
+            self.connection.pending = True
+        else:
+            self.connection.pending = True
+            self._result = None
+        return self
+
+    def executemany(self, query, params_seq):
+        self.connection.statements.append(query.strip())
+        self.connection.batches.append(list(params_seq))
+        self.connection.pending = True
+
+    def fetchone(self):
+        return self._result
+
+    def fetchall(self):
+        return self._result
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    """Conexión simulada que cuenta commits y rollbacks."""
+
+    def __init__(self):
+        self.statements = []
+        self.batches = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.pending = False
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+        self.pending = False
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.pending = False
+
+    def close(self):
+        pass
+
+
+class TestDatabaseTransactions(unittest.TestCase):
+    """Tests para DatabaseConnection.transaction."""
+
+    def setUp(self):
+        """Instala un pool de una sola conexión simulada."""
+        self.conn = FakeConnection()
+        DatabaseConnection.configure('sqlserver')
+        DatabaseConnection._pool = ConnectionPool(lambda: self.conn, min_size=0, max_size=1)
+        self.db = DatabaseConnection()
+
+    def tearDown(self):
+        DatabaseConnection._pool = None
+        DatabaseConnection.configure()
+
+    def test_execute_commits_outside_transaction(self):
+        """Test que cada execute fuera de una transacción confirma."""
+        self.db.execute("UPDATE areas SET active = 0 WHERE id = ?", (1,))
+        self.db.execute("UPDATE areas SET active = 0 WHERE id = ?", (2,))
+        self.assertEqual(self.conn.commits, 2)
+
+    def test_transaction_commits_once(self):
+        """Test que un bloque transaccional confirma una sola vez."""
+        with self.db.transaction():
+            self.db.execute("UPDATE areas SET active = 0 WHERE id = ?", (1,))
+            self.db.execute_many("INSERT INTO t (a) VALUES (?)", [(1,), (2,)])
+        self.assertEqual(self.conn.commits, 1)
+        self.assertEqual(self.conn.batches, [[(1,), (2,)]])
+
+    def test_transaction_rolls_back_on_error(self):
+        """Test que una excepción revierte el bloque completo."""
+        with self.assertRaises(ValueError):
+            with self.db.transaction():
+                self.db.execute("UPDATE areas SET active = 0 WHERE id = ?", (1,))
+                raise ValueError("fallo")
+        self.assertEqual(self.conn.commits, 0)
+        self.assertGreaterEqual(self.conn.rollbacks, 1)
+        self.assertFalse(self.db.in_transaction())
+
+    def test_nested_transaction_uses_savepoint(self):
+        """Test que un bloque anidado que falla solo revierte hasta su savepoint."""
+        with self.db.transaction():
+            self.db.execute("UPDATE areas SET active = 0 WHERE id = ?", (1,))
+            try:
+                with self.db.transaction():
+                    self.db.execute("UPDATE areas SET active = 0 WHERE id = ?", (2,))
+                    raise ValueError("fallo interno")
+            except ValueError:
+                pass
+        self.assertIn("ROLLBACK TRANSACTION sp_1", self.conn.statements)
+        self.assertEqual(self.conn.commits, 1)
+
+
+class TestDatabaseInserts(unittest.TestCase):
+    """Tests para insert e insert_many."""
+
+    def setUp(self):
+        """Instala un pool de una sola conexión simulada."""
+        self.conn = FakeConnection()
+        DatabaseConnection.configure('sqlserver')
+        DatabaseConnection._pool = ConnectionPool(lambda: self.conn, min_size=0, max_size=1)
+        self.db = DatabaseConnection()
+
+    def tearDown(self):
+        DatabaseConnection._pool = None
+        DatabaseConnection.configure()
+
+    def test_insert_returns_id_in_one_statement(self):
+        """Test que insert obtiene el ID sin una segunda consulta."""
+        new_id = self.db.insert("INSERT INTO areas (name) OUTPUT INSERTED.id VALUES (?)", ("A",))
+        self.assertEqual(new_id, 1)
+        self.assertEqual(len(self.conn.statements), 1)
+        self.assertEqual(self.conn.commits, 1)
+
+    def test_insert_many_preserves_order(self):
+        """Test que insert_many retorna los IDs en el orden de las filas."""
+        ids = self.db.insert_many('areas', ('name', 'active'), [("A", 1), ("B", 1), ("C", 0)])
+        self.assertEqual(ids, [100, 101, 102])
+        self.assertEqual(self.conn.commits, 1)
+
+    def test_insert_many_chunks_by_parameter_limit(self):
+        """Test que insert_many divide en lotes bajo el límite de parámetros."""
+        rows = [(i, i) for i in range(2500)]
+        ids = self.db.insert_many('t', ('a', 'b'), rows)
+        self.assertEqual(len(ids), 2500)
+        self.assertEqual(sum(1 for st in self.conn.statements if st.startswith("MERGE")), 3)
+
+
+
+class BlockingAuditDatabase:
+    """Base de datos simulada cuya escritura queda bloqueada hasta ``release``."""
+
+    def __init__(self):
+        self.entered = threading.Event()
+        self.release = threading.Event()
+        self.rows = 0
+
+    def in_transaction(self):
+        return False
+
+    @contextmanager
+    def transaction(self):
+        self.entered.set()
+        self.release.wait(2)
+        yield
+
+    def execute(self, query, params=()):
+        self.rows += len(params) // len(AUDIT_COLUMNS)
+
+
+class DownAuditDatabase:
+    """Base de datos simulada caída: cada INSERT falla y se anota qué entradas intentó."""
+
+    def __init__(self):
+        self.attempts = {}
+
+    def in_transaction(self):
+        return False
+
+    @contextmanager
+    def transaction(self):
+        yield
+
+    def execute(self, query, params=()):
+        width = len(AUDIT_COLUMNS)
+        for entity_id in params[1::width]:
+            self.attempts[entity_id] = self.attempts.get(entity_id, 0) + 1
+        raise ConnectionError("servidor no disponible")
+
+
+class FlakyAuditDatabase:
+    """Base de datos simulada cuya primera escritura falla (p. ej. conexión reiniciada)."""
+
+    def __init__(self):
+        self.failed_at = None
+        self.failure = threading.Event()
+        self.rows = []
+
+    def in_transaction(self):
+        return False
+
+    @contextmanager
+    def transaction(self):
+        if self.failed_at is None:
+            self.failed_at = datetime.utcnow()
+            self.failure.set()
+            raise ConnectionError("conexión reiniciada")
+        yield
+
+    def execute(self, query, params=()):
+        width = len(AUDIT_COLUMNS)
+        self.rows.extend(tuple(params[i:i + width]) for i in range(0, len(params), width))
+
+
+class TestAuditSink(unittest.TestCase):
+    """Tests para la escritura de auditoría en lotes."""
+
+    def setUp(self):
+        """Instala un pool de una sola conexión simulada."""
+        self.conn = FakeConnection()
+        DatabaseConnection.configure('sqlserver')
+        DatabaseConnection._pool = ConnectionPool(lambda: self.conn, min_size=0, max_size=1)
+        self.db = DatabaseConnection()
+
+    def tearDown(self):
+        DatabaseConnection._pool = None
+        DatabaseConnection.configure()
+
+    def _audit_inserts(self):
+        return [s for s in self.conn.statements if s.startswith("INSERT INTO audit_log")]
+
+    def test_entries_are_batched_in_one_insert(self):
+        """Test que varias entradas se escriben con un solo INSERT multi-fila."""
+        sink = AuditSink(db_factory=lambda: self.db, batch_size=50, flush_interval=60)
+        for area_id in range(3):
+            sink.record('Area', area_id, 'UPDATE', db=self.db)
+        self.assertTrue(sink.flush(timeout=2))
+        sink.shutdown()
+        inserts = self._audit_inserts()
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(inserts[0].count("(?, ?, ?, ?, ?, ?)"), 3)
+        self.assertEqual(sink.stats()['flushed'], 3)
+
+    def test_rolled_back_transaction_discards_entries(self):
+        """Test que solo se encolan las entradas de transacciones confirmadas."""
+        sink = AuditSink(db_factory=lambda: self.db, flush_interval=60)
+        with self.assertRaises(ValueError):
+            with self.db.transaction():
+                sink.record('Area', 1, 'DELETE', db=self.db)
+                raise ValueError("fallo")
+        with self.db.transaction():
+            sink.record('Area', 2, 'DELETE', db=self.db)
+            self.assertEqual(sink.stats()['queued'], 0)
+        sink.flush(timeout=2)
+        sink.shutdown()
+        self.assertEqual(sink.stats()['flushed'], 1)
+        self.assertEqual(len(self._audit_inserts()), 1)
+
+    def test_synchronous_mode_writes_inside_transaction(self):
+        """Test que el modo síncrono inserta en el momento, sin hilo escritor."""
+        sink = AuditSink(db_factory=lambda: self.db, synchronous=True)
+        with self.db.transaction():
+            sink.record('Area', 1, 'CREATE', db=self.db)
+            self.assertEqual(len(self._audit_inserts()), 1)
+        self.assertEqual(self.conn.commits, 1)
+        self.assertIsNone(sink._thread)
+
+    def test_full_queue_drops_after_timeout(self):
+        """Test que con la cola llena se espera ``queue_timeout`` y luego se descarta."""
+        db = BlockingAuditDatabase()
+        sink = AuditSink(db_factory=lambda: db, batch_size=1, max_queue=1, queue_timeout=0.01)
+        sink.record('Area', 1, 'CREATE')
+        self.assertTrue(db.entered.wait(2))
+        sink.record('Area', 2, 'CREATE')
+        sink.record('Area', 3, 'CREATE')
+        db.release.set()
+        self.assertTrue(sink.flush(timeout=2))
+        sink.shutdown()
+        self.assertEqual(sink.stats(), {'queued': 2, 'flushed': 2, 'dropped': 1, 'failed': 0, 'pending': 0})
+        self.assertEqual(db.rows, 2)
+
+    def test_failed_batch_is_retried_ahead_of_new_entries(self):
+        """Test que un lote que falla una vez se reintenta antes que las entradas nuevas."""
+        db = FlakyAuditDatabase()
+        sink = AuditSink(db_factory=lambda: db, batch_size=1, retry_backoff=0.05)
+        with redirect_stderr(io.StringIO()):
+            sink.record('Area', 1, 'CREATE')
+            self.assertTrue(db.failure.wait(2))
+            sink.record('Area', 2, 'CREATE')
+            self.assertTrue(sink.flush(timeout=2))
+        sink.shutdown()
+        self.assertEqual([row[1] for row in db.rows], [1, 2])
+        self.assertEqual(sink.stats()['flushed'], 2)
+        self.assertEqual(sink.stats()['failed'], 0)
+        # La hora es la del registro, no la del reintento
+        self.assertLessEqual(db.rows[0][-1], db.failed_at)
+
+    def test_batch_counts_as_failed_after_last_attempt(self):
+        """Test que el lote se descarta recién al agotar los intentos."""
+        db = FlakyAuditDatabase()
+        sink = AuditSink(db_factory=lambda: db, batch_size=1, max_attempts=1)
+        with redirect_stderr(io.StringIO()):
+            sink.record('Area', 1, 'CREATE')
+            self.assertTrue(sink.flush(timeout=2))
+        sink.shutdown()
+        self.assertEqual(sink.stats()['failed'], 1)
+        self.assertEqual(db.rows, [])
+
+    def test_outage_applies_queue_backpressure(self):
+        """Test que con la base caída la cola se llena y descarta, y cada lote agota sus propios intentos."""
+        db = DownAuditDatabase()
+        sink = AuditSink(db_factory=lambda: db, batch_size=2, flush_interval=60, max_queue=5,
+                         queue_timeout=0.01, max_attempts=2, retry_backoff=0.1)
+        with redirect_stderr(io.StringIO()):
+            for entity_id in range(50):
+                sink.record('Area', entity_id, 'CREATE')
+            self.assertTrue(sink.flush(timeout=5))
+            sink.shutdown()
+        stats = sink.stats()
+        self.assertEqual(stats['queued'] + stats['dropped'], 50)
+        self.assertGreater(stats['dropped'], 0)
+        self.assertLess(stats['queued'], 25)
+        self.assertEqual(stats['failed'], stats['queued'])
+        # Ninguna entrada se descarta junto con un lote anterior sin haber agotado sus intentos
+        self.assertEqual(set(db.attempts.values()), {2})
+
+    def test_commit_after_shutdown_is_written(self):
+        """Test que una transacción confirmada después de ``shutdown`` igual escribe su entrada."""
+        sink = AuditSink(db_factory=lambda: self.db, flush_interval=60)
+        sink.record('Area', 1, 'CREATE', db=self.db)
+        self.assertTrue(sink.flush(timeout=2))
+        with self.db.transaction():
+            sink.record('Area', 2, 'UPDATE', db=self.db)
+            sink.shutdown()
+        self.assertFalse(sink._thread.is_alive())
+        self.assertEqual(sink.stats()['flushed'], 2)
+        self.assertEqual(len(self._audit_inserts()), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+"""Tests de la carga diferida de ventanas y dependencias pesadas."""
+import unittest
+from benchmarks.bench_import_time import loaded_lazy_modules, measure, parse_importtime, total_ms
+
+
+class TestImportTimeParsing(unittest.TestCase):
+    """Tests para el análisis de la salida de ``-X importtime``."""
+
+    def test_parse_entries_and_depth(self):
+        """Test que se leen tiempos, módulo y nivel de anidamiento."""
+        output = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |     typing\n"
+            "import time:       300 |        420 |   src.models\n"
+            "import time:        50 |        470 | src\n"
+        )
+        entries = parse_importtime(output)
+        self.assertEqual([(e.module, e.depth) for e in entries], [('typing', 2), ('src.models', 1), ('src', 0)])
+        self.assertEqual(total_ms(entries), 0.47)
+
+
+class TestLazyImports(unittest.TestCase):
+    """Tests de que el arranque no importa módulos que se cargan al usarse."""
+
+    def test_startup_does_not_import_admin_windows(self):
+        """Test que importar ``main`` no carga ventanas de administración, openpyxl ni numpy."""
+        self.assertEqual(loaded_lazy_modules(measure('main')), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
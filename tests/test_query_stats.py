@@ -0,0 +1,116 @@
+"""Tests para las métricas por sentencia de DatabaseConnection."""
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+from src.core.database import DatabaseConnection
+from src.core.query_stats import QueryStats, normalize_sql, param_shape
+
+
+class ProbeRepository:
+    """Repositorio mínimo para comprobar qué método se registra como llamador."""
+
+    def __init__(self, db):
+        self.db = db
+
+    def find_one(self, value):
+        return self.db.fetch_one("SELECT ? AS value", (value,))
+
+    def find_many(self, count):
+        return list(self.db.fetch_iter(
+            "WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n WHERE x < ?) SELECT x FROM n",
+            (count,), batch_size=3
+        ))
+
+
+class TestNormalizeSql(unittest.TestCase):
+    """Tests para la forma canónica de las sentencias."""
+
+    def test_variable_length_lists_collapse(self):
+        """Test que listas IN y VALUES de distinto largo dan la misma sentencia."""
+        self.assertEqual(
+            normalize_sql("SELECT * FROM t WHERE id IN (?, ?, ?)"),
+            normalize_sql("SELECT *  FROM t\n WHERE id IN (?, ?)")
+        )
+        self.assertEqual(
+            normalize_sql("INSERT INTO t (a, b) VALUES (?, ?), (?, ?), (?, ?)"),
+            "INSERT INTO t (a, b) VALUES (?, ...), ..."
+        )
+
+    def test_literals_are_replaced(self):
+        """Test que los literales no generan sentencias distintas."""
+        self.assertEqual(
+            normalize_sql("SELECT TOP 1 name FROM t WHERE code = 'A' AND n > 10;"),
+            "SELECT TOP ? name FROM t WHERE code = ? AND n > ?"
+        )
+
+    def test_param_shape_hides_values(self):
+        """Test que la forma de los parámetros no incluye sus valores."""
+        self.assertEqual(param_shape((1, "secreto", None)), "(int, str, NULL)")
+        self.assertEqual(param_shape([1] * 12), "12 parámetros: int×12")
+
+
+class TestQueryStats(unittest.TestCase):
+    """Tests de la instrumentación sobre SQLite en memoria."""
+
+    def setUp(self):
+        DatabaseConnection.configure('sqlite', ':memory:')
+        self.db = DatabaseConnection()
+        self.stats = DatabaseConnection.enable_query_stats(slow_ms=0)
+        self.repo = ProbeRepository(self.db)
+
+    def tearDown(self):
+        DatabaseConnection.disable_query_stats()
+        DatabaseConnection.configure()
+
+    def test_calls_rows_and_callers_recorded(self):
+        """Test que se acumulan llamadas, filas y el método llamador por sentencia."""
+        self.repo.find_one(1)
+        self.repo.find_one(2)
+        self.assertEqual(len(self.repo.find_many(7)), 7)
+        by_statement = {item['statement']: item for item in self.stats.snapshot()}
+        one = by_statement["SELECT ? AS value"]
+        self.assertEqual(one['calls'], 2)
+        self.assertEqual(one['rows'], 2)
+        self.assertEqual(one['callers'], {'ProbeRepository.find_one': 2})
+        self.assertGreaterEqual(one['p95_ms'], 0)
+        many = next(item for key, item in by_statement.items() if key.startswith("WITH RECURSIVE"))
+        self.assertEqual((many['calls'], many['rows']), (1, 7))
+        self.assertEqual(many['callers'], {'ProbeRepository.find_many': 1})
+
+    def test_reset_and_disable(self):
+        """Test que ``reset`` vacía y que sin métricas no se registra nada."""
+        self.repo.find_one(1)
+        self.stats.reset()
+        self.assertEqual(self.stats.snapshot(), [])
+        DatabaseConnection.disable_query_stats()
+        self.repo.find_one(1)
+        self.assertEqual(self.stats.snapshot(), [])
+
+    def test_slow_queries_are_logged_with_param_shape(self):
+        """Test que las consultas sobre el umbral se informan sin los valores."""
+        stats = QueryStats(slow_ms=50)
+        output = io.StringIO()
+        with redirect_stderr(output):
+            stats.record("SELECT * FROM t WHERE name = ?", ("Ana",), 0.2, caller="Repo.find")
+            stats.record("SELECT * FROM t WHERE name = ?", ("Ana",), 0.01, caller="Repo.find")
+        self.assertEqual(stats.slow_queries, 1)
+        self.assertIn("Repo.find", output.getvalue())
+        self.assertIn("(str)", output.getvalue())
+        self.assertNotIn("Ana", output.getvalue())
+
+    def test_dump_writes_json(self):
+        """Test que el volcado escribe el resumen como JSON."""
+        self.repo.find_one(1)
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "stats.json")
+            self.stats.dump(path)
+            with open(path, encoding="utf-8") as handle:
+                data = json.load(handle)
+        self.assertEqual(data[0]['statement'], "SELECT ? AS value")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+"""Tests para el modelo y la ventana visible de la lista de preguntas."""
+import unittest
+from src.models.question import Question
+from src.ui.question_list import BUFFER_ROWS, ROW_HEIGHT, QuestionFormModel, row_offsets, visible_range
+
+
+class TestQuestionList(unittest.TestCase):
+    """Tests para la lista virtualizada de preguntas."""
+
+    def test_visible_range_includes_buffer(self):
+        """Test que solo se materializan las filas visibles más el búfer."""
+        rows = visible_range(top=10 * ROW_HEIGHT, height=3 * ROW_HEIGHT, count=1000)
+        self.assertEqual(rows.start, 10 - BUFFER_ROWS)
+        self.assertEqual(rows.stop, 14 + BUFFER_ROWS)
+        self.assertEqual(visible_range(0, 3 * ROW_HEIGHT, count=2), range(0, 2))
+        self.assertEqual(len(visible_range(0, ROW_HEIGHT, count=0)), 0)
+
+    def test_visible_range_with_variable_heights(self):
+        """Test que con altos distintos se eligen las filas que cruzan la vista."""
+        offsets = row_offsets([100, 300, 100, 500, 100, 100])
+        self.assertEqual(offsets, [0, 100, 400, 500, 1000, 1100, 1200])
+        # La vista [450, 650) cae en la fila 2 (400-500) y la 3 (500-1000)
+        self.assertEqual(visible_range(450, 200, 6, buffer=0, offsets=offsets), range(2, 4))
+        self.assertEqual(visible_range(450, 200, 6, buffer=1, offsets=offsets), range(1, 5))
+        # El borde superior exacto de una fila la incluye; el inferior no agrega la siguiente
+        self.assertEqual(visible_range(400, 99, 6, buffer=0, offsets=offsets), range(2, 3))
+        self.assertEqual(visible_range(1150, 500, 6, buffer=2, offsets=offsets), range(3, 6))
+        self.assertEqual(len(visible_range(0, 300, 0, offsets=[0])), 0)
+
+    def test_model_keeps_defaults_and_comments(self):
+        """Test que el modelo guarda respuestas por defecto y comentarios sin widgets."""
+        questions = [
+            Question(id=1, area_id=1, text="P1", penalty_graduated=1, penalty_not_graduated=2),
+            Question(id=2, area_id=1, text="P2", penalty_graduated=1, penalty_not_graduated=2),
+        ]
+        model = QuestionFormModel(questions, {2: 'NO'})
+        model.comments[2] = "falta evidencia"
+        self.assertEqual(model.answers, {1: 'NA', 2: 'NO'})
+        self.assertEqual(model.comment(2), "falta evidencia")
+        self.assertEqual(model.comment(1), "")
+
+
+if __name__ == '__main__':
+    unittest.main()
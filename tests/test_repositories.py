@@ -1,10 +1,17 @@
 """Tests para repositorios."""
 import unittest
+from contextlib import contextmanager
+from datetime import datetime
+from src.core.dialect import Dialect
 from src.core.init_db import ensure_database_initialized
 from src.repositories.profile_repository import ProfileRepository
-from src.repositories.question_repository import QuestionRepository
+from src.repositories.question_repository import DEFAULTS_UPSERT_CHUNK_SIZE, QuestionRepository
+from src.repositories.survey_repository import SurveyRepository
+from src.repositories.audit_repository import AuditRepository
 from src.models.profile import Profile
 from src.models.question import Question
+from src.models.survey import SurveyFilters
+from src.models.audit import AuditFilters
 
 
 class TestProfileRepository(unittest.TestCase):
@@ -78,6 +85,261 @@ class TestQuestionRepository(unittest.TestCase):
         self.assertEqual(default, "YES")
 
 
+
+def iter_as_tuples(rows, row_factory=None):
+    """Entrega filas dict como tuplas, igual que ``fetch_iter`` con ``row_factory``."""
+    if not rows or row_factory is None:
+        return iter(rows)
+    convert = row_factory({col: pos for pos, col in enumerate(rows[0])})
+    return (convert(tuple(row.values())) for row in rows)
+
+
+class FakeSurveyDatabase:
+    """Base de datos simulada que cuenta consultas sobre encuestas."""
+    
+    def __init__(self, survey_count: int, responses_per_survey: int = 3):
+        self.queries = 0
+        self.surveys = [
+            {
+                'id': survey_id, 'evaluator_profile': 'Manager', 'sid': f"S{survey_id % 2}",
+                'case_id': 1, 'is_graduated': 0, 'final_score': 100.0, 'tier_id': None,
+                'tier_name': None, 'created_at': None
+            }
+            for survey_id in range(1, survey_count + 1)
+        ]
+        self.responses = [
+            {
+                'id': survey_id * 100 + idx, 'survey_id': survey_id, 'question_id': idx,
+                'answer': 'YES', 'comment': None, 'penalty_applied': 0.0
+            }
+            for survey_id in range(1, survey_count + 1)
+            for idx in range(responses_per_survey)
+        ]
+    
+    def fetch_all(self, query, params=()):
+        self.queries += 1
+        surveys = self.surveys
+        if "sid = ?" in query:
+            surveys = [s for s in surveys if s['sid'] == params[0]]
+        if "FROM survey_responses" in query:
+            ids = {s['id'] for s in surveys}
+            if "IN (" in query:
+                ids = set(params)
+            return [r for r in self.responses if r['survey_id'] in ids]
+        return surveys
+    
+    def fetch_iter(self, query, params=(), batch_size=1000, row_factory=None):
+        return iter_as_tuples(self.fetch_all(query, params), row_factory)
+
+
+class TestSurveyRepositoryLoading(unittest.TestCase):
+    """Tests de cantidad de consultas al cargar encuestas con respuestas."""
+    
+    def test_find_all_query_count_is_constant(self):
+        """Test que find_all usa las mismas consultas con 10 o 1000 encuestas."""
+        for count in (10, 1000):
+            db = FakeSurveyDatabase(count)
+            surveys = SurveyRepository(db).find_all()
+            self.assertEqual(len(surveys), count)
+            self.assertTrue(all(len(s.responses) == 3 for s in surveys))
+            self.assertEqual(db.queries, 2)
+    
+    def test_find_by_sid_groups_responses(self):
+        """Test que find_by_sid asigna a cada encuesta solo sus respuestas."""
+        db = FakeSurveyDatabase(6)
+        surveys = SurveyRepository(db).find_by_sid("S1")
+        self.assertEqual([s.id for s in surveys], [1, 3, 5])
+        for survey in surveys:
+            self.assertTrue(all(r.survey_id == survey.id for r in survey.responses))
+        self.assertEqual(db.queries, 2)
+    
+    def test_get_responses_for_surveys_chunks(self):
+        """Test que la carga por IDs se divide en bloques de parámetros."""
+        db = FakeSurveyDatabase(2500, responses_per_survey=1)
+        responses = SurveyRepository(db).get_responses_for_surveys(range(1, 2501))
+        self.assertEqual(len(responses), 2500)
+        self.assertEqual(db.queries, 3)
+
+
+
+class RecordingDatabase:
+    """Base simulada que guarda la última consulta y sus parámetros."""
+    
+    def __init__(self, rows=None):
+        self.rows = rows or []
+        self.query = None
+        self.params = None
+    
+    def fetch_all(self, query, params=()):
+        self.query = query
+        self.params = tuple(params)
+        return self.rows
+    
+    def fetch_iter(self, query, params=(), batch_size=1000, row_factory=None):
+        return iter_as_tuples(self.fetch_all(query, params), row_factory)
+
+
+class TestSurveyRepositoryPaging(unittest.TestCase):
+    """Tests para el listado paginado por keyset."""
+    
+    def test_first_page_without_filters(self):
+        """Test que la primera página solo limita y ordena."""
+        db = RecordingDatabase()
+        SurveyRepository(db).find_page(limit=50)
+        self.assertEqual(db.params, (50,))
+        self.assertNotIn("WHERE", db.query)
+        self.assertIn("ORDER BY s.created_at DESC, s.id DESC", db.query)
+    
+    def test_filters_and_keyset_cursor(self):
+        """Test que filtros y cursor se traducen a condiciones en orden."""
+        db = RecordingDatabase()
+        cursor = (datetime(2024, 5, 1, 10, 0), 42)
+        filters = SurveyFilters(area_id=3, evaluator_profile="Manager", min_score=60.0, max_score=80.0)
+        SurveyRepository(db).find_page(filters, after=cursor, limit=20)
+        self.assertIn("c.area_id = ?", db.query)
+        self.assertIn("(s.created_at < ? OR (s.created_at = ? AND s.id < ?))", db.query)
+        self.assertEqual(db.params, (20, 3, "Manager", 60.0, 80.0, cursor[0], cursor[0], 42))
+    
+    def test_summary_exposes_cursor(self):
+        """Test que cada fila entrega su posición para la página siguiente."""
+        created = datetime(2024, 5, 1, 10, 0)
+        db = RecordingDatabase([{
+            'id': 7, 'created_at': created, 'evaluator_profile': 'Manager', 'sid': 'S1',
+            'case_id': 1, 'case_name': 'Caso', 'area_id': 2, 'is_graduated': 0,
+            'final_score': 90.0, 'tier_id': None, 'tier_name': None
+        }])
+        page = SurveyRepository(db).find_page()
+        self.assertEqual(page[0].cursor, (created, 7))
+
+
+
+class FakeAuditDatabase:
+    """Log de auditoría en memoria que aplica ``TOP`` y el cursor keyset de la consulta."""
+    
+    def __init__(self, count: int):
+        base = datetime(2024, 1, 1)
+        # Varias entradas por segundo para ejercitar el desempate por id
+        self.rows = [
+            {
+                'id': entry_id, 'entity_type': 'Area', 'entity_id': entry_id % 5, 'action': 'UPDATE',
+                'user_profile': None, 'details': None,
+                'created_at': base.replace(second=entry_id // 3 % 60, minute=entry_id // 180)
+            }
+            for entry_id in range(1, count + 1)
+        ]
+        self.queries = []
+    
+    def fetch_all(self, query, params=()):
+        self.queries.append((query, params))
+        limit = params[0]
+        rows = sorted(self.rows, key=lambda r: (r['created_at'], r['id']), reverse=True)
+        if "created_at < ?" in query:
+            created_at, _, last_id = params[-3:]
+            rows = [r for r in rows if (r['created_at'], r['id']) < (created_at, last_id)]
+        return rows[:limit]
+    
+    def fetch_iter(self, query, params=(), batch_size=1000, row_factory=None):
+        return iter_as_tuples(self.fetch_all(query, params), row_factory)
+
+
+class TestAuditRepositoryPaging(unittest.TestCase):
+    """Tests para la lectura paginada del log de auditoría."""
+    
+    def test_iter_entries_walks_all_pages_in_order(self):
+        """Test que el recorrido por keyset entrega todo una vez y en orden."""
+        db = FakeAuditDatabase(25)
+        entries = list(AuditRepository(db).iter_entries(batch_size=10))
+        self.assertEqual(len(entries), 25)
+        self.assertEqual(len({e.id for e in entries}), 25)
+        cursors = [e.cursor for e in entries]
+        self.assertEqual(cursors, sorted(cursors, reverse=True))
+        self.assertEqual(len(db.queries), 3)
+        self.assertTrue(all("TOP (?)" in q and "LIMIT" not in q for q, _ in db.queries))
+    
+    def test_filters_translate_to_conditions(self):
+        """Test que los filtros se traducen a condiciones en orden."""
+        db = FakeAuditDatabase(0)
+        filters = AuditFilters(entity_type='Area', entity_id=3, action='DELETE',
+                               date_from=datetime(2024, 1, 1), date_to=datetime(2024, 2, 1))
+        AuditRepository(db).get_by_entity('Area', 3)
+        AuditRepository(db).find_page(filters, limit=50)
+        query, params = db.queries[-1]
+        self.assertIn("entity_type = ? AND entity_id = ? AND action = ?", query)
+        self.assertEqual(params, (50, 'Area', 3, 'DELETE', datetime(2024, 1, 1), datetime(2024, 2, 1)))
+        self.assertEqual(db.queries[0][1], (100, 'Area', 3))
+        with self.assertRaises(ValueError):
+            AuditFilters(action='RESCORE')
+
+
+
+class FakeWriteResult:
+    def __init__(self, rowcount):
+        self.rowcount = rowcount
+
+
+class RecordingWriteDatabase:
+    """Base simulada que registra sentencias de escritura y transacciones."""
+    
+    dialect = Dialect()
+    
+    def __init__(self):
+        self.statements = []
+        self.transactions = 0
+    
+    @contextmanager
+    def transaction(self):
+        self.transactions += 1
+        yield
+    
+    def execute(self, query, params=()):
+        self.statements.append((query, tuple(params)))
+        return FakeWriteResult(len(params) - 1)
+
+
+class TestQuestionDefaultsBulk(unittest.TestCase):
+    """Tests para el upsert masivo de respuestas por defecto."""
+    
+    def test_matrix_upsert_is_one_merge_per_chunk(self):
+        """Test que la matriz completa se envía en MERGE por bloques y sin duplicados."""
+        db = RecordingWriteDatabase()
+        repo = QuestionRepository(db)
+        matrix = {profile_id: {q: 'YES' for q in range(1, 501)} for profile_id in (1, 2)}
+        self.assertEqual(repo.set_defaults_for_profiles(matrix), 1000)
+        expected_chunks = -(-1000 // DEFAULTS_UPSERT_CHUNK_SIZE)
+        self.assertEqual(len(db.statements), expected_chunks)
+        self.assertTrue(all(q.lstrip().startswith("MERGE INTO profile_question_defaults") for q, _ in db.statements))
+        self.assertTrue(all("WITH (HOLDLOCK)" in q for q, _ in db.statements))
+        self.assertEqual(db.transactions, 1)
+        
+        db.statements.clear()
+        repo.upsert_defaults([(1, 5, 'YES'), (1, 5, 'NO')])
+        self.assertEqual(db.statements[0][1], (1, 5, 'NO'))
+    
+    def test_bulk_delete_uses_in_list(self):
+        """Test que el borrado masivo usa un solo DELETE con IN por bloque."""
+        db = RecordingWriteDatabase()
+        deleted = QuestionRepository(db).delete_defaults(3, [10, 11, 11, 12])
+        self.assertEqual(deleted, 3)
+        self.assertEqual(len(db.statements), 1)
+        self.assertEqual(db.statements[0][1], (3, 10, 11, 12))
+
+    
+    def test_defaults_matrix_in_one_query(self):
+        """Test que la matriz de un área y los prefills de una pregunta salen de una consulta."""
+        db = RecordingDatabase([
+            {'profile_id': 1, 'question_id': 10, 'default_answer': 'YES'},
+            {'profile_id': 1, 'question_id': 11, 'default_answer': 'NA'},
+            {'profile_id': 2, 'question_id': 10, 'default_answer': 'NO'},
+        ])
+        repo = QuestionRepository(db)
+        self.assertEqual(repo.get_defaults_matrix(4), {1: {10: 'YES', 11: 'NA'}, 2: {10: 'NO'}})
+        self.assertEqual(db.params, (4,))
+        self.assertIn("q.area_id = ?", db.query)
+        
+        db.rows = [{'profile_id': 1, 'default_answer': 'YES'}, {'profile_id': 2, 'default_answer': 'NO'}]
+        self.assertEqual(repo.get_defaults_for_question(10), {1: 'YES', 2: 'NO'})
+        self.assertIn("WHERE question_id = ?", db.query)
+
+
 if __name__ == '__main__':
     unittest.main()
-
@@ -1,6 +1,21 @@
 """Tests para servicios."""
+import csv
+import gzip
+import os
+import tempfile
 import unittest
 from src.services.survey_service import SurveyService
+from src.services.area_service import AreaService
+from src.services.case_service import CaseService
+from src.services.catalog_cache import CatalogCache
+from src.services.question_service import QuestionService
+from src.services.rescore_service import ScoringData, compute_rescore
+from src.services.score_engine import ScoreEngine
+from src.services.tier_index import TierIndex
+from src.services.tier_service import TierService
+from src.models.area import Area
+from src.models.case import Case
+from src.models.tier import Tier
 from src.models.survey import SurveyResponse
 from src.models.question import Question
 
@@ -46,6 +61,340 @@ class TestSurveyService(unittest.TestCase):
         self.assertEqual(score, 0.0)  # No puede ser negativo
 
 
+
+class FakeExportRepository:
+    """Repositorio simulado que entrega filas de exportación bajo demanda."""
+    
+    def __init__(self, count: int):
+        self.count = count
+        self.consumed = 0
+    
+    def count_export_rows(self):
+        return self.count
+    
+    def iter_export_rows(self, batch_size: int = 1000):
+        for idx in range(self.count):
+            self.consumed += 1
+            yield (idx, '', 'Manager', 'S1', 'Caso', 'No', 1, 'YES', '', 0, 100.0, '')
+    
+    def iter_export_rows_with_area(self, batch_size: int = 1000):
+        areas = ('Finanzas', 'Operaciones/Back', None)
+        for idx, row in enumerate(self.iter_export_rows(batch_size)):
+            yield areas[idx % len(areas)], row
+
+
+class TestSurveyExport(unittest.TestCase):
+    """Tests para la exportación en streaming."""
+    
+    def setUp(self):
+        """Servicio sin conexión con un repositorio simulado."""
+        self.service = SurveyService.__new__(SurveyService)
+        self.tmpdir = tempfile.TemporaryDirectory()
+    
+    def tearDown(self):
+        self.tmpdir.cleanup()
+    
+    def test_export_csv_gzip_with_progress(self):
+        """Test que el CSV comprimido contiene todas las filas y reporta avance."""
+        self.service.survey_repo = FakeExportRepository(12000)
+        path = os.path.join(self.tmpdir.name, "export.csv.gz")
+        progress = []
+        self.assertTrue(self.service.export_to_csv(path, progress_callback=lambda d, t: progress.append((d, t))))
+        with gzip.open(path, 'rt', encoding='utf-8', newline='') as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[0][0], 'survey_id')
+        self.assertEqual(len(rows), 12001)
+        self.assertEqual(progress[-1], (12000, 12000))
+        self.assertIn((5000, 12000), progress)
+    
+    def test_export_csv_empty_returns_false(self):
+        """Test que sin datos no se crea archivo."""
+        self.service.survey_repo = FakeExportRepository(0)
+        path = os.path.join(self.tmpdir.name, "export.csv")
+        self.assertFalse(self.service.export_to_csv(path))
+        self.assertFalse(os.path.exists(path))
+    
+    def test_export_excel_sheet_per_area_with_rollover(self):
+        """Test que el Excel tiene una hoja por área y continúa en otra al llegar al límite."""
+        try:
+            from openpyxl import load_workbook
+        except ImportError:
+            self.skipTest("openpyxl no está instalado")
+        self.service.survey_repo = FakeExportRepository(30)
+        path = os.path.join(self.tmpdir.name, "export.xlsx")
+        self.assertTrue(self.service.export_to_excel(path, max_rows_per_sheet=4))
+        wb = load_workbook(path, read_only=True)
+        self.assertIn('Finanzas', wb.sheetnames)
+        self.assertIn('Finanzas (3)', wb.sheetnames)
+        self.assertIn('Operaciones_Back', wb.sheetnames)
+        self.assertIn('Sin área', wb.sheetnames)
+        data_rows = sum(sum(1 for _ in ws.values) - 1 for ws in wb.worksheets)
+        self.assertEqual(data_rows, 30)
+        self.assertEqual(next(wb['Finanzas'].values)[0], 'survey_id')
+        wb.close()
+
+
+
+class FakeTierRepository:
+    """Repositorio de tiers en memoria que cuenta las lecturas."""
+    
+    def __init__(self, tiers):
+        self.tiers = list(tiers)
+        self.loads = 0
+    
+    def find_all(self, area_id=None, active_only=False):
+        self.loads += 1
+        return [t for t in self.tiers if t.active or not active_only]
+    
+    def delete(self, tier_id):
+        self.tiers = [t for t in self.tiers if t.id != tier_id]
+        return True
+
+
+class TestTierIndex(unittest.TestCase):
+    """Tests para la búsqueda de tiers en memoria."""
+    
+    def setUp(self):
+        """Servicio con un índice propio sobre un repositorio simulado."""
+        self.repo = FakeTierRepository([
+            Tier(id=1, area_id=1, name="Bajo", min_score=0, max_score=59.99),
+            Tier(id=2, area_id=1, name="Medio", min_score=60, max_score=84.99),
+            Tier(id=3, area_id=1, name="Alto", min_score=85, max_score=100),
+            Tier(id=4, area_id=2, name="Único", min_score=50, max_score=100),
+            Tier(id=5, area_id=1, name="Inactivo", min_score=0, max_score=100, active=False),
+        ])
+        self.service = TierService.__new__(TierService)
+        self.service.tier_repo = self.repo
+        self.service.tier_index = TierIndex(lambda: self.repo.find_all(active_only=True))
+    
+    def test_lookup_matches_intervals(self):
+        """Test que cada puntaje cae en su intervalo y la carga ocurre una vez."""
+        self.assertEqual(self.service.get_tier_for_score(1, 100).name, "Alto")
+        self.assertEqual(self.service.get_tier_for_score(1, 85).name, "Alto")
+        self.assertEqual(self.service.get_tier_for_score(1, 84.99).name, "Medio")
+        self.assertEqual(self.service.get_tier_for_score(1, 0).name, "Bajo")
+        self.assertIsNone(self.service.get_tier_for_score(2, 49.5))
+        self.assertIsNone(self.service.get_tier_for_score(3, 90))
+        self.assertEqual(self.repo.loads, 1)
+    
+    def test_write_invalidates_index(self):
+        """Test que eliminar un tier recarga el índice en la siguiente búsqueda."""
+        self.assertEqual(self.service.get_tier_for_score(1, 90).name, "Alto")
+        self.service.delete_tier(3)
+        self.assertIsNone(self.service.get_tier_for_score(1, 90))
+        self.assertEqual(self.repo.loads, 2)
+
+
+
+class FakeQuestionRepository:
+    """Repositorio de preguntas en memoria que cuenta las lecturas."""
+    
+    def __init__(self):
+        self.questions = [Question(id=1, area_id=1, text="P1")]
+        self.loads = 0
+    
+    def find_all(self, active_only=False, area_id=None):
+        self.loads += 1
+        return list(self.questions)
+    
+    def create(self, question):
+        question.id = len(self.questions) + 1
+        self.questions.append(question)
+        return question.id
+
+
+class TestCatalogCache(unittest.TestCase):
+    """Tests para la caché versionada de catálogos."""
+    
+    def setUp(self):
+        """Servicio de preguntas con una caché propia."""
+        self.repo = FakeQuestionRepository()
+        self.service = QuestionService.__new__(QuestionService)
+        self.service.question_repo = self.repo
+        self.service.catalog = CatalogCache()
+    
+    def test_reads_are_cached_until_write(self):
+        """Test que las lecturas repetidas no consultan y una escritura invalida."""
+        self.service.get_all_questions(active_only=True)
+        self.service.get_questions_map(active_only=True)
+        self.assertEqual(len(self.service.get_all_questions(active_only=True)), 1)
+        self.assertEqual(self.repo.loads, 1)
+        
+        self.service.create_question(area_id=1, text="P2")
+        self.assertEqual(len(self.service.get_questions_map(active_only=True)), 2)
+        self.assertEqual(self.repo.loads, 2)
+    
+    def test_cached_list_is_copied(self):
+        """Test que modificar la lista retornada no altera la caché."""
+        self.service.get_all_questions().clear()
+        self.assertEqual(len(self.service.get_all_questions()), 1)
+    
+    def test_stamp_change_invalidates(self):
+        """Test que un cambio en la marca de la base de datos invalida la caché."""
+        stamp = [1]
+        cache = CatalogCache(stamp_loader=lambda: stamp[0], stamp_ttl=1e-9)
+        loads = []
+        loader = lambda: loads.append(1) or 'valor'
+        cache.get('k', loader)
+        cache.get('k', loader)
+        self.assertEqual(len(loads), 1)
+        stamp[0] = 2
+        cache.get('k', loader)
+        self.assertEqual(len(loads), 2)
+    
+    def test_lookup_by_name_uses_cached_index(self):
+        """Test que la búsqueda por nombre usa un índice en caché que se invalida al escribir."""
+        loads = []
+        
+        class FakeAreaRepository:
+            def find_all(self, active_only=True):
+                loads.append(1)
+                return [Area(id=1, name="Ventas"), Area(id=2, name="Soporte")]
+            
+            def create(self, area):
+                return 3
+        
+        service = AreaService.__new__(AreaService)
+        service.area_repo = FakeAreaRepository()
+        service.catalog = CatalogCache()
+        self.assertEqual(service.get_area_by_name("Soporte").id, 2)
+        self.assertIsNone(service.get_area_by_name("Otra"))
+        self.assertEqual(len(loads), 1)
+        service.create_area("Otra")
+        service.get_area_by_name("Ventas")
+        self.assertEqual(len(loads), 2)
+    
+    def test_find_or_create_case_uses_id_cache(self):
+        """Test que los casos conocidos no consultan y los nuevos se crean una sola vez."""
+        class FakeDb:
+            def on_commit(self, callback):
+                callback()
+        
+        class FakeCaseRepository:
+            def __init__(self):
+                self.cases = [Case(id=1, area_id=1, name="Caso A")]
+                self.merges = 0
+                self.db = FakeDb()
+            
+            def find_all(self, active_only=False, area_id=None):
+                return list(self.cases)
+            
+            def find_or_create(self, area_id, name):
+                self.merges += 1
+                self.cases.append(Case(id=2, area_id=area_id, name=name))
+                return 2, True
+        
+        service = CaseService.__new__(CaseService)
+        service.case_repo = FakeCaseRepository()
+        service.catalog = CatalogCache()
+        self.assertEqual(service.find_or_create_case(1, "Caso A"), 1)
+        self.assertEqual(service.find_or_create_case(1, "Caso B"), 2)
+        self.assertEqual(service.find_or_create_case(1, "Caso B"), 2)
+        self.assertEqual(service.case_repo.merges, 1)
+
+
+
+class TestScoreEngine(unittest.TestCase):
+    """Tests para el cálculo incremental de puntaje."""
+    
+    def setUp(self):
+        """Formulario con tres preguntas."""
+        self.questions = [
+            Question(id=10, area_id=1, text="P1", penalty_graduated=5.0, penalty_not_graduated=10.0),
+            Question(id=20, area_id=1, text="P2", penalty_graduated=0.1, penalty_not_graduated=0.2),
+            Question(id=30, area_id=1, text="P3", penalty_graduated=95.0, penalty_not_graduated=95.0),
+        ]
+    
+    def test_deltas_have_no_drift(self):
+        """Test que alternar respuestas muchas veces deja el puntaje exacto."""
+        engine = ScoreEngine(self.questions, is_graduated=True)
+        for _ in range(1000):
+            engine.set_answer(20, 'NO')
+            engine.set_answer(20, 'YES')
+        engine.set_answer(20, 'NO')
+        self.assertEqual(engine.score, 99.9)
+        engine.set_answer(10, 'NO')
+        engine.set_answer(30, 'NO')
+        self.assertEqual(engine.score, 0.0)
+        engine.set_answer(30, 'NA')
+        self.assertEqual(engine.score, 94.9)
+    
+    def test_graduated_switch_and_tier(self):
+        """Test que cambiar la regla recalcula y el tier se consulta solo si cambia el puntaje."""
+        calls = []
+        engine = ScoreEngine(self.questions, tier_lookup=lambda score: calls.append(score) or score)
+        engine.set_answer(10, 'NO')
+        self.assertEqual(engine.tier, 90.0)
+        self.assertEqual(engine.tier, 90.0)
+        engine.set_graduated(True)
+        self.assertEqual(engine.tier, 95.0)
+        self.assertEqual(calls, [90.0, 95.0])
+    
+    def test_calculate_score_uses_engine(self):
+        """Test que calculate_score coincide con el puntaje en vivo."""
+        service = SurveyService.__new__(SurveyService)
+        responses = [
+            SurveyResponse(id=None, survey_id=0, question_id=10, answer="NO", comment="x"),
+            SurveyResponse(id=None, survey_id=0, question_id=20, answer="NO", comment="y"),
+            SurveyResponse(id=None, survey_id=0, question_id=99, answer="NO", comment="z"),
+        ]
+        score = service.calculate_score(responses, False, {q.id: q for q in self.questions})
+        self.assertEqual(score, 89.8)
+        self.assertEqual([r.penalty_applied for r in responses], [10.0, 0.2, 0.0])
+
+
+
+class TestRescore(unittest.TestCase):
+    """Tests para el recálculo masivo de puntajes."""
+    
+    def setUp(self):
+        """Dos encuestas guardadas con penalizaciones ya desactualizadas."""
+        self.questions = [
+            Question(id=1, area_id=1, text="P1", penalty_graduated=5.0, penalty_not_graduated=10.0),
+            Question(id=2, area_id=1, text="P2", penalty_graduated=20.0, penalty_not_graduated=30.0),
+        ]
+        self.tiers = [
+            Tier(id=7, area_id=1, name="Bajo", min_score=0, max_score=79.99),
+            Tier(id=8, area_id=1, name="Alto", min_score=80, max_score=100),
+        ]
+        self.data = ScoringData.from_rows(
+            [
+                (100, False, 90.0, 8, "Alto", 1),   # ahora 60 -> Bajo
+                (101, True, 95.0, 8, "Alto", 1),    # sigue 95 -> Alto
+                (102, False, 100.0, None, None, None),
+            ],
+            [
+                (1, 100, 1, 'NO', 10.0),
+                (2, 100, 2, 'NO', 0.0),
+                (3, 101, 1, 'NO', 5.0),
+                (4, 101, 2, 'YES', 0.0),
+                (5, 102, 2, 'NA', 3.0),
+                (6, 101, 99, 'NO', 7.0),            # pregunta eliminada: se omite
+            ]
+        )
+    
+    def _check(self, report):
+        self.assertEqual(report.surveys_scanned, 3)
+        self.assertEqual(len(report.changes), 1)
+        change = report.changes[0]
+        self.assertEqual((change.survey_id, change.old_score, change.new_score), (100, 90.0, 60.0))
+        self.assertEqual((change.new_tier_id, change.new_tier_name), (7, "Bajo"))
+        self.assertEqual(sorted(report.response_updates, key=lambda u: u[1]), [(30.0, 2), (0.0, 5)])
+        self.assertEqual(report.tier_changes, 1)
+    
+    def test_python_engine(self):
+        """Test del cálculo en Python puro."""
+        self._check(compute_rescore(self.data, self.questions, self.tiers, use_numpy=False))
+    
+    def test_numpy_engine_matches(self):
+        """Test que el cálculo con NumPy da el mismo resultado."""
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            self.skipTest("numpy no está instalado")
+        self._check(compute_rescore(self.data, self.questions, self.tiers, use_numpy=True))
+
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -0,0 +1,197 @@
+"""Tests de los repositorios contra el motor SQLite embebido (sin servidor)."""
+import unittest
+from src.core.audit_sink import audit_sink
+from src.core.database import DatabaseConnection
+from src.core.dialect import SqliteDialect
+from src.core.init_db import ensure_database_initialized, find_missing_tables
+from src.core.seeds import DEFAULT_TIER_CONFIG
+from src.core.startup import StartupTimer
+from src.models.audit import AuditFilters
+from src.models.profile import Profile
+from src.models.question import Question
+from src.models.survey import SurveyResponse
+from src.repositories.audit_repository import AuditRepository
+from src.repositories.case_repository import CaseRepository
+from src.repositories.profile_repository import ProfileRepository
+from src.repositories.question_repository import QuestionRepository
+from src.services.catalog_cache import catalog_cache
+from src.services.survey_service import SurveyService
+from src.services.tier_service import TierService, _shared_tier_index
+
+
+class TestSqliteDialect(unittest.TestCase):
+    """Tests para la traducción de SQL Server a SQLite."""
+
+    def setUp(self):
+        self.dialect = SqliteDialect()
+
+    def test_top_parameter_moves_to_limit(self):
+        """Test que ``TOP (?)`` pasa a ``LIMIT ?`` y su parámetro queda al final."""
+        query, params = self.dialect.translate(
+            "SELECT TOP (?) id FROM audit_log WHERE action = ? ORDER BY id DESC;", (10, 'CREATE')
+        )
+        self.assertEqual(query, "SELECT id FROM audit_log WHERE action = ? ORDER BY id DESC LIMIT ?")
+        self.assertEqual(params, ('CREATE', 10))
+
+    def test_output_inserted_becomes_returning(self):
+        """Test que ``OUTPUT INSERTED.id`` pasa a ``RETURNING id``."""
+        query, params = self.dialect.translate(
+            "INSERT INTO areas (name) OUTPUT INSERTED.id VALUES (?)", ('A',)
+        )
+        self.assertEqual(query, "INSERT INTO areas (name) VALUES (?) RETURNING id")
+        self.assertEqual(params, ('A',))
+
+    def test_schema_script_is_converted(self):
+        """Test que el script de SQL Server se convierte a sentencias SQLite."""
+        statements = SqliteDialect.schema_statements(
+            "CREATE TABLE dbo.areas (\n    id INT IDENTITY(1,1) NOT NULL PRIMARY KEY,\n"
+            "    notes NVARCHAR(MAX) NULL\n);\nCREATE INDEX IX_areas_notes ON dbo.areas(notes);"
+        )
+        self.assertIn("id INTEGER PRIMARY KEY AUTOINCREMENT", statements[0])
+        self.assertIn("notes TEXT NULL", statements[0])
+        self.assertEqual(statements[1], "CREATE INDEX IF NOT EXISTS IX_areas_notes ON areas(notes)")
+
+
+class TestSqliteBackend(unittest.TestCase):
+    """Tests de extremo a extremo con ``DB_BACKEND=sqlite`` en memoria."""
+
+    @classmethod
+    def setUpClass(cls):
+        DatabaseConnection.configure('sqlite', ':memory:')
+        catalog_cache.bump()
+        _shared_tier_index.invalidate()
+        ensure_database_initialized()
+
+    @classmethod
+    def tearDownClass(cls):
+        audit_sink.flush(5)
+        DatabaseConnection.configure()
+        catalog_cache.bump()
+        _shared_tier_index.invalidate()
+
+    def setUp(self):
+        self.db = DatabaseConnection()
+        self.area_id = self.db.insert(
+            "INSERT INTO areas (name, description, active) OUTPUT INSERTED.id VALUES (?, ?, ?)",
+            (f"Área {self.id()}", None, 1)
+        )
+
+    def test_schema_created(self):
+        """Test que el esquema se crea completo a partir del script."""
+        self.assertEqual(find_missing_tables(), [])
+
+    def test_profile_round_trip(self):
+        """Test creación y lectura de un perfil."""
+        repo = ProfileRepository()
+        profile_id = repo.create(Profile(id=None, name="Perfil SQLite"))
+        self.assertEqual(repo.find_by_id(profile_id).name, "Perfil SQLite")
+
+    def test_defaults_upsert(self):
+        """Test que el upsert de prefills inserta y luego actualiza sin duplicar."""
+        repo = QuestionRepository()
+        profile_id = ProfileRepository().create(Profile(id=None, name="Perfil Prefill"))
+        question_id = repo.create(Question(id=None, text="¿P?", penalty_graduated=1, penalty_not_graduated=2,
+                                           area_id=self.area_id))
+        repo.set_defaults(profile_id, {question_id: 'YES'})
+        repo.set_defaults(profile_id, {question_id: 'NO'})
+        self.assertEqual(repo.get_defaults_for_profile(profile_id), {question_id: 'NO'})
+
+    def test_find_or_create_case(self):
+        """Test que el segundo llamado retorna el mismo caso sin crearlo."""
+        repo = CaseRepository()
+        case_id, created = repo.find_or_create(self.area_id, "Caso A")
+        self.assertTrue(created)
+        self.assertEqual(repo.find_or_create(self.area_id, "Caso A"), (case_id, False))
+
+    def test_survey_with_tier(self):
+        """Test que una encuesta se guarda con sus respuestas y el tier que corresponde."""
+        TierService().create_tier(self.area_id, "Todo", 0, 100)
+        question_id = QuestionRepository().create(
+            Question(id=None, text="¿Q?", penalty_graduated=10, penalty_not_graduated=20, area_id=self.area_id)
+        )
+        case_id, _ = CaseRepository().find_or_create(self.area_id, "Caso encuesta")
+        service = SurveyService()
+        catalog_cache.bump()
+        survey_id = service.create_survey("Evaluador", "S1", case_id, True, [
+            SurveyResponse(id=None, survey_id=None, question_id=question_id, answer='NO', comment="Falta"),
+        ])
+        survey = service.get_survey(survey_id)
+        self.assertEqual(survey.final_score, 90.0)
+        self.assertEqual(survey.tier_name, "Todo")
+        self.assertEqual(len(survey.responses), 1)
+        self.assertEqual([s.id for s in service.get_survey_page(page_size=1)], [survey_id])
+
+    def test_fetch_iter_row_factory_builds_index_once(self):
+        """Test que ``row_factory`` recibe el índice de columnas una sola vez por consulta."""
+        indexes = []
+
+        def factory(index):
+            indexes.append(index)
+            return lambda row: (row[index['name']], row[index['id']])
+
+        rows = list(self.db.fetch_iter(
+            "SELECT id, name FROM areas WHERE id <= ? ORDER BY id", (self.area_id,),
+            batch_size=1, row_factory=factory
+        ))
+        self.assertEqual(indexes, [{'id': 0, 'name': 1}])
+        self.assertEqual(rows[-1], (f"Área {self.id()}", self.area_id))
+
+    def test_default_tiers_reconciled_in_one_statement(self):
+        """Test que los tiers por defecto faltantes se crean para todas las áreas a la vez."""
+        service = TierService()
+        service.ensure_default_tiers_for_all_areas(DEFAULT_TIER_CONFIG)
+        self.db.execute("DELETE FROM tiers WHERE area_id = ? AND name = ?", (self.area_id, "Alto"))
+        self.assertEqual(service.ensure_default_tiers_for_all_areas(DEFAULT_TIER_CONFIG), 1)
+        self.assertEqual(service.ensure_default_tiers_for_all_areas(DEFAULT_TIER_CONFIG), 0)
+        names = {tier.name for tier in service.get_tiers(area_id=self.area_id)}
+        self.assertEqual(names, {name for name, *_rest in DEFAULT_TIER_CONFIG})
+        self.assertEqual(service.get_tier_for_score(self.area_id, 85).name, "Alto")
+
+    def test_has_questions_uses_exists(self):
+        """Test que la comprobación de datos de ejemplo responde sin leer las preguntas."""
+        repo = QuestionRepository()
+        repo.create(Question(id=None, text="¿Existe?", area_id=self.area_id))
+        self.assertTrue(repo.has_any())
+
+    def test_savepoint_rolls_back_inner_block(self):
+        """Test que un error en un bloque anidado solo revierte ese bloque."""
+        with self.db.transaction():
+            self.db.execute("INSERT INTO profiles (name, active) VALUES (?, 1)", ("Externo",))
+            with self.assertRaises(RuntimeError):
+                with self.db.transaction():
+                    self.db.execute("INSERT INTO profiles (name, active) VALUES (?, 1)", ("Interno",))
+                    raise RuntimeError("falla")
+        names = {row['name'] for row in self.db.fetch_all("SELECT name FROM profiles")}
+        self.assertIn("Externo", names)
+        self.assertNotIn("Interno", names)
+
+    def test_audit_paging_and_stamp(self):
+        """Test de la auditoría paginada (``TOP``) y del sello del catálogo."""
+        repo = AuditRepository()
+        stamp = repo.get_catalog_stamp()
+        ProfileRepository().create(Profile(id=None, name="Perfil auditado"))
+        audit_sink.flush(5)
+        page = repo.find_page(AuditFilters(entity_type='Profile'), limit=1)
+        self.assertEqual(len(page), 1)
+        self.assertEqual(page[0].action, 'CREATE')
+        self.assertNotEqual(repo.get_catalog_stamp(), stamp)
+
+
+class TestStartupTimer(unittest.TestCase):
+    """Tests para el resumen de tiempos de arranque."""
+
+    def test_report_lists_steps_and_total(self):
+        """Test que el resumen incluye cada etapa y el total."""
+        timer = StartupTimer()
+        with timer.step("Esquema"):
+            pass
+        with timer.step("Interfaz"):
+            pass
+        report = timer.report()
+        self.assertEqual([name for name, _seconds in timer.steps], ["Esquema", "Interfaz"])
+        self.assertIn("Esquema", report)
+        self.assertIn("Total", report)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+"""Tests para el ejecutor de tareas en segundo plano de la UI."""
+import io
+import threading
+import time
+import unittest
+from contextlib import redirect_stderr
+from src.ui.task_runner import TaskRunner
+
+
+class FakeWidget:
+    """Widget mínimo: guarda los ``after`` para ejecutarlos a mano como el bucle de Tk."""
+
+    def __init__(self):
+        self.pending = []
+
+    def after(self, _ms, func):
+        self.pending.append(func)
+        return len(self.pending)
+
+    def after_cancel(self, _job):
+        pass
+
+    def pump(self, timeout: float = 2.0):
+        """Ejecuta los ``after`` hasta que no queden tareas en curso."""
+        deadline = time.monotonic() + timeout
+        while self.pending and time.monotonic() < deadline:
+            func = self.pending.pop(0)
+            time.sleep(0.005)
+            func()
+
+
+class TestTaskRunner(unittest.TestCase):
+    """Tests para TaskRunner."""
+
+    def setUp(self):
+        self.widget = FakeWidget()
+        self.runner = TaskRunner(self.widget, max_workers=2)
+
+    def tearDown(self):
+        self.runner.shutdown()
+
+    def test_result_delivered_on_ui_thread(self):
+        """Test que el callback corre en el hilo que bombea los eventos."""
+        results = []
+        self.runner.submit('k', lambda: 42, on_success=lambda r: results.append((r, threading.current_thread())))
+        self.widget.pump()
+        self.assertEqual(results, [(42, threading.current_thread())])
+        self.assertFalse(self.runner.is_running('k'))
+
+    def test_duplicate_key_is_deduplicated(self):
+        """Test que una tarea con la misma clave en curso no se ejecuta dos veces."""
+        release = threading.Event()
+        calls = []
+
+        def slow():
+            calls.append(1)
+            release.wait(1)
+            return 'ok'
+
+        first = self.runner.submit('k', slow)
+        second = self.runner.submit('k', slow)
+        release.set()
+        self.widget.pump()
+        self.assertIs(first, second)
+        self.assertEqual(len(calls), 1)
+
+    def test_replace_discards_stale_result(self):
+        """Test que con ``replace`` solo se entrega el resultado más reciente."""
+        release = threading.Event()
+        results, errors = [], []
+        self.runner.submit('k', lambda: release.wait(1) and 'viejo', on_success=results.append)
+        self.runner.submit('k', lambda: 'nuevo', on_success=results.append, replace=True)
+        release.set()
+        self.widget.pump()
+        self.runner.submit('e', lambda: 1 / 0, on_error=errors.append)
+        self.widget.pump()
+        self.assertEqual(results, ['nuevo'])
+        self.assertIsInstance(errors[0], ZeroDivisionError)
+
+    def test_failing_callback_does_not_stop_polling(self):
+        """Test que un callback que lanza una excepción no deja sin entregar las demás tareas."""
+        release = threading.Event()
+        results, done = [], []
+
+        def fail(_result):
+            raise ValueError("callback roto")
+
+        def report_and_wait():
+            self.runner.call_in_ui(fail, None)
+            release.wait(1)
+            return 'lento'
+
+        self.runner.submit('a', lambda: 'rapido', on_success=fail, on_done=lambda: done.append('a'))
+        self.runner.submit('b', report_and_wait, on_success=results.append)
+        output = io.StringIO()
+        with redirect_stderr(output):
+            self.widget.pump(0.2)
+            release.set()
+            self.widget.pump()
+        self.assertEqual(done, ['a'])
+        self.assertEqual(results, ['lento'])
+        self.assertFalse(self.runner.is_running('b'))
+        self.assertEqual(output.getvalue().count("ValueError: callback roto"), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()